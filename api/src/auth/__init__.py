@@ -140,8 +140,11 @@ def can_access_document(user_claims: UserClaims, document: DocumentMetadata) ->
     - Protected A: Staff, Hearing Panel, or own-party members
     - Confidential: Hearing Panel only (s. 49 order required)
     """
-    level = document.confidentiality_level
+    return can_access_level(user_claims, document.confidentiality_level, [p.name for p in document.parties])
 
+
+def can_access_level(user_claims: UserClaims, level: str, party_names: list[str]) -> bool:
+    """can_access_document for callers holding only a document's level and party names."""
     if level == ConfidentialityLevel.PUBLIC:
         return True
 
@@ -151,10 +154,8 @@ def can_access_document(user_claims: UserClaims, document: DocumentMetadata) ->
             return True
 
         # Interveners can see their own party's protected documents
-        if user_claims.party_affiliation:
-            party_names = [p.name for p in document.parties]
-            if user_claims.party_affiliation in party_names:
-                return True
+        if user_claims.party_affiliation and user_claims.party_affiliation in party_names:
+            return True
 
         return False
 
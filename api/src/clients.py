@@ -1,15 +1,17 @@
 """Azure service clients for Hearings AI API.
 
 Initializes and provides access to Azure OpenAI, AI Search, Cosmos DB, and Blob Storage.
-Uses managed identity authentication when running in Azure.
+Uses managed identity authentication when running in Azure. With
+USE_LOCAL_SERVICES=true, in-process stand-ins from src.local are returned instead.
 """
 
 from functools import lru_cache
 
-from azure.identity import DefaultAzureCredential
+from azure.cosmos import ContainerProxy, CosmosClient
+from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
 from src.config import settings
 
@@ -23,9 +25,18 @@ def get_credential() -> DefaultAzureCredential:
 @lru_cache()
 def get_search_client() -> SearchClient:
     """Get Azure AI Search client for document operations."""
+    return create_search_client(settings.azure_search_index)
+
+
+def create_search_client(index_name: str) -> SearchClient:
+    """Create an Azure AI Search client for an index or index alias."""
+    if settings.use_local_services:
+        from src.local.clients import local_search_client
+
+        return local_search_client(index_name)
     return SearchClient(
         endpoint=settings.azure_search_endpoint,
-        index_name=settings.azure_search_index,
+        index_name=index_name,
         credential=get_credential(),
     )
 
@@ -33,6 +44,10 @@ def get_search_client() -> SearchClient:
 @lru_cache()
 def get_search_index_client() -> SearchIndexClient:
     """Get Azure AI Search client for index management."""
+    if settings.use_local_services:
+        from src.local.clients import local_search_index_client
+
+        return local_search_index_client()
     return SearchIndexClient(
         endpoint=settings.azure_search_endpoint,
         credential=get_credential(),
@@ -45,6 +60,10 @@ def get_openai_client() -> AzureOpenAI:
     
     Uses managed identity token for authentication.
     """
+    if settings.use_local_services:
+        from src.local.clients import local_openai_client
+
+        return local_openai_client()
     credential = get_credential()
     token = credential.get_token("https://cognitiveservices.azure.com/.default")
     
@@ -53,3 +72,34 @@ def get_openai_client() -> AzureOpenAI:
         api_version=settings.azure_openai_api_version,
         azure_ad_token=token.token,
     )
+
+
+@lru_cache()
+def get_async_openai_client() -> AsyncAzureOpenAI:
+    """Get async Azure OpenAI client, for concurrent chat completions.
+
+    Tokens come from a provider, so long-running processes refresh them.
+    """
+    if settings.use_local_services:
+        from src.local.clients import local_async_openai_client
+
+        return local_async_openai_client()
+    return AsyncAzureOpenAI(
+        azure_endpoint=settings.azure_openai_endpoint,
+        api_version=settings.azure_openai_api_version,
+        azure_ad_token_provider=get_bearer_token_provider(
+            get_credential(), "https://cognitiveservices.azure.com/.default"
+        ),
+    )
+
+
+@lru_cache()
+def get_cosmos_container() -> ContainerProxy:
+    """Get the Cosmos DB container holding document metadata."""
+    if settings.use_local_services:
+        from src.local.clients import local_cosmos_container
+
+        return local_cosmos_container(settings.cosmos_container)
+    client = CosmosClient(url=settings.cosmos_endpoint, credential=get_credential())
+    database = client.get_database_client(settings.cosmos_database)
+    return database.get_container_client(settings.cosmos_container)
@@ -23,10 +23,13 @@ class Settings(BaseSettings):
     cosmos_endpoint: str
     cosmos_database: str = "hearings"
     cosmos_container: str = "documents"
+    # Query for records without a locator when a locator read misses; only until scripts/backfill-locators.py has run
+    cosmos_locator_fallback: bool = False
 
     # Blob Storage (optional for demo)
     storage_account_url: Optional[str] = None
     storage_container: str = "hearing-documents"
+    storage_queue_url: Optional[str] = None  # Queue service endpoint; derived from STORAGE_ACCOUNT_URL if unset
 
     # Auth (optional - uses managed identity if not set)
     azure_tenant_id: Optional[str] = None
@@ -41,5 +44,60 @@ class Settings(BaseSettings):
     chunk_size_tokens: int = 512
     chunk_overlap_tokens: int = 128
 
+    # Ingestion pipeline
+    upload_batch_max_bytes: int = 8 * 1024 * 1024
+    upload_concurrency: int = 4
+    cosmos_flush_threshold: int = 100
+    cosmos_concurrency: int = 8
+    extraction_backend: str = "auto"  # auto | pymupdf | pypdf
+    extraction_workers: int = 0  # Processes for large PDFs; 0 = one per CPU, 1 = no fan-out
+    extraction_pages_per_task: int = 16
+    extraction_cache: bool = True  # Cache extracted pages under LOCAL_DATA_DIR by PDF content hash
+    embedding_dedup_max_entries: int = 50_000  # Vectors kept per run for identical chunk texts
+    boilerplate_stripping: bool = True
+    boilerplate_min_page_fraction: float = 0.5  # Share of pages a header/footer line must repeat on
+    boilerplate_edge_lines: int = 3  # Lines at the top and bottom of each page checked for repetition
+
+    # Ingestion queue and worker ("sqlite" for local development, "azure" for Storage Queues)
+    ingestion_queue: str = "sqlite"
+    ingestion_queue_name: str = "ingestion-jobs"
+    ingestion_workers: int = 2
+    ingestion_max_attempts: int = 3
+    ingestion_visibility_timeout_seconds: int = 1800
+
+    # Evidence context reads ("search": one key lookup on the index, "sqlite": chunk store under LOCAL_DATA_DIR)
+    evidence_store: str = "search"
+    evidence_cache_max_bytes: int = 64 * 1024 * 1024  # In-memory context window cache; 0 disables it
+    evidence_cache_ttl_seconds: float = 600.0
+    evidence_prefetch_top: int = 3  # Search hits whose evidence windows are cached after each search; 0 = none
+
+    # Source PDF pages served to evidence review (single-page PDFs cached under LOCAL_DATA_DIR; 0 disables)
+    page_cache_max_bytes: int = 512 * 1024 * 1024
+    page_range_max_pages: int = 20
+
+    # Document understanding (map-reduce over a document's text with the chat deployment)
+    understanding_tokens_per_minute: int = 150_000  # Chat deployment quota; split it between API processes
+    understanding_concurrency: int = 32  # Chat calls in flight per request
+    understanding_section_tokens: int = 8000  # Document text per map call
+    understanding_reduce_tokens: int = 24_000  # Section summaries per reduce call
+    understanding_section_summary_tokens: int = 400
+    understanding_final_tokens: int = 1000
+    understanding_summary_cache: bool = True  # Cache section summaries under LOCAL_DATA_DIR by content hash
+    understanding_result_cache: bool = True  # Store whole results in Cosmos DB next to the document's metadata
+    understanding_entity_model: bool = True  # Ask the chat deployment about names the entity rules cannot classify
+    entity_gazetteer_path: Optional[str] = None  # JSON file of extra gazetteer names, shaped like gazetteer.GAZETTEER
+
+    # Local stand-ins for uploads and the SQLite queue
+    local_data_dir: str = ".local"
+
+    # In-process stand-ins for Azure OpenAI, AI Search and Cosmos DB (offline runs and benchmarks)
+    use_local_services: bool = False
+    local_embedding_dimensions: int = 3072
+    local_latency_ms: float = 0.0
+    local_latency_jitter_ms: float = 0.0
+    local_throttle_rate: float = 0.0  # Share of calls answered with 429
+    local_failure_rate: float = 0.0  # Share of calls (and uploaded search documents) failing with 503
+    local_seed: int = 0
+
 
 settings = Settings()  # type: ignore[call-arg]
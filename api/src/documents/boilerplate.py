@@ -0,0 +1,95 @@
+"""Repeated header/footer removal for Hearings AI.
+
+ABAER decisions and hearing transcripts repeat running headers, footers,
+page numbers and court-reporter banners on every page. Lines near the top or
+bottom of a page that recur (ignoring digits) across enough of a document's
+pages are treated as boilerplate and dropped before chunking, so they are not
+embedded, indexed or matched by vector similarity. Page attribution is kept:
+each page keeps its page_number, only its text shrinks.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from src.config import settings
+
+DIGITS = re.compile(r'\d+')
+WHITESPACE = re.compile(r'\s+')
+# Paragraph markers like "[12]" after digit masking
+MASKED_PARAGRAPH_MARKER = re.compile(r'\[#\]')
+
+# Fewer pages than this gives too little evidence of repetition
+MIN_PAGES = 3
+
+
+@dataclass
+class BoilerplateStats:
+    """What boilerplate stripping removed from a document."""
+
+    patterns: int = 0
+    lines_removed: int = 0
+    characters_removed: int = 0
+
+
+def normalize_line(line: str) -> str:
+    """Line key that matches across pages: whitespace collapsed, digits masked, case folded."""
+    return DIGITS.sub("#", WHITESPACE.sub(" ", line.strip())).casefold()
+
+
+def edge_line_indexes(lines: list[str], edge: int) -> list[int]:
+    """Indexes of the first and last `edge` non-empty lines of a page."""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    if len(non_empty) <= 2 * edge:
+        return non_empty
+    return non_empty[:edge] + non_empty[-edge:]
+
+
+def find_boilerplate(pages: list[dict], min_fraction: float, edge: int) -> set[str]:
+    """Normalized edge lines that recur on at least `min_fraction` of the pages."""
+    if len(pages) < MIN_PAGES:
+        return set()
+
+    counts = Counter()
+    for page in pages:
+        lines = page["text"].splitlines()
+        counts.update({normalize_line(lines[i]) for i in edge_line_indexes(lines, edge)})
+
+    threshold = max(2, min_fraction * len(pages))
+    return {
+        key for key, count in counts.items()
+        # Paragraph markers mask to the same key on every page but are content
+        if count >= threshold and not MASKED_PARAGRAPH_MARKER.search(key)
+    }
+
+
+def strip_boilerplate(
+    pages: list[dict],
+    min_fraction: Optional[float] = None,
+    edge: Optional[int] = None,
+) -> tuple[list[dict], BoilerplateStats]:
+    """Remove repeated header/footer lines from each page's edges.
+
+    Pages left without text are dropped; all other page fields are kept.
+    """
+    min_fraction = settings.boilerplate_min_page_fraction if min_fraction is None else min_fraction
+    edge = settings.boilerplate_edge_lines if edge is None else edge
+
+    boilerplate = find_boilerplate(pages, min_fraction, edge)
+    stats = BoilerplateStats(patterns=len(boilerplate))
+    if not boilerplate:
+        return pages, stats
+
+    stripped = []
+    for page in pages:
+        lines = page["text"].splitlines()
+        removable = {i for i in edge_line_indexes(lines, edge) if normalize_line(lines[i]) in boilerplate}
+        for i in removable:
+            stats.lines_removed += 1
+            stats.characters_removed += len(lines[i])
+        text = "\n".join(line for i, line in enumerate(lines) if i not in removable)
+        if text.strip():
+            stripped.append({**page, "text": text})
+
+    return stripped, stats
@@ -0,0 +1,160 @@
+"""Portable ingestion bundles for Hearings AI.
+
+A bundle holds the output of the ingestion pipeline (search index documents
+with their embeddings, plus document metadata records) so a corpus embedded
+once can be loaded into any environment or index without re-embedding:
+
+    manifest.json    format version, embedding model, vector shape and dtype,
+                     and proceeding details for overviews (as in sample-proceedings.json)
+    chunks.jsonl     one search index document per line, without contentVector
+    vectors.npy      embedding matrix; row i belongs to line i of chunks.jsonl
+    documents.jsonl  one Cosmos DB metadata record per line
+    sources/         source PDFs, under their metadata records' blobName
+
+The manifest is written last, so a bundle without one is incomplete.
+Requires numpy (pip install "hearings-ai-api[bundle]").
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+BUNDLE_FORMAT = "hearings-ai-bundle"
+BUNDLE_VERSION = 1
+VECTOR_DTYPES = ("float16", "float32")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError('Bundles require numpy: pip install "hearings-ai-api[bundle]"') from e
+    return numpy
+
+
+class BundleWriter:
+    """Writes pipeline output to a bundle directory instead of Azure."""
+
+    def __init__(self, path: Path, embedding_model: str, vector_dtype: str = "float16") -> None:
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {vector_dtype}")
+        self.np = _numpy()
+        self.path = path
+        self.embedding_model = embedding_model
+        self.vector_dtype = vector_dtype
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / "manifest.json").unlink(missing_ok=True)
+
+        self._chunks = open(self.path / "chunks.jsonl", "w", encoding="utf-8")
+        self._documents = open(self.path / "documents.jsonl", "w", encoding="utf-8")
+        # Vectors are streamed raw and wrapped in an .npy header on close
+        self._vectors_tmp = self.path / "vectors.tmp"
+        self._vectors = open(self._vectors_tmp, "wb")
+        self.chunk_count = 0
+        self.document_count = 0
+        self.dimensions = None
+        self.proceedings: list[dict] = []
+
+    def add(self, index_documents: list[dict], metadata_record: dict) -> None:
+        """Add one document's search index documents and metadata record."""
+        for doc in index_documents:
+            vector = self.np.asarray(doc["contentVector"], dtype=self.vector_dtype)
+            if self.dimensions is None:
+                self.dimensions = len(vector)
+            elif len(vector) != self.dimensions:
+                raise ValueError(f"Vector for {doc['id']} has {len(vector)} dimensions, expected {self.dimensions}")
+            self._vectors.write(vector.tobytes())
+            self._chunks.write(json.dumps({k: v for k, v in doc.items() if k != "contentVector"}) + "\n")
+            self.chunk_count += 1
+
+        self._documents.write(json.dumps(metadata_record) + "\n")
+        self.document_count += 1
+
+    def add_source(self, blob_name: str, data: bytes) -> None:
+        """Add a source PDF, stored in the document store on import."""
+        path = self.path / "sources" / blob_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def add_proceeding(self, proceeding: dict) -> None:
+        """Add proceeding details, applied to the proceeding's overview on import."""
+        self.proceedings.append(proceeding)
+
+    def close(self) -> None:
+        """Finish the vector matrix and write the manifest."""
+        for f in (self._chunks, self._documents, self._vectors):
+            f.close()
+
+        shape = (self.chunk_count, self.dimensions or 0)
+        vectors = self.np.lib.format.open_memmap(
+            self.path / "vectors.npy", mode="w+", dtype=self.vector_dtype, shape=shape
+        )
+        if self.chunk_count:
+            vectors[:] = self.np.memmap(self._vectors_tmp, dtype=self.vector_dtype, mode="r", shape=shape)
+        vectors.flush()
+        del vectors
+        self._vectors_tmp.unlink()
+
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "created_at": datetime.utcnow().isoformat(),
+            "embedding_model": self.embedding_model,
+            "dimensions": shape[1],
+            "vector_dtype": self.vector_dtype,
+            "chunks": self.chunk_count,
+            "documents": self.document_count,
+            "proceedings": self.proceedings,
+        }
+        (self.path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+
+class BundleReader:
+    """Reads a bundle written by BundleWriter."""
+
+    def __init__(self, path: Path) -> None:
+        manifest_path = path / "manifest.json"
+        if not manifest_path.exists():
+            raise ValueError(f"{path} is not a complete bundle (no manifest.json)")
+        self.manifest = json.loads(manifest_path.read_text())
+        if self.manifest.get("format") != BUNDLE_FORMAT or self.manifest.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported bundle format in {path}")
+        self.np = _numpy()
+        self.path = path
+
+    def vectors(self) -> Any:
+        """Memory-mapped (chunks, dimensions) array of chunk vectors, in chunks.jsonl order."""
+        return self.np.load(self.path / "vectors.npy", mmap_mode="r")
+
+    def iter_index_documents(self, batch_size: int = 1000) -> Iterator[list[dict]]:
+        """Search index documents with contentVector restored, in batches."""
+        vectors = self.vectors()
+        batch = []
+        with open(self.path / "chunks.jsonl", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                doc = json.loads(line)
+                doc["contentVector"] = vectors[i].astype("float32").tolist()
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    @property
+    def proceedings(self) -> list[dict]:
+        """Proceeding details for overviews (none in bundles written before they were exported)."""
+        return self.manifest.get("proceedings", [])
+
+    def iter_metadata_records(self) -> Iterator[dict]:
+        """Cosmos DB metadata records."""
+        with open(self.path / "documents.jsonl", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def iter_sources(self) -> Iterator[tuple[str, Path]]:
+        """(blob name, file) of each source PDF in the bundle."""
+        for record in self.iter_metadata_records():
+            if record.get("blobName") and (path := self.path / "sources" / record["blobName"]).is_file():
+                yield record["blobName"], path
@@ -0,0 +1,88 @@
+"""Regulatory citation and paragraph number extraction for Hearings AI.
+
+All patterns are compiled into one alternation so a page is scanned once.
+Matches keep their character offsets, letting each chunk take the citations
+and paragraph numbers that fall inside its own spans of the page text.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass, field
+
+# Legislation and directive references, e.g. "REDA s. 34", "Directive 056 s. 2.1"
+LEGISLATION_PATTERN = r'(?:REDA|EPEA|OGCA|Pipeline\s+Act|Water\s+Act|Public\s+Lands\s+Act)\s+s\.?\s*\d+'
+DIRECTIVE_PATTERN = r'(?P<directive>Directive\s+0?\d+)(?P<directive_section>\s+s\.?\s*[\d\.]+)?'
+PARAGRAPH_PATTERN = r'\[(?P<paragraph>\d+)\]'
+
+CITATION_SCANNER = re.compile(
+    rf'(?P<legislation>{LEGISLATION_PATTERN})|{DIRECTIVE_PATTERN}|{PARAGRAPH_PATTERN}',
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class PageAnnotations:
+    """Citation and paragraph number matches in one page of text, ordered by offset."""
+
+    citation_starts: list[int] = field(default_factory=list)
+    citation_ends: list[int] = field(default_factory=list)
+    citations: list[str] = field(default_factory=list)
+    paragraph_starts: list[int] = field(default_factory=list)
+    paragraph_ends: list[int] = field(default_factory=list)
+    paragraphs: list[str] = field(default_factory=list)
+
+
+def scan_text(text: str) -> PageAnnotations:
+    """Scan text once for regulatory citations and paragraph numbers."""
+    annotations = PageAnnotations()
+
+    for match in CITATION_SCANNER.finditer(text):
+        if match.group("paragraph"):
+            annotations.paragraph_starts.append(match.start())
+            annotations.paragraph_ends.append(match.end())
+            annotations.paragraphs.append(match.group("paragraph"))
+        elif match.group("legislation"):
+            annotations.citation_starts.append(match.start())
+            annotations.citation_ends.append(match.end())
+            annotations.citations.append(match.group("legislation"))
+        else:
+            # A sectioned directive also counts as a reference to the directive itself
+            annotations.citation_starts.append(match.start())
+            annotations.citation_ends.append(match.start("directive") + len(match.group("directive")))
+            annotations.citations.append(match.group("directive"))
+            if match.group("directive_section"):
+                annotations.citation_starts.append(match.start())
+                annotations.citation_ends.append(match.end())
+                annotations.citations.append(match.group(0))
+
+    return annotations
+
+
+def _in_span(starts: list[int], ends: list[int], values: list[str], start: int, end: int) -> list[str]:
+    i = bisect.bisect_left(starts, start)
+    found = []
+    while i < len(starts) and starts[i] < end:
+        if ends[i] <= end:
+            found.append(values[i])
+        i += 1
+    return found
+
+
+def citations_in_span(annotations: PageAnnotations, start: int, end: int) -> list[str]:
+    """Citations wholly inside [start, end) of the scanned text, in order of appearance."""
+    return _in_span(annotations.citation_starts, annotations.citation_ends, annotations.citations, start, end)
+
+
+def paragraphs_in_span(annotations: PageAnnotations, start: int, end: int) -> list[str]:
+    """Paragraph numbers wholly inside [start, end) of the scanned text, in order of appearance."""
+    return _in_span(annotations.paragraph_starts, annotations.paragraph_ends, annotations.paragraphs, start, end)
+
+
+def extract_paragraph_numbers(text: str) -> list[str]:
+    """Extract -style paragraph numbers like [1], [2], etc."""
+    return scan_text(text).paragraphs
+
+
+def extract_regulatory_citations(text: str) -> list[str]:
+    """Extract regulatory citations from text."""
+    return list(dict.fromkeys(scan_text(text).citations))
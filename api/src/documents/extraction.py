@@ -0,0 +1,268 @@
+"""PDF text extraction for Hearings AI.
+
+Supports selectable backends:
+- "pypdf": pure Python, always available
+- "pymupdf": MuPDF bindings, several times faster (pip install "hearings-ai-api[fast-pdf]")
+
+"auto" picks the fastest installed backend. Large documents are split into
+page ranges extracted in parallel worker processes. Failures are recorded per
+page instead of aborting (or silently truncating) the whole document.
+
+Extracted pages are cached as gzipped JSONL keyed by PDF content hash, so
+re-chunking or re-indexing a corpus reads files instead of re-parsing PDFs.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+
+BACKENDS = ("pymupdf", "pypdf")
+
+
+@dataclass
+class PageFailure:
+    """A page that could not be extracted."""
+
+    page_number: int
+    error: str
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted pages of a document with throughput and failure details."""
+
+    pages: list[dict]
+    page_count: int
+    backend: str
+    seconds: float
+    failures: list[PageFailure] = field(default_factory=list)
+    error: Optional[str] = None  # Set when the document could not be opened at all
+    cached: bool = False
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.page_count / self.seconds if self.seconds else 0.0
+
+
+class ExtractionCache:
+    """Extracted pages on disk, one gzipped JSONL file per (PDF content hash, backend).
+
+    The first line is a header with the page count and page failures; each
+    following line is one page dict as produced by extraction.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, content_hash: str, backend: str) -> Path:
+        return self.root / content_hash[:2] / f"{content_hash}.{backend}.jsonl.gz"
+
+    def get(self, content_hash: str, backend: str) -> Optional[ExtractionResult]:
+        path = self._path(content_hash, backend)
+        if not path.exists():
+            return None
+
+        started = time.perf_counter()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                pages = [json.loads(line) for line in f]
+        except (OSError, EOFError, ValueError):
+            # Truncated or corrupt entry; extract again and overwrite it
+            return None
+
+        return ExtractionResult(
+            pages=pages,
+            page_count=header["page_count"],
+            backend=backend,
+            seconds=time.perf_counter() - started,
+            failures=[PageFailure(**failure) for failure in header["failures"]],
+            cached=True,
+        )
+
+    def put(self, content_hash: str, result: ExtractionResult) -> None:
+        path = self._path(content_hash, result.backend)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        header = {
+            "page_count": result.page_count,
+            "failures": [{"page_number": f.page_number, "error": f.error} for f in result.failures],
+        }
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for page in result.pages:
+                f.write(json.dumps(page) + "\n")
+        tmp_path.replace(path)
+
+
+@lru_cache()
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the extraction cache, or None if EXTRACTION_CACHE is off."""
+    if not settings.extraction_cache:
+        return None
+    return ExtractionCache(Path(settings.local_data_dir) / "extraction-cache")
+
+
+def available_backends() -> list[str]:
+    """Installed extraction backends, fastest first."""
+    backends = []
+    try:
+        import fitz  # noqa: F401
+
+        backends.append("pymupdf")
+    except ImportError:
+        pass
+    backends.append("pypdf")
+    return backends
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Resolve a backend name ("auto" or None means the fastest installed)."""
+    name = name or settings.extraction_backend
+    if name == "auto":
+        return available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {name}")
+    if name not in available_backends():
+        raise ValueError(f"Extraction backend not installed: {name}")
+    return name
+
+
+def count_pages(pdf_path: Path, backend: str) -> int:
+    if backend == "pymupdf":
+        import fitz
+
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+
+    from pypdf import PdfReader
+
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_page_range(pdf_path: Path, backend: str, start: int, end: int) -> tuple[list[dict], list[PageFailure]]:
+    """Extract pages [start, end) (0-based). Runs in worker processes."""
+    pages = []
+    failures = []
+
+    if backend == "pymupdf":
+        import fitz
+
+        doc = fitz.open(pdf_path)
+
+        def page_text(i: int) -> str:
+            return doc.load_page(i).get_text()
+    else:
+        from pypdf import PdfReader
+
+        reader = PdfReader(pdf_path)
+
+        def page_text(i: int) -> str:
+            return reader.pages[i].extract_text()
+
+    for i in range(start, end):
+        try:
+            text = page_text(i) or ""
+        except Exception as e:
+            failures.append(PageFailure(page_number=i + 1, error=str(e)))
+            continue
+        if text.strip():
+            pages.append({
+                "page_number": i + 1,
+                "text": text,
+            })
+
+    return pages, failures
+
+
+def extraction_workers() -> int:
+    """Worker processes for page-range fan-out (EXTRACTION_WORKERS, default one per CPU)."""
+    return settings.extraction_workers or os.cpu_count() or 1
+
+
+@lru_cache()
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all extractions (created on first use)."""
+    # Spawn rather than fork: the pool is created from processes running threads
+    return ProcessPoolExecutor(
+        max_workers=extraction_workers(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _extract_serial(pdf_path: Path, backend: str) -> ExtractionResult:
+    started = time.perf_counter()
+    try:
+        page_count = count_pages(pdf_path, backend)
+        pages, failures = extract_page_range(pdf_path, backend, 0, page_count)
+    except Exception as e:
+        return ExtractionResult([], 0, backend, time.perf_counter() - started, error=str(e))
+    return ExtractionResult(pages, page_count, backend, time.perf_counter() - started, failures)
+
+
+def extract_text_from_pdf(pdf_path: Path, backend: Optional[str] = None) -> ExtractionResult:
+    """Extract text from PDF in this process, preserving page numbers."""
+    return _extract_serial(pdf_path, resolve_backend(backend))
+
+
+async def extract_document_text(
+    pdf_path: Path,
+    backend: Optional[str] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> ExtractionResult:
+    """Extract text from PDF, reading from and filling the extraction cache if given."""
+    backend = resolve_backend(backend)
+    if cache is None:
+        return await _extract_parallel(pdf_path, backend)
+
+    content_hash = hashlib.sha256(await asyncio.to_thread(pdf_path.read_bytes)).hexdigest()
+    if cached := await asyncio.to_thread(cache.get, content_hash, backend):
+        return cached
+
+    result = await _extract_parallel(pdf_path, backend)
+    if not result.error:
+        await asyncio.to_thread(cache.put, content_hash, result)
+    return result
+
+
+async def _extract_parallel(pdf_path: Path, backend: str) -> ExtractionResult:
+    """Extract text from PDF, fanning page ranges out to worker processes for large documents."""
+    started = time.perf_counter()
+
+    try:
+        page_count = await asyncio.to_thread(count_pages, pdf_path, backend)
+    except Exception as e:
+        return ExtractionResult([], 0, backend, time.perf_counter() - started, error=str(e))
+
+    pages_per_task = settings.extraction_pages_per_task
+    if extraction_workers() == 1 or page_count < 2 * pages_per_task:
+        return await asyncio.to_thread(_extract_serial, pdf_path, backend)
+
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    ranges = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, extract_page_range, pdf_path, backend, start, end) for start, end in ranges
+        ))
+    except Exception as e:
+        return ExtractionResult([], page_count, backend, time.perf_counter() - started, error=str(e))
+
+    return ExtractionResult(
+        pages=[page for range_pages, _ in results for page in range_pages],
+        page_count=page_count,
+        backend=backend,
+        seconds=time.perf_counter() - started,
+        failures=[failure for _, range_failures in results for failure in range_failures],
+    )
@@ -0,0 +1,59 @@
+"""Item layout of the Cosmos DB documents container.
+
+The container is partitioned by proceedingId (infra/main.bicep), and every
+read the API makes is a point read (item ID plus partition key) instead of a
+query:
+
+    item                        id                                partition key
+    document metadata record    <documentId>                      <proceedingId>
+    understanding result        <documentId>:understanding:<op>   <proceedingId>
+    proceeding overview         <proceedingId>:overview           <proceedingId>
+    document locator            <documentId>:locator              document:<documentId>
+
+A proceeding's records, results and overview share one logical partition,
+so the writes of one ingestion run batch per proceeding. Requests that only
+carry a document ID (status, pages) first read the document's locator, a
+small item in a partition of its own that names the document's proceeding:
+two point reads, where a query by ID fans out to every physical partition.
+Documents without a proceeding are filed under "unknown".
+
+The "proceedings" container in the infra templates is not used: proceeding
+details live in the overview item, next to the documents they describe.
+"""
+
+PARTITION_KEY_FIELD = "proceedingId"
+
+UNKNOWN_PROCEEDING = "unknown"
+
+LOCATOR_RECORD_TYPE = "documentLocator"
+
+
+def overview_id(proceeding_id: str) -> str:
+    """Item ID of a proceeding's overview, in the proceeding's partition."""
+    return f"{proceeding_id}:overview"
+
+
+def result_id(document_id: str, operation: str) -> str:
+    """Item ID of an operation's stored understanding result, in the document's proceeding partition."""
+    return f"{document_id}:understanding:{operation}"
+
+
+def locator_id(document_id: str) -> str:
+    """Item ID of a document's locator."""
+    return f"{document_id}:locator"
+
+
+def locator_partition(document_id: str) -> str:
+    """Partition key of a document's locator: one logical partition per document."""
+    return f"document:{document_id}"
+
+
+def locator_item(record: dict) -> dict:
+    """The locator of a document metadata record, naming the partition the record is in."""
+    return {
+        "id": locator_id(record["id"]),
+        PARTITION_KEY_FIELD: locator_partition(record["id"]),
+        "recordType": LOCATOR_RECORD_TYPE,
+        "documentId": record["id"],
+        "documentProceedingId": record[PARTITION_KEY_FIELD],
+    }
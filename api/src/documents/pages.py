@@ -0,0 +1,135 @@
+"""Page-level PDF serving for Hearings AI.
+
+Evidence review needs the original pages, and source decisions can run to
+hundreds of pages. Pages are cut from the stored PDF with pypdf through a
+seekable stream (DocumentStore.open), so only the trailer, cross-reference
+table, page tree and the requested pages' objects are read: ranged blob
+downloads in Azure, file reads locally. Cut pages are kept as single-page
+PDFs in an LRU disk cache under LOCAL_DATA_DIR; document IDs are content
+hashes, so cached pages never go stale.
+"""
+
+import io
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from pypdf import PdfReader, PdfWriter
+
+from src.config import settings
+from src.documents.storage import get_document_store
+
+DOCUMENT_ID = re.compile(r"[\w-]+")
+
+
+class PageRangeError(ValueError):
+    """The requested pages are not in the document."""
+
+
+class PageCache:
+    """Single-page PDFs on disk, evicting the least recently used beyond max_bytes.
+
+    Recency is the file modification time, refreshed on every hit, so the
+    cache survives restarts and can be shared by several API processes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.size_bytes = sum(path.stat().st_size for path in self.root.rglob("*.pdf"))
+
+    def _path(self, document_id: str, page_number: int) -> Path:
+        if not DOCUMENT_ID.fullmatch(document_id):
+            raise ValueError(f"Invalid document ID: {document_id}")
+        return self.root / document_id[:2] / f"{document_id}.p{page_number}.pdf"
+
+    def get(self, document_id: str, page_number: int) -> Optional[Path]:
+        path = self._path(document_id, page_number)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, document_id: str, page_number: int, data: bytes) -> Path:
+        path = self._path(document_id, page_number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        with self.lock:
+            self.size_bytes += len(data)
+            if self.size_bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def _evict(self) -> None:
+        # Evict down to 90% so a full cache is not rescanned on every put
+        files = sorted(self.root.rglob("*.pdf"), key=lambda path: path.stat().st_mtime)
+        self.size_bytes = sum(path.stat().st_size for path in files)
+        for path in files:
+            if self.size_bytes <= self.max_bytes * 0.9:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self.size_bytes -= size
+
+
+@lru_cache()
+def get_page_cache() -> Optional[PageCache]:
+    """Get the page cache, or None if PAGE_CACHE_MAX_BYTES is 0."""
+    if settings.page_cache_max_bytes <= 0:
+        return None
+    return PageCache(Path(settings.local_data_dir) / "page-cache", settings.page_cache_max_bytes)
+
+
+def cut_pages(source: BinaryIO, page_numbers: list[int]) -> dict[int, bytes]:
+    """Single-page PDFs for 1-based page_numbers of the PDF in source."""
+    reader = PdfReader(source)
+    page_count = len(reader.pages)
+    pages = {}
+    for page_number in page_numbers:
+        if not 1 <= page_number <= page_count:
+            raise PageRangeError(f"Page {page_number} is outside the document's {page_count} pages")
+        writer = PdfWriter()
+        writer.add_page(reader.pages[page_number - 1])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        pages[page_number] = buffer.getvalue()
+    return pages
+
+
+def get_pages(document_id: str, blob_name: str, first: int, last: int) -> Union[Path, bytes]:
+    """Pages first..last of a stored document as a PDF.
+
+    A single page is returned as its cache file path when the cache is on;
+    ranges are merged from the single-page PDFs into one PDF.
+    """
+    cache = get_page_cache()
+    page_numbers = list(range(first, last + 1))
+    pages: dict[int, Union[Path, bytes]] = {}
+    for page_number in page_numbers:
+        if cache and (path := cache.get(document_id, page_number)):
+            pages[page_number] = path
+
+    missing = [page_number for page_number in page_numbers if page_number not in pages]
+    if missing:
+        with get_document_store().open(blob_name) as source:
+            for page_number, data in cut_pages(source, missing).items():
+                pages[page_number] = cache.put(document_id, page_number, data) if cache else data
+
+    if first == last:
+        return pages[first]
+
+    writer = PdfWriter()
+    for page_number in page_numbers:
+        page = pages[page_number]
+        writer.append(PdfReader(page if isinstance(page, Path) else io.BytesIO(page)))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,922 @@
+"""Document ingestion pipeline for Hearings AI.
+
+Processes PDF documents:
+1. Extract text from PDF
+2. Chunk text (512 tokens, 128 overlap)
+3. Generate embeddings via Azure OpenAI
+4. Index chunks in Azure AI Search (and the evidence chunk store, if separate)
+5. Store metadata in Cosmos DB
+
+Shared by scripts/ingest-documents.py (bulk loads) and the ingestion worker
+behind /api/documents/ingest.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+import structlog
+import tiktoken
+from azure.core.exceptions import HttpResponseError
+from azure.cosmos.aio import CosmosClient
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.identity.aio import DefaultAzureCredential
+from azure.search.documents.aio import SearchClient
+from openai import AsyncAzureOpenAI
+
+from src.config import settings
+from src.documents.boilerplate import strip_boilerplate
+from src.documents.bundle import BundleWriter
+from src.documents.citations import PageAnnotations, citations_in_span, paragraphs_in_span, scan_text
+from src.documents.extraction import extract_document_text, get_extraction_cache
+from src.documents.layout import UNKNOWN_PROCEEDING, locator_id, locator_item, locator_partition
+from src.documents.service import build_metadata_record
+from src.documents.storage import (
+    compute_document_id,  # noqa: F401 - re-exported for scripts
+    get_document_store,
+    upload_blob_name,
+)
+from src.evidence.store import get_chunk_store
+from src.proceedings.overview import add_documents, remove_document
+from src.understanding.entities import document_entities
+from src.understanding.summarize import document_paragraphs
+
+logger = structlog.get_logger()
+
+EMBEDDING_DEPLOYMENT = settings.azure_openai_deployment_embedding
+
+CHUNK_SIZE = settings.chunk_size_tokens
+CHUNK_OVERLAP = settings.chunk_overlap_tokens
+EMBEDDING_BATCH_SIZE = 16
+EMBEDDING_DEDUP_MAX_ENTRIES = settings.embedding_dedup_max_entries
+
+# Search upload batching (the service rejects requests over 16 MB or 1000 documents)
+UPLOAD_BATCH_MAX_BYTES = settings.upload_batch_max_bytes
+UPLOAD_BATCH_MAX_DOCS = 1000
+UPLOAD_CONCURRENCY = settings.upload_concurrency
+UPLOAD_MAX_RETRIES = 3
+UPLOAD_RETRY_BACKOFF_SECONDS = 1.0
+RETRYABLE_STATUS_CODES = {409, 422, 429, 500, 503}
+
+# Cosmos DB metadata writes (transactional batches are limited to 100 operations)
+COSMOS_FLUSH_THRESHOLD = settings.cosmos_flush_threshold
+COSMOS_CONCURRENCY = settings.cosmos_concurrency
+COSMOS_BATCH_MAX_OPERATIONS = 100
+
+# Tokenizer for chunk sizing
+TOKENIZER = tiktoken.get_encoding("cl100k_base")
+
+
+class RunJournal:
+    """Append-only checkpoint log for an ingestion run.
+
+    Each line records a completed stage for a document (extracted, chunked,
+    embedded:k, uploaded:k, metadata_saved). Chunks and embedding batches are
+    persisted next to the log so a restarted run resumes where it stopped
+    without re-extracting or re-embedding.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.path / "journal.jsonl"
+        self.events: dict[str, dict[str, dict]] = {}
+        
+        if self.log_path.exists():
+            for line in self.log_path.read_text().splitlines():
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write can leave a truncated last line
+                    continue
+                self.events.setdefault(event["document_id"], {})[event["stage"]] = event
+        
+        self._log = self.log_path.open("a")
+        if self._log.tell() and not self.log_path.read_text().endswith("\n"):
+            self._log.write("\n")
+
+    def is_done(self, document_id: str, stage: str) -> bool:
+        return stage in self.events.get(document_id, {})
+
+    def get(self, document_id: str, stage: str) -> Optional[dict]:
+        return self.events.get(document_id, {}).get(stage)
+
+    def record(self, document_id: str, stage: str, **details: Any) -> None:
+        """Append a completed stage to the log and flush it to disk."""
+        event = {"document_id": document_id, "stage": stage, "at": datetime.utcnow().isoformat(), **details}
+        self.events.setdefault(document_id, {})[stage] = event
+        self._log.write(json.dumps(event) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def save_artifact(self, document_id: str, name: str, data: Any) -> None:
+        artifact_dir = self.path / document_id
+        artifact_dir.mkdir(exist_ok=True)
+        tmp_path = artifact_dir / f"{name}.json.tmp"
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(artifact_dir / f"{name}.json")
+
+    def load_artifact(self, document_id: str, name: str) -> Any:
+        return json.loads((self.path / document_id / f"{name}.json").read_text())
+
+    def close(self) -> None:
+        self._log.close()
+
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+# A piece of chunk text and the (page index, start, end) spans of page text it came from
+Piece = tuple[str, list[tuple[int, int, int]]]
+
+
+def split_with_spans(text: str, pattern: re.Pattern, page_index: int, offset: int = 0) -> list[Piece]:
+    """Split text on pattern into stripped, non-empty pieces with their page offsets."""
+    pieces = []
+    pos = 0
+    for match in [*pattern.finditer(text), None]:
+        end = match.start() if match else len(text)
+        raw = text[pos:end]
+        stripped = raw.strip()
+        if stripped:
+            start = offset + pos + len(raw) - len(raw.lstrip())
+            pieces.append((stripped, [(page_index, start, start + len(stripped))]))
+        if match:
+            pos = match.end()
+    return pieces
+
+
+def build_chunk(
+    chunk_id: int,
+    pieces: list[Piece],
+    separator: str,
+    page_number: int,
+    annotations: list[PageAnnotations],
+    page_texts: list[str],
+) -> dict:
+    """Assemble a chunk record, taking citations and paragraph numbers from its page spans."""
+    # Merge spans of the same page separated only by whitespace (or overlapping);
+    # otherwise "REDA s. 34" split at "s. " would be lost. Text between spans that
+    # are further apart is not in the chunk, so neither are its citations.
+    merged: list[list[int]] = []
+    for page_index, start, end in dict.fromkeys(span for _, spans in pieces for span in spans):
+        previous = merged[-1] if merged else None
+        if (
+            previous and previous[0] == page_index and previous[1] <= start
+            and not page_texts[page_index][previous[2]:start].strip()
+        ):
+            previous[2] = max(previous[2], end)
+        else:
+            merged.append([page_index, start, end])
+    
+    citations: dict[str, None] = {}
+    paragraph_numbers: dict[str, None] = {}
+    for page_index, start, end in merged:
+        citations.update(dict.fromkeys(citations_in_span(annotations[page_index], start, end)))
+        paragraph_numbers.update(dict.fromkeys(paragraphs_in_span(annotations[page_index], start, end)))
+    
+    return {
+        "chunk_id": chunk_id,
+        "content": separator.join(text for text, _ in pieces),
+        "page_number": page_number,
+        "paragraph_number": next(iter(paragraph_numbers), None),
+        "paragraph_numbers": list(paragraph_numbers),
+        "regulatory_citations": list(citations),
+    }
+
+
+def chunk_text(
+    pages: list[dict],
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+    stats: Optional[dict] = None,
+) -> list[dict]:
+    """Chunk text into token-sized pieces with overlap, preserving page info.
+
+    Each page is scanned once for citations and paragraph numbers; chunks pick
+    up the matches that fall inside the page spans they were built from. If
+    stats is given, stats["tokens"] is set to the number of input tokens.
+    """
+    chunks = []
+    current_chunk: list[Piece] = []
+    current_tokens = 0
+    current_page = 1
+    chunk_id = 0
+    input_tokens = 0
+    page_texts = [page["text"] for page in pages]
+    annotations = [scan_text(text) for text in page_texts]
+    
+    for page_index, page in enumerate(pages):
+        page_num = page["page_number"]
+        text = page["text"]
+        
+        # Split by paragraphs (try to preserve paragraph structure)
+        for para, para_spans in split_with_spans(text, PARAGRAPH_BREAK, page_index):
+            para_tokens = len(TOKENIZER.encode(para))
+            
+            # If this paragraph alone exceeds chunk size, split it
+            if para_tokens > chunk_size:
+                # First, save current chunk if any
+                if current_chunk:
+                    chunks.append(build_chunk(chunk_id, current_chunk, "\n\n", current_page, annotations, page_texts))
+                    chunk_id += 1
+                    current_chunk = []
+                    current_tokens = 0
+                
+                # Split long paragraph by sentences
+                _, para_start, _ = para_spans[0]
+                for sent, sent_spans in split_with_spans(para, SENTENCE_BREAK, page_index, para_start):
+                    sent_tokens = len(TOKENIZER.encode(sent))
+                    input_tokens += sent_tokens
+                    if current_tokens + sent_tokens > chunk_size and current_chunk:
+                        chunks.append(build_chunk(chunk_id, current_chunk, " ", current_page, annotations, page_texts))
+                        chunk_id += 1
+                        # Keep overlap
+                        if len(current_chunk) >= 2:
+                            overlap_text = " ".join(text for text, _ in current_chunk[-2:])
+                            overlap_spans = [span for _, spans in current_chunk[-2:] for span in spans]
+                            current_chunk = [(overlap_text, overlap_spans)]
+                            current_tokens = len(TOKENIZER.encode(overlap_text))
+                        else:
+                            current_chunk = []
+                            current_tokens = 0
+                    
+                    current_chunk.append((sent, sent_spans))
+                    current_tokens += sent_tokens
+                    current_page = page_num
+            
+            elif current_tokens + para_tokens > chunk_size:
+                input_tokens += para_tokens
+                # Save current chunk
+                chunks.append(build_chunk(chunk_id, current_chunk, "\n\n", current_page, annotations, page_texts))
+                chunk_id += 1
+                
+                # Start new chunk with overlap
+                overlap_paragraphs = current_chunk[-1:] if current_chunk else []
+                current_chunk = overlap_paragraphs + [(para, para_spans)]
+                current_tokens = sum(len(TOKENIZER.encode(p)) for p, _ in current_chunk)
+                current_page = page_num
+            else:
+                input_tokens += para_tokens
+                current_chunk.append((para, para_spans))
+                current_tokens += para_tokens
+                current_page = page_num
+    
+    # Don't forget the last chunk
+    if current_chunk:
+        chunks.append(build_chunk(chunk_id, current_chunk, "\n\n", current_page, annotations, page_texts))
+    
+    if stats is not None:
+        stats["tokens"] = input_tokens
+    return chunks
+
+
+def text_hash(text: str) -> str:
+    """Content hash identifying identical chunk texts."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingDeduplicator:
+    """Embeddings already generated in this run, keyed by chunk text hash.
+
+    Shared across documents so boilerplate paragraphs, appendices and overlap
+    regions repeated within and between documents are embedded once. Bounded
+    to max_entries vectors, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = EMBEDDING_DEDUP_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.vectors: OrderedDict[str, list[float]] = OrderedDict()
+        self.seen: set[str] = set()
+        self.total = 0  # Chunk texts requested
+        self.embedded = 0  # Texts sent to Azure OpenAI
+
+    @property
+    def unique(self) -> int:
+        return len(self.seen)
+
+    def get(self, key: str) -> Optional[list[float]]:
+        vector = self.vectors.get(key)
+        if vector is not None:
+            self.vectors.move_to_end(key)
+        return vector
+
+    def put(self, key: str, vector: list[float]) -> None:
+        self.vectors[key] = vector
+        self.vectors.move_to_end(key)
+        if len(self.vectors) > self.max_entries:
+            self.vectors.popitem(last=False)
+
+
+async def generate_embeddings(
+    openai_client: AsyncAzureOpenAI,
+    texts: list[str],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    journal: Optional[RunJournal] = None,
+    document_id: Optional[str] = None,
+    deduplicator: Optional[EmbeddingDeduplicator] = None,
+) -> list[list[float]]:
+    """Generate embeddings for texts in batches, embedding each distinct text once.
+
+    Vectors are looked up by text hash, from the deduplicator (earlier
+    documents in the run) and, with a journal, from batches checkpointed by an
+    earlier run (including journals that saved vectors only); only the
+    remaining distinct texts are sent to Azure OpenAI.
+    """
+    hashes = [text_hash(text) for text in texts]
+    known: dict[str, list[float]] = {}
+    
+    if deduplicator:
+        deduplicator.total += len(texts)
+        deduplicator.seen.update(hashes)
+        for key in set(hashes):
+            if (vector := deduplicator.get(key)) is not None:
+                known[key] = vector
+    
+    batches_done = 0
+    if journal and document_id in journal.events:
+        for stage in journal.events[document_id]:
+            if stage.startswith("embedded:"):
+                k = int(stage.split(":")[1])
+                artifact = journal.load_artifact(document_id, f"embeddings-{k}")
+                if isinstance(artifact, list):
+                    # Journals from before deduplication saved batch k of the texts in order, as vectors only
+                    artifact = {"hashes": hashes[k * batch_size:(k + 1) * batch_size], "vectors": artifact}
+                known.update(zip(artifact["hashes"], artifact["vectors"]))
+                batches_done = max(batches_done, k + 1)
+    
+    missing = {}
+    for key, text in zip(hashes, texts):
+        if key not in known:
+            missing.setdefault(key, text)
+    missing_keys = list(missing)
+    
+    for k, i in enumerate(range(0, len(missing_keys), batch_size), start=batches_done):
+        batch_keys = missing_keys[i:i + batch_size]
+        response = await openai_client.embeddings.create(
+            input=[missing[key] for key in batch_keys],
+            model=EMBEDDING_DEPLOYMENT,
+        )
+        batch_embeddings = [e.embedding for e in response.data]
+        known.update(zip(batch_keys, batch_embeddings))
+        if deduplicator:
+            deduplicator.embedded += len(batch_keys)
+        
+        if journal:
+            journal.save_artifact(
+                document_id, f"embeddings-{k}", {"hashes": batch_keys, "vectors": batch_embeddings}
+            )
+            journal.record(document_id, f"embedded:{k}")
+    
+    if deduplicator:
+        for key, vector in known.items():
+            deduplicator.put(key, vector)
+    
+    return [known[key] for key in hashes]
+
+
+def extract_entities(texts: list[str]) -> dict:
+    """Rules-extracted entities of a document's chunk texts, shaped for its metadata record."""
+    return document_entities(document_paragraphs(texts)).to_record()
+
+
+def batch_documents_by_size(
+    documents: list[dict],
+    max_bytes: int = UPLOAD_BATCH_MAX_BYTES,
+    max_docs: int = UPLOAD_BATCH_MAX_DOCS,
+) -> list[list[dict]]:
+    """Split documents into upload batches bounded by serialized JSON size.
+
+    A single document larger than max_bytes still gets a batch of its own.
+    """
+    batches = []
+    current: list[dict] = []
+    current_bytes = 0
+    
+    for doc in documents:
+        doc_bytes = len(json.dumps(doc, separators=(",", ":")).encode("utf-8"))
+        if current and (current_bytes + doc_bytes > max_bytes or len(current) >= max_docs):
+            batches.append(current)
+            current = []
+            current_bytes = 0
+        current.append(doc)
+        current_bytes += doc_bytes
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+
+async def upload_batch(
+    search_client: SearchClient,
+    batch: list[dict],
+    semaphore: asyncio.Semaphore,
+    max_retries: int = UPLOAD_MAX_RETRIES,
+) -> tuple[int, list[str]]:
+    """Upload one batch, retrying only the keys the service reports as failed.
+
+    Returns the number of documents indexed and the keys that still failed,
+    including keys the service rejected outright (not retried).
+    """
+    pending = batch
+    succeeded = 0
+    rejected: list[str] = []
+    
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await asyncio.sleep(UPLOAD_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        
+        try:
+            async with semaphore:
+                results = await search_client.upload_documents(documents=pending)
+        except HttpResponseError as e:
+            if e.status_code == 413 and len(pending) > 1:
+                # Request too large for the service: halve it and upload both parts
+                mid = len(pending) // 2
+                halves = await asyncio.gather(
+                    upload_batch(search_client, pending[:mid], semaphore, max_retries - attempt),
+                    upload_batch(search_client, pending[mid:], semaphore, max_retries - attempt),
+                )
+                return succeeded + sum(h[0] for h in halves), rejected + [k for h in halves for k in h[1]]
+            if e.status_code not in RETRYABLE_STATUS_CODES:
+                break
+            continue
+        
+        failed = set()
+        for result in results:
+            if result.succeeded:
+                succeeded += 1
+            elif result.status_code in RETRYABLE_STATUS_CODES:
+                failed.add(result.key)
+            else:
+                rejected.append(result.key)
+                logger.warning(
+                    "Chunk rejected by search index",
+                    key=result.key,
+                    status_code=result.status_code,
+                    error=result.error_message,
+                )
+        
+        pending = [doc for doc in pending if doc["id"] in failed]
+        if not pending:
+            return succeeded, rejected
+    
+    return succeeded, rejected + [doc["id"] for doc in pending]
+
+
+def build_index_documents(
+    document_id: str,
+    chunks: list[dict],
+    embeddings: list[list[float]],
+    metadata: dict,
+) -> list[dict]:
+    """Build the Azure AI Search documents for a document's chunks."""
+    documents = []
+    
+    for chunk, embedding in zip(chunks, embeddings):
+        doc = {
+            "id": f"{document_id}-{chunk['chunk_id']}",
+            "documentId": document_id,
+            "proceedingId": metadata.get("proceeding_id", "unknown"),
+            "documentType": metadata.get("document_type", "unknown"),
+            "abaerCitation": metadata.get("abaer_citation"),
+            "chunkId": chunk["chunk_id"],
+            "pageNumber": chunk["page_number"],
+            "paragraphNumber": chunk.get("paragraph_number"),
+            "sectionTitle": None,  # Could be extracted from headers
+            "content": chunk["content"],
+            "contentVector": embedding,
+            "confidentialityLevel": metadata.get("confidentiality_level", "public"),
+            "parties": [p.get("name", p) if isinstance(p, dict) else p for p in metadata.get("parties", [])],
+            "regulatoryCitations": chunk.get("regulatory_citations", []),
+            "title": metadata.get("title", "Unknown Document"),
+            "sourceUrl": metadata.get("source_url"),
+        }
+        documents.append(doc)
+    
+    return documents
+
+
+async def upload_documents(
+    search_client: SearchClient,
+    documents: list[dict],
+    document_id: Optional[str] = None,
+    journal: Optional[RunJournal] = None,
+) -> int:
+    """Upload search documents in concurrent size-bounded batches.
+
+    With a journal, fully uploaded batches are checkpointed and skipped on resume.
+    """
+    indexed = 0
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    
+    async def upload(k: int, batch: list[dict]) -> None:
+        nonlocal indexed
+        if journal and (done := journal.get(document_id, f"uploaded:{k}")):
+            indexed += done["indexed"]
+            return
+        
+        succeeded, failed_keys = await upload_batch(search_client, batch, semaphore)
+        indexed += succeeded
+        if failed_keys:
+            logger.warning(
+                "Chunks failed to index",
+                document_id=document_id,
+                failed=len(failed_keys),
+                keys=failed_keys[:5],
+            )
+        elif journal:
+            journal.record(document_id, f"uploaded:{k}", indexed=succeeded)
+    
+    await asyncio.gather(*(upload(k, batch) for k, batch in enumerate(batch_documents_by_size(documents))))
+    
+    return indexed
+
+
+class CosmosMetadataWriter:
+    """Buffers document metadata records and writes them to Cosmos DB in bulk.
+
+    Records are grouped by proceedingId partition and written as transactional
+    batches, with a bounded number of batches in flight. Indexed records also
+    get their locator and proceeding overview entry (src.documents.layout);
+    a document whose locator names another proceeding has its record and
+    overview entry there deleted.
+    Request charges are summed from the response headers so the RU cost of a
+    run can be reported.
+    """
+
+    def __init__(
+        self,
+        container,
+        flush_threshold: int = COSMOS_FLUSH_THRESHOLD,
+        concurrency: int = COSMOS_CONCURRENCY,
+        on_written: Optional[Callable[[dict], None]] = None,
+        update_overviews: bool = True,
+    ) -> None:
+        self.container = container
+        self.on_written = on_written
+        self.update_overviews = update_overviews
+        self.flush_threshold = flush_threshold
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.buffer: list[dict] = []
+        self.written = 0
+        self.failed: list[str] = []
+        self.request_charge = 0.0
+
+    def _record_charge(self, headers: dict, _result: Any) -> None:
+        self.request_charge += float(headers.get("x-ms-request-charge", 0) or 0)
+
+    async def add(self, record: dict) -> None:
+        """Buffer a record, flushing once the buffer reaches the threshold."""
+        self.buffer.append(record)
+        if len(self.buffer) >= self.flush_threshold:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered records."""
+        records, self.buffer = self.buffer, []
+        
+        by_partition: dict[str, list[dict]] = {}
+        for record in records:
+            by_partition.setdefault(record["proceedingId"], []).append(record)
+        
+        await asyncio.gather(*(
+            self._write_batch(partition_key, items[i:i + COSMOS_BATCH_MAX_OPERATIONS])
+            for partition_key, items in by_partition.items()
+            for i in range(0, len(items), COSMOS_BATCH_MAX_OPERATIONS)
+        ))
+
+    async def _write_batch(self, partition_key: str, items: list[dict]) -> None:
+        async with self.semaphore:
+            written = await self._upsert(partition_key, items)
+            indexed = [item for item in written if item.get("processingStatus") == "indexed"]
+            located = await asyncio.gather(*(self._write_locator(item) for item in indexed))
+            saved = [item for item in written if item.get("processingStatus") != "indexed"]
+            saved += [item for item, ok in zip(indexed, located) if ok]
+            if self.update_overviews and indexed:
+                try:
+                    await add_documents(self.container, partition_key, indexed, self._record_charge)
+                except Exception as e:
+                    # Not saved either, so a resumed run or worker retry repeats the patch
+                    logger.warning("Failed to update proceeding overview", proceeding_id=partition_key, error=str(e))
+                    self.failed.extend(item["id"] for item, ok in zip(indexed, located) if ok)
+                    saved = [item for item in saved if item.get("processingStatus") != "indexed"]
+            # A record only counts as saved once its locator and overview entry are written
+            if self.on_written:
+                for item in saved:
+                    self.on_written(item)
+
+    async def _write_locator(self, record: dict) -> bool:
+        """Write a record's locator (after cleaning up a move); whether it was written."""
+        try:
+            await self._remove_moved(record)
+            await self.container.upsert_item(locator_item(record), response_hook=self._record_charge)
+            return True
+        except Exception as e:
+            # Without its locator the record is not found by document ID alone
+            logger.warning("Failed to save document locator", document_id=record["id"], error=str(e))
+            self.failed.append(record["id"])
+            return False
+
+    async def _remove_moved(self, record: dict) -> None:
+        """Delete what a document re-ingested under another proceeding left in the old one."""
+        try:
+            locator = await self.container.read_item(
+                locator_id(record["id"]), partition_key=locator_partition(record["id"]),
+                response_hook=self._record_charge,
+            )
+        except CosmosResourceNotFoundError:
+            return
+        previous = locator["documentProceedingId"]
+        if previous == record["proceedingId"]:
+            return
+        try:
+            await self.container.delete_item(record["id"], partition_key=previous, response_hook=self._record_charge)
+        except CosmosResourceNotFoundError:
+            pass
+        if self.update_overviews:
+            await remove_document(self.container, previous, record["id"], self._record_charge)
+        logger.info(
+            "Document moved", document_id=record["id"], from_proceeding=previous, to_proceeding=record["proceedingId"]
+        )
+
+    async def _upsert(self, partition_key: str, items: list[dict]) -> list[dict]:
+        """Upsert items of one partition; the items written."""
+        if len(items) > 1 and hasattr(self.container, "execute_item_batch"):
+            try:
+                await self.container.execute_item_batch(
+                    batch_operations=[("upsert", (item,)) for item in items],
+                    partition_key=partition_key,
+                    response_hook=self._record_charge,
+                )
+                self.written += len(items)
+                return items
+            except Exception as e:
+                # A transactional batch is all-or-nothing; fall back to
+                # individual upserts so one bad record does not sink the rest
+                logger.warning("Cosmos batch failed", proceeding_id=partition_key, error=str(e))
+        
+        written = []
+        for item in items:
+            try:
+                await self.container.upsert_item(item, response_hook=self._record_charge)
+                self.written += 1
+                written.append(item)
+            except Exception as e:
+                logger.warning("Failed to save document metadata", document_id=item["id"], error=str(e))
+                self.failed.append(item["id"])
+        return written
+
+
+async def save_document_metadata(
+    metadata_writer: CosmosMetadataWriter,
+    document_id: str,
+    filename: str,
+    metadata: dict,
+    chunk_count: int,
+    page_count: Optional[int] = None,
+    entities: Optional[dict] = None,
+) -> None:
+    """Queue document metadata for writing to Cosmos DB."""
+    await metadata_writer.add(
+        build_metadata_record(document_id, filename, metadata, "indexed", chunk_count, page_count, entities=entities)
+    )
+
+
+async def store_source_document(
+    data: bytes, document_id: str, metadata: dict, bundle: Optional[BundleWriter] = None
+) -> str:
+    """Store a source PDF for the pages endpoint (in the bundle when exporting); returns its blob name."""
+    blob_name = upload_blob_name(metadata.get("proceeding_id") or UNKNOWN_PROCEEDING, document_id)
+    if bundle:
+        bundle.add_source(blob_name, data)
+    else:
+        await asyncio.to_thread(get_document_store().put, blob_name, data)
+    return blob_name
+
+
+async def process_document(
+    pdf_path: Path,
+    document_id: str,
+    metadata: dict,
+    openai_client: AsyncAzureOpenAI,
+    search_client: SearchClient,
+    metadata_writer: CosmosMetadataWriter,
+    journal: Optional[RunJournal] = None,
+    deduplicator: Optional[EmbeddingDeduplicator] = None,
+    bundle: Optional[BundleWriter] = None,
+) -> dict:
+    """Process a single document end-to-end, resuming from the journal if given.
+
+    With a bundle, search documents and the metadata record are written to it
+    instead of Azure AI Search and Cosmos DB.
+    """
+    filename = metadata.get("filename") or pdf_path.name
+    log = logger.bind(filename=filename, document_id=document_id)
+    
+    if journal and (done := journal.get(document_id, "metadata_saved")):
+        log.info("Already ingested, skipping")
+        return {
+            "filename": filename,
+            "document_id": document_id,
+            "status": "success",
+            "pages": done["pages"],
+            "chunks": done["chunks"],
+            "indexed": sum(
+                event["indexed"] for stage, event in journal.events[document_id].items()
+                if stage.startswith("uploaded:")
+            ),
+            "resumed": True,
+        }
+    
+    extraction = None
+    chunk_stats = {"tokens": 0}
+    timings = {"extract": 0.0, "chunk": 0.0, "embed": 0.0, "index": 0.0}
+    started = time.perf_counter()
+    if journal and (done := journal.get(document_id, "chunked")):
+        log.info("Resuming from checkpoint")
+        chunks = journal.load_artifact(document_id, "chunks")
+        page_count = done["pages"]
+    else:
+        extraction = await extract_document_text(pdf_path, cache=get_extraction_cache())
+        if extraction.error:
+            log.warning("PDF could not be read", error=extraction.error)
+            return {"filename": filename, "status": "failed", "reason": f"unreadable PDF: {extraction.error}"}
+        for failure in extraction.failures:
+            log.warning("Page extraction failed", page=failure.page_number, error=failure.error)
+        pages = extraction.pages
+        if settings.boilerplate_stripping:
+            pages, boilerplate = strip_boilerplate(pages)
+            if boilerplate.lines_removed:
+                log.info(
+                    "Stripped boilerplate",
+                    patterns=boilerplate.patterns,
+                    lines=boilerplate.lines_removed,
+                    characters=boilerplate.characters_removed,
+                )
+        if not pages:
+            log.warning("No text extracted", failed_pages=len(extraction.failures))
+            return {"filename": filename, "status": "failed", "reason": "no text"}
+        
+        timings["extract"] = time.perf_counter() - started
+        page_count = len(pages)
+        log.info(
+            "Extracted text",
+            pages=page_count,
+            characters=sum(len(p["text"]) for p in pages),
+            backend=extraction.backend,
+            cached=extraction.cached,
+            seconds=round(extraction.seconds, 2),
+            pages_per_second=round(extraction.pages_per_second, 1),
+            failed_pages=len(extraction.failures),
+        )
+        if journal:
+            journal.record(
+                document_id, "extracted", filename=filename, pages=page_count,
+                failed_pages=[f.page_number for f in extraction.failures],
+            )
+        
+        started = time.perf_counter()
+        chunks = await asyncio.to_thread(chunk_text, pages, stats=chunk_stats)
+        timings["chunk"] = time.perf_counter() - started
+        log.info("Chunked text", chunks=len(chunks), tokens=chunk_stats["tokens"])
+        if journal and chunks:
+            journal.save_artifact(document_id, "chunks", chunks)
+            journal.record(document_id, "chunked", pages=page_count, chunks=len(chunks))
+    
+    if not chunks:
+        return {"filename": filename, "status": "failed", "reason": "no chunks"}
+    
+    texts = [c["content"] for c in chunks]
+    started = time.perf_counter()
+    embeddings = await generate_embeddings(
+        openai_client, texts, journal=journal, document_id=document_id, deduplicator=deduplicator
+    )
+    timings["embed"] = time.perf_counter() - started
+    log.info("Generated embeddings", embeddings=len(embeddings), unique=len(set(texts)))
+    
+    started = time.perf_counter()
+    entities = await asyncio.to_thread(extract_entities, texts)
+    log.info(
+        "Extracted entities",
+        entities=sum(len(values) for values in entities.values()),
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    
+    started = time.perf_counter()
+    if bundle:
+        documents = build_index_documents(document_id, chunks, embeddings, metadata)
+        record = build_metadata_record(
+            document_id, filename, metadata, "indexed", len(chunks), page_count, entities=entities
+        )
+        bundle.add(documents, record)
+        indexed = len(documents)
+        log.info("Exported chunks", exported=indexed)
+    else:
+        documents = build_index_documents(document_id, chunks, embeddings, metadata)
+        indexed = await upload_documents(search_client, documents, document_id, journal)
+        log.info("Indexed chunks", indexed=indexed)
+        if indexed < len(documents):
+            # No metadata record, so metadata_saved stays unrecorded and a resume retries the failed batches
+            return {
+                "filename": filename,
+                "document_id": document_id,
+                "status": "failed",
+                "reason": f"{len(documents) - indexed} of {len(documents)} chunks failed to index",
+                "chunks": len(chunks),
+                "indexed": indexed,
+            }
+        await asyncio.to_thread(get_chunk_store().put_documents, documents, {document_id: page_count})
+        await save_document_metadata(
+            metadata_writer, document_id, filename, metadata, len(chunks), page_count, entities=entities
+        )
+    timings["index"] = time.perf_counter() - started
+    
+    return {
+        "filename": filename,
+        "document_id": document_id,
+        "status": "success",
+        "pages": page_count,
+        "chunks": len(chunks),
+        "indexed": indexed,
+        "extraction_seconds": extraction.seconds if extraction else 0.0,
+        "extraction_cached": extraction.cached if extraction else False,
+        "failed_pages": [f.page_number for f in extraction.failures] if extraction else [],
+        "tokens": chunk_stats["tokens"],
+        "timings": timings,
+    }
+
+
+def _openai_client(credential: DefaultAzureCredential) -> AsyncAzureOpenAI:
+    async def get_token() -> str:
+        token = await credential.get_token("https://cognitiveservices.azure.com/.default")
+        return token.token
+    
+    return AsyncAzureOpenAI(
+        azure_endpoint=settings.azure_openai_endpoint,
+        azure_ad_token_provider=get_token,
+        api_version=settings.azure_openai_api_version,
+    )
+
+
+@asynccontextmanager
+async def pipeline_openai_client() -> AsyncIterator[AsyncAzureOpenAI]:
+    """Create only the async Azure OpenAI client, for runs that export a bundle instead of writing to Azure."""
+    if settings.use_local_services:
+        from src.local.clients import local_async_openai_client
+        
+        yield local_async_openai_client()
+        return
+    
+    credential = DefaultAzureCredential()
+    openai_client = _openai_client(credential)
+    try:
+        yield openai_client
+    finally:
+        await openai_client.close()
+        await credential.close()
+
+
+@asynccontextmanager
+async def pipeline_clients(
+    index_name: Optional[str] = None,
+) -> AsyncIterator[tuple[AsyncAzureOpenAI, SearchClient, Any]]:
+    """Create the async Azure OpenAI, AI Search and Cosmos DB clients the pipeline uses.
+
+    Yields (openai_client, search_client, cosmos_container) and closes them on exit.
+    The search client targets AZURE_SEARCH_INDEX unless index_name is given.
+    """
+    if settings.use_local_services:
+        from src.local.clients import local_pipeline_clients
+        
+        yield local_pipeline_clients(index_name or settings.azure_search_index)
+        return
+    
+    credential = DefaultAzureCredential()
+    openai_client = _openai_client(credential)
+    search_client = SearchClient(
+        endpoint=settings.azure_search_endpoint,
+        index_name=index_name or settings.azure_search_index,
+        credential=credential,
+    )
+    cosmos_client = CosmosClient(url=settings.cosmos_endpoint, credential=credential)
+    container = cosmos_client.get_database_client(settings.cosmos_database).get_container_client(
+        settings.cosmos_container
+    )
+    
+    try:
+        yield openai_client, search_client, container
+    finally:
+        await cosmos_client.close()
+        await search_client.close()
+        await openai_client.close()
+        await credential.close()
@@ -0,0 +1,173 @@
+"""Ingestion job queue for Hearings AI.
+
+/api/documents/ingest enqueues jobs and the ingestion worker consumes them.
+Two backends share one interface, selected by INGESTION_QUEUE:
+- "azure": Azure Storage Queues (production)
+- "sqlite": a SQLite table under LOCAL_DATA_DIR (local development and tests)
+
+Both use visibility timeouts: a received job is hidden from other workers
+until it is deleted or released, and reappears if its worker dies.
+"""
+
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Protocol
+from urllib.parse import urlsplit
+
+from src.config import settings
+from src.models import IngestionJob
+
+
+@dataclass
+class ReceivedJob:
+    """A job received from the queue, with the handle needed to delete or release it."""
+
+    job: IngestionJob
+    receipt: Any
+    dequeue_count: int
+
+
+class IngestionQueue(Protocol):
+    """Queue of ingestion jobs."""
+
+    async def enqueue(self, job: IngestionJob) -> None: ...
+
+    async def receive(self, visibility_timeout: int) -> Optional[ReceivedJob]: ...
+
+    async def delete(self, received: ReceivedJob) -> None: ...
+
+    async def release(self, received: ReceivedJob, delay_seconds: int = 0) -> None: ...
+
+
+class SQLiteIngestionQueue:
+    """Ingestion queue in a local SQLite database.
+
+    Safe to share between the API and worker processes on one machine.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " body TEXT NOT NULL,"
+                " visible_at REAL NOT NULL,"
+                " dequeue_count INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _enqueue(self, body: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT INTO jobs (body, visible_at) VALUES (?, ?)", (body, time.time()))
+
+    def _receive(self, visibility_timeout: int) -> Optional[tuple[int, str, int]]:
+        with closing(self._connect()) as conn:
+            # Take the write lock up front so two workers cannot claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT id, body, dequeue_count FROM jobs WHERE visible_at <= ? ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE jobs SET visible_at = ?, dequeue_count = dequeue_count + 1 WHERE id = ?",
+                    (now + visibility_timeout, row[0]),
+                )
+            conn.execute("COMMIT")
+            return (row[0], row[1], row[2] + 1) if row else None
+
+    def _delete(self, job_id: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def _release(self, job_id: int, delay_seconds: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET visible_at = ? WHERE id = ?", (time.time() + delay_seconds, job_id))
+
+    async def enqueue(self, job: IngestionJob) -> None:
+        await asyncio.to_thread(self._enqueue, job.model_dump_json())
+
+    async def receive(self, visibility_timeout: int) -> Optional[ReceivedJob]:
+        row = await asyncio.to_thread(self._receive, visibility_timeout)
+        if row is None:
+            return None
+        job_id, body, dequeue_count = row
+        return ReceivedJob(job=IngestionJob.model_validate_json(body), receipt=job_id, dequeue_count=dequeue_count)
+
+    async def delete(self, received: ReceivedJob) -> None:
+        await asyncio.to_thread(self._delete, received.receipt)
+
+    async def release(self, received: ReceivedJob, delay_seconds: int = 0) -> None:
+        await asyncio.to_thread(self._release, received.receipt, delay_seconds)
+
+
+class AzureStorageIngestionQueue:
+    """Ingestion queue in Azure Storage Queues."""
+
+    def __init__(self, account_url: str, queue_name: str) -> None:
+        from azure.identity.aio import DefaultAzureCredential
+        from azure.storage.queue.aio import QueueClient
+
+        self.client = QueueClient(
+            account_url=account_url,
+            queue_name=queue_name,
+            credential=DefaultAzureCredential(),
+        )
+
+    async def enqueue(self, job: IngestionJob) -> None:
+        await self.client.send_message(job.model_dump_json())
+
+    async def receive(self, visibility_timeout: int) -> Optional[ReceivedJob]:
+        message = await self.client.receive_message(visibility_timeout=visibility_timeout)
+        if message is None:
+            return None
+        return ReceivedJob(
+            job=IngestionJob.model_validate_json(message.content),
+            receipt=message,
+            dequeue_count=message.dequeue_count,
+        )
+
+    async def delete(self, received: ReceivedJob) -> None:
+        await self.client.delete_message(received.receipt)
+
+    async def release(self, received: ReceivedJob, delay_seconds: int = 0) -> None:
+        await self.client.update_message(received.receipt, visibility_timeout=delay_seconds)
+
+
+def queue_service_url() -> str:
+    """Queue service endpoint: STORAGE_QUEUE_URL, or the queue endpoint of STORAGE_ACCOUNT_URL's account.
+
+    Only standard endpoints (https://<account>.blob.<suffix>) are derived; custom
+    domains, private endpoints and Azurite need STORAGE_QUEUE_URL.
+    """
+    if settings.storage_queue_url:
+        return settings.storage_queue_url
+    if not settings.storage_account_url:
+        raise RuntimeError("INGESTION_QUEUE=azure requires STORAGE_QUEUE_URL or STORAGE_ACCOUNT_URL")
+    url = urlsplit(settings.storage_account_url)
+    account, service, *suffix = (url.hostname or "").split(".")
+    if service != "blob" or not suffix:
+        raise RuntimeError(
+            f"Cannot derive the queue endpoint from {settings.storage_account_url}; set STORAGE_QUEUE_URL"
+        )
+    return f"{url.scheme}://{account}.queue.{'.'.join(suffix)}"
+
+
+@lru_cache()
+def get_ingestion_queue() -> IngestionQueue:
+    """Get the configured ingestion queue (cached singleton)."""
+    if settings.ingestion_queue == "azure":
+        return AzureStorageIngestionQueue(queue_service_url(), settings.ingestion_queue_name)
+    return SQLiteIngestionQueue(Path(settings.local_data_dir) / f"{settings.ingestion_queue_name}.db")
@@ -0,0 +1,114 @@
+"""Document metadata records for Hearings AI.
+
+Builds and reads the per-document metadata records kept in Cosmos DB,
+including the processingStatus the ingestion worker maintains. Records are
+found by point reads through their locators (src.documents.layout).
+Records written before locators existed get theirs from
+scripts/backfill-locators.py.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import structlog
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from src.clients import get_cosmos_container
+from src.config import settings
+from src.documents.layout import UNKNOWN_PROCEEDING, locator_id, locator_item, locator_partition
+from src.proceedings.overview import remove_document_sync
+
+logger = structlog.get_logger()
+
+
+def build_metadata_record(
+    document_id: str,
+    filename: str,
+    metadata: dict,
+    processing_status: str,
+    chunk_count: Optional[int] = None,
+    page_count: Optional[int] = None,
+    error: Optional[str] = None,
+    entities: Optional[dict] = None,
+) -> dict:
+    """Build the Cosmos DB metadata record for a document."""
+    return {
+        "id": document_id,
+        "proceedingId": metadata.get("proceeding_id") or UNKNOWN_PROCEEDING,
+        "documentType": metadata.get("document_type", "unknown"),
+        "abaerCitation": metadata.get("abaer_citation"),
+        "title": metadata.get("title", filename),
+        "confidentialityLevel": metadata.get("confidentiality_level", "public"),
+        "parties": metadata.get("parties", []),
+        "regulatoryCitations": metadata.get("regulatory_citations", []),
+        "sourceUrl": metadata.get("source_url"),
+        "blobName": metadata.get("blob_name"),
+        "volumeNumber": metadata.get("volume_number"),
+        "decisionDate": metadata.get("decision_date"),
+        "uploadedAt": metadata.get("uploaded_at") or datetime.utcnow().isoformat(),
+        "processingStatus": processing_status,
+        "processingError": error,
+        "chunkCount": chunk_count,
+        "pageCount": page_count,
+        "filename": filename,
+        "entities": entities,  # Rules-extracted entities (understanding.entities), set at ingestion
+    }
+
+
+def save_metadata_record(record: dict) -> None:
+    """Upsert a document metadata record and its locator.
+
+    A document re-ingested under another proceeding moves: its record and
+    overview entry in the old proceeding are deleted.
+    """
+    container = get_cosmos_container()
+    container.upsert_item(record)
+    try:
+        locator = container.read_item(locator_id(record["id"]), partition_key=locator_partition(record["id"]))
+    except CosmosResourceNotFoundError:
+        locator = None
+    if locator and locator["documentProceedingId"] != record["proceedingId"]:
+        previous = locator["documentProceedingId"]
+        try:
+            container.delete_item(record["id"], partition_key=previous)
+        except CosmosResourceNotFoundError:
+            pass
+        remove_document_sync(container, previous, record["id"])
+        logger.info(
+            "Document moved", document_id=record["id"], from_proceeding=previous, to_proceeding=record["proceedingId"]
+        )
+    container.upsert_item(locator_item(record))
+
+
+def _find_unlocated(document_id: str) -> Optional[dict]:
+    """Query for a record written before locators existed, and backfill its locator (COSMOS_LOCATOR_FALLBACK)."""
+    container = get_cosmos_container()
+    items = container.query_items(
+        query="SELECT * FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": document_id}],
+        enable_cross_partition_query=True,
+    )
+    record = next(iter(items), None)
+    if record is not None:
+        container.upsert_item(locator_item(record))
+        logger.info("Document locator backfilled", document_id=document_id)
+    return record
+
+
+def get_metadata_record(document_id: str, proceeding_id: Optional[str] = None) -> Optional[dict]:
+    """Fetch a document metadata record by document ID.
+
+    One point read if the caller knows the document's proceeding, otherwise
+    two: the document's locator, then the record.
+    """
+    container = get_cosmos_container()
+    if proceeding_id is None:
+        try:
+            locator = container.read_item(locator_id(document_id), partition_key=locator_partition(document_id))
+        except CosmosResourceNotFoundError:
+            return _find_unlocated(document_id) if settings.cosmos_locator_fallback else None
+        proceeding_id = locator["documentProceedingId"]
+    try:
+        return container.read_item(document_id, partition_key=proceeding_id)
+    except CosmosResourceNotFoundError:
+        return None
@@ -0,0 +1,154 @@
+"""Source document storage for Hearings AI.
+
+Uploaded PDFs are stored in Azure Blob Storage when STORAGE_ACCOUNT_URL is
+configured, and under LOCAL_DATA_DIR on the local filesystem otherwise.
+Documents can also be opened as seekable streams that read only the byte
+ranges asked for (ranged blob downloads, or plain file reads locally).
+"""
+
+import hashlib
+import io
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+from azure.storage.blob import BlobServiceClient
+
+from src.clients import get_credential
+from src.config import settings
+
+
+def compute_document_id(data: bytes) -> str:
+    """Derive a stable document ID from the PDF content.
+
+    Re-ingesting the same file overwrites its chunks in the index instead of
+    duplicating them under a new random ID.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"hearings-ai:{digest}"))
+
+
+def upload_blob_name(proceeding_id: str, document_id: str) -> str:
+    """Blob name for an uploaded source document."""
+    return f"uploads/{proceeding_id}/{document_id}.pdf"
+
+
+class DocumentStore(Protocol):
+    """Storage for source document bytes."""
+
+    def put(self, name: str, data: bytes) -> None: ...
+
+    def get(self, name: str) -> bytes: ...
+
+    def open(self, name: str) -> BinaryIO: ...
+
+
+# Blobs are downloaded in aligned blocks of this size, each at most once per open stream
+RANGE_BLOCK_BYTES = 64 * 1024
+
+
+class BlobRangeReader(io.RawIOBase):
+    """Seekable, read-only view of a blob that downloads only the blocks read.
+
+    Downloaded blocks are kept for the life of the stream, so readers that
+    seek back and forth (PDF parsers following object offsets) fetch each
+    block once; adjacent missing blocks are fetched in one ranged request.
+    """
+
+    def __init__(self, blob_client: Any) -> None:
+        self.blob_client = blob_client
+        self.size = blob_client.get_blob_properties().size
+        self.position = 0
+        self.blocks: dict[int, bytes] = {}
+        self.requests = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def _fetch(self, first: int, last: int) -> None:
+        offset = first * RANGE_BLOCK_BYTES
+        length = min(self.size, (last + 1) * RANGE_BLOCK_BYTES) - offset
+        data = self.blob_client.download_blob(offset=offset, length=length).readall()
+        self.requests += 1
+        for block in range(first, last + 1):
+            start = (block - first) * RANGE_BLOCK_BYTES
+            self.blocks[block] = data[start:start + RANGE_BLOCK_BYTES]
+
+    def readinto(self, buffer: Any) -> int:
+        length = min(len(buffer), self.size - self.position)
+        if length <= 0:
+            return 0
+        first = self.position // RANGE_BLOCK_BYTES
+        last = (self.position + length - 1) // RANGE_BLOCK_BYTES
+        missing = [block for block in range(first, last + 1) if block not in self.blocks]
+        if missing:
+            self._fetch(missing[0], missing[-1])
+
+        data = b"".join(self.blocks[block] for block in range(first, last + 1))
+        start = self.position - first * RANGE_BLOCK_BYTES
+        buffer[:length] = data[start:start + length]
+        self.position += length
+        return length
+
+
+class BlobDocumentStore:
+    """Source documents in an Azure Blob Storage container."""
+
+    def __init__(self, account_url: str, container: str) -> None:
+        service = BlobServiceClient(account_url=account_url, credential=get_credential())
+        self.container = service.get_container_client(container)
+
+    def put(self, name: str, data: bytes) -> None:
+        self.container.upload_blob(name, data, overwrite=True)
+
+    def get(self, name: str) -> bytes:
+        return self.container.download_blob(name).readall()
+
+    def open(self, name: str) -> BinaryIO:
+        return BlobRangeReader(self.container.get_blob_client(name))  # type: ignore[return-value]
+
+
+class LocalDocumentStore:
+    """Source documents in a local directory (development stand-in for Blob Storage)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid document name: {name}")
+        return path
+
+    def put(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def get(self, name: str) -> bytes:
+        return self._path(name).read_bytes()
+
+    def open(self, name: str) -> BinaryIO:
+        return self._path(name).open("rb")
+
+
+@lru_cache()
+def get_document_store() -> DocumentStore:
+    """Get the configured source document store (cached singleton)."""
+    if settings.storage_account_url:
+        return BlobDocumentStore(settings.storage_account_url, settings.storage_container)
+    return LocalDocumentStore(Path(settings.local_data_dir) / settings.storage_container)
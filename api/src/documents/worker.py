@@ -0,0 +1,145 @@
+"""Ingestion worker for Hearings AI.
+
+Consumes jobs queued by /api/documents/ingest, runs each uploaded document
+through the ingestion pipeline and keeps its processingStatus record current
+(pending -> processing -> indexed | failed). Runs as its own process so the
+worker count scales independently of API replicas:
+
+    python -m src.documents.worker --workers 4
+"""
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from src.config import settings
+from src.documents.pipeline import CosmosMetadataWriter, EmbeddingDeduplicator, pipeline_clients, process_document
+from src.documents.queue import IngestionQueue, ReceivedJob, get_ingestion_queue
+from src.documents.service import build_metadata_record
+from src.documents.storage import DocumentStore, get_document_store
+from src.models import IngestionJob, ProcessingStatus
+
+logger = structlog.get_logger()
+
+IDLE_POLL_SECONDS = 2.0
+RETRY_DELAY_SECONDS = 60
+
+
+def job_metadata(job: IngestionJob) -> dict:
+    """Pipeline metadata for a queued upload."""
+    return {
+        **job.metadata.model_dump(mode="json"),
+        "filename": job.filename,
+        "blob_name": job.blob_name,
+        "uploaded_at": job.submitted_at.isoformat(),
+    }
+
+
+async def handle_job(
+    received: ReceivedJob,
+    queue: IngestionQueue,
+    store: DocumentStore,
+    openai_client,
+    search_client,
+    container,
+    deduplicator: Optional[EmbeddingDeduplicator] = None,
+) -> None:
+    """Process one queued document and record the outcome."""
+    job = received.job
+    metadata = job_metadata(job)
+    log = logger.bind(document_id=job.document_id, attempt=received.dequeue_count)
+
+    async def set_status(status: ProcessingStatus, error: Optional[str] = None) -> None:
+        await container.upsert_item(
+            build_metadata_record(job.document_id, job.filename, metadata, status.value, error=error)
+        )
+
+    await set_status(ProcessingStatus.PROCESSING)
+    log.info("Ingestion job started")
+
+    pdf_path = None
+    try:
+        data = await asyncio.to_thread(store.get, job.blob_name)
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(data)
+            pdf_path = Path(f.name)
+
+        metadata_writer = CosmosMetadataWriter(container)
+        result = await process_document(
+            pdf_path, job.document_id, metadata, openai_client, search_client, metadata_writer,
+            deduplicator=deduplicator,
+        )
+        await metadata_writer.flush()
+
+        if result.get("indexed", 0) < result.get("chunks", 0):
+            # Some chunks failed to index: a retry re-uploads them
+            raise RuntimeError(f"{result['chunks'] - result['indexed']} of {result['chunks']} chunks failed to index")
+        if result["status"] != "success":
+            # Unreadable documents will not improve on retry
+            await set_status(ProcessingStatus.FAILED, error=result["reason"])
+            log.warning("Ingestion job failed", reason=result["reason"])
+        elif metadata_writer.failed:
+            raise RuntimeError("Failed to save document metadata")
+        else:
+            log.info("Ingestion job complete", chunks=result["chunks"], indexed=result["indexed"])
+        await queue.delete(received)
+    except Exception as e:
+        if received.dequeue_count < settings.ingestion_max_attempts:
+            await set_status(ProcessingStatus.PENDING, error=str(e))
+            await queue.release(received, delay_seconds=RETRY_DELAY_SECONDS * received.dequeue_count)
+            log.warning("Ingestion job will be retried", error=str(e))
+        else:
+            await set_status(ProcessingStatus.FAILED, error=str(e))
+            await queue.delete(received)
+            log.error("Ingestion job failed", error=str(e))
+    finally:
+        if pdf_path:
+            pdf_path.unlink(missing_ok=True)
+
+
+async def worker_loop(
+    worker_id: int,
+    queue: IngestionQueue,
+    store: DocumentStore,
+    clients: tuple,
+    deduplicator: EmbeddingDeduplicator,
+) -> None:
+    """Receive and process jobs until cancelled."""
+    while True:
+        received = await queue.receive(settings.ingestion_visibility_timeout_seconds)
+        if received is None:
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+            continue
+        try:
+            await handle_job(received, queue, store, *clients, deduplicator=deduplicator)
+        except Exception as e:
+            # Status updates themselves failed; the job reappears after its visibility timeout
+            logger.error("Ingestion worker error", worker_id=worker_id, error=str(e))
+
+
+async def run_workers(workers: int) -> None:
+    """Run a pool of ingestion workers sharing one set of clients."""
+    queue = get_ingestion_queue()
+    store = get_document_store()
+    # Shared so identical chunks across queued documents are embedded once
+    deduplicator = EmbeddingDeduplicator()
+
+    async with pipeline_clients() as clients:
+        logger.info("Ingestion workers started", workers=workers, queue=settings.ingestion_queue)
+        await asyncio.gather(*(worker_loop(i, queue, store, clients, deduplicator) for i in range(workers)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hearings AI ingestion worker")
+    parser.add_argument("--workers", type=int, default=settings.ingestion_workers, help="Concurrent jobs")
+    args = parser.parse_args()
+
+    asyncio.run(run_workers(args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""Chunk context store for evidence retrieval.
+
+An evidence panel shows a target chunk with its neighbours. Each store reads
+the whole window, keyed by (documentId, chunkId), in one round trip, selected
+by EVIDENCE_STORE:
+- "search": one query on the search index, filtering its key field with
+  search.in over the window's chunk keys (the index is the store)
+- "sqlite": a SQLite table under LOCAL_DATA_DIR keyed by (document_id,
+  chunk_id), filled at ingestion and bundle import, with citation
+  references precomputed
+
+Stores return the document fields needed for access checks along with the
+chunks, so no metadata lookup is needed before a window can be served.
+Whole documents can be read the same way (get_document), for document
+understanding.
+
+Windows are cached in memory (EvidenceCache, bounded by size and TTL) and
+/api/search prefetches the windows of its top hits after responding, so the
+evidence panel a user opens next is usually already cached.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from src.auth import can_access_level
+from src.config import settings
+from src.models import SearchResult, UserClaims
+from src.search.service import format_citation_ref
+
+# Width of prefetched windows: the widest an evidence request may ask for, so any request is served from them
+PREFETCH_CONTEXT_WINDOW = 5
+
+# Estimated bytes per cached chunk beyond its text, for the cache size bound
+CHUNK_OVERHEAD_BYTES = 256
+
+# Upper bound on the chunks read for a whole document (a 500-page decision has about 1,500)
+MAX_DOCUMENT_CHUNKS = 10_000
+
+# Index fields a context window is built from
+CONTEXT_FIELDS = [
+    "id", "documentId", "proceedingId", "documentType", "abaerCitation", "chunkId", "pageNumber",
+    "paragraphNumber", "content", "confidentialityLevel", "parties", "title", "sourceUrl",
+]
+
+
+@dataclass
+class ContextChunk:
+    """A chunk of a context window with its citation."""
+
+    chunk_id: int
+    page_number: int
+    paragraph_number: Optional[str]
+    content: str
+    citation_ref: str
+
+
+@dataclass
+class ContextDocument:
+    """The document fields an evidence response and its access check need."""
+
+    document_id: str
+    proceeding_id: str
+    document_type: str
+    title: str
+    abaer_citation: Optional[str]
+    confidentiality_level: str
+    parties: list[str]
+    source_url: Optional[str] = None
+    page_count: Optional[int] = None
+
+
+@dataclass
+class ContextWindow:
+    """A target chunk with up to context_window chunks on either side, in order."""
+
+    document: ContextDocument
+    chunks: list[ContextChunk]
+
+    @property
+    def page_range(self) -> str:
+        first, last = self.chunks[0].page_number, self.chunks[-1].page_number
+        return str(first) if first == last else f"{first}-{last}"
+
+    def narrow(self, chunk_id: int, context_window: int) -> "ContextWindow":
+        """The narrower window around chunk_id contained in this one."""
+        first, last = window_bounds(chunk_id, context_window)
+        return ContextWindow(self.document, [c for c in self.chunks if first <= c.chunk_id <= last])
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(c.content) + CHUNK_OVERHEAD_BYTES for c in self.chunks)
+
+
+def context_chunk(index_document: dict) -> ContextChunk:
+    """Build a context chunk, with its citation reference, from a search index document."""
+    return ContextChunk(
+        chunk_id=index_document["chunkId"],
+        page_number=index_document.get("pageNumber") or 1,
+        paragraph_number=index_document.get("paragraphNumber"),
+        content=index_document.get("content", ""),
+        citation_ref=format_citation_ref(
+            proceeding_id=index_document.get("proceedingId") or "unknown",
+            document_type=index_document.get("documentType") or "unknown",
+            page_number=index_document.get("pageNumber") or 1,
+            paragraph_number=index_document.get("paragraphNumber"),
+            abaer_citation=index_document.get("abaerCitation"),
+        ),
+    )
+
+
+def context_document(index_document: dict, page_count: Optional[int] = None) -> ContextDocument:
+    """Build the document fields of a context window from any of its search index documents."""
+    return ContextDocument(
+        document_id=index_document["documentId"],
+        proceeding_id=index_document.get("proceedingId") or "unknown",
+        document_type=index_document.get("documentType") or "unknown",
+        title=index_document.get("title") or "Unknown Document",
+        abaer_citation=index_document.get("abaerCitation"),
+        confidentiality_level=index_document.get("confidentialityLevel") or "public",
+        parties=index_document.get("parties") or [],
+        source_url=index_document.get("sourceUrl"),
+        page_count=page_count,
+    )
+
+
+def window_bounds(chunk_id: int, context_window: int) -> tuple[int, int]:
+    return max(0, chunk_id - context_window), chunk_id + context_window
+
+
+class ChunkStore(Protocol):
+    """Context windows of indexed chunks."""
+
+    def get_window(self, document_id: str, chunk_id: int, context_window: int) -> Optional[ContextWindow]: ...
+
+    def get_document(self, document_id: str) -> Optional[ContextWindow]: ...
+
+    def put_documents(self, index_documents: list[dict], page_counts: Optional[dict[str, int]] = None) -> None: ...
+
+
+class SearchChunkStore:
+    """Reads context windows from the search index with one key-filtered query."""
+
+    def __init__(self, search_client: Any = None) -> None:
+        self.search_client = search_client
+
+    def get_window(self, document_id: str, chunk_id: int, context_window: int) -> Optional[ContextWindow]:
+        from src.clients import get_search_client
+
+        first, last = window_bounds(chunk_id, context_window)
+        # Chunk keys are "{documentId}-{chunkId}" (build_index_documents); the key field is always filterable
+        keys = ",".join(f"{document_id}-{i}" for i in range(first, last + 1)).replace("'", "''")
+        results = (self.search_client or get_search_client()).search(
+            search_text=None,
+            filter=f"search.in(id, '{keys}', ',')",
+            select=CONTEXT_FIELDS,
+            top=last - first + 1,
+        )
+        documents = sorted((dict(result) for result in results), key=lambda doc: doc["chunkId"])
+        if not any(doc["chunkId"] == chunk_id for doc in documents):
+            return None
+        return ContextWindow(context_document(documents[0]), [context_chunk(doc) for doc in documents])
+
+    def get_document(self, document_id: str) -> Optional[ContextWindow]:
+        """All chunks of a document, in order."""
+        from src.clients import get_search_client
+
+        escaped = document_id.replace("'", "''")
+        results = (self.search_client or get_search_client()).search(
+            search_text=None,
+            filter=f"documentId eq '{escaped}'",
+            select=CONTEXT_FIELDS,
+            top=MAX_DOCUMENT_CHUNKS,
+        )
+        documents = sorted((dict(result) for result in results), key=lambda doc: doc["chunkId"])
+        if not documents:
+            return None
+        return ContextWindow(context_document(documents[0]), [context_chunk(doc) for doc in documents])
+
+    def put_documents(self, index_documents: list[dict], page_counts: Optional[dict[str, int]] = None) -> None:
+        """Nothing to do: the index the pipeline uploads to is the store."""
+
+
+class SQLiteChunkStore:
+    """Context windows in a local SQLite database, one row per chunk.
+
+    Safe to share between the API, worker and scripts on one machine.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS documents (document_id TEXT PRIMARY KEY, body TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                " document_id TEXT NOT NULL,"
+                " chunk_id INTEGER NOT NULL,"
+                " page_number INTEGER NOT NULL,"
+                " paragraph_number TEXT,"
+                " content TEXT NOT NULL,"
+                " citation_ref TEXT NOT NULL,"
+                " PRIMARY KEY (document_id, chunk_id)) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Serve reads from a memory map of the database file rather than read() calls
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    def get_window(self, document_id: str, chunk_id: int, context_window: int) -> Optional[ContextWindow]:
+        first, last = window_bounds(chunk_id, context_window)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT chunk_id, page_number, paragraph_number, content, citation_ref FROM chunks"
+                " WHERE document_id = ? AND chunk_id BETWEEN ? AND ? ORDER BY chunk_id",
+                (document_id, first, last),
+            ).fetchall()
+            if not any(row[0] == chunk_id for row in rows):
+                return None
+            body = conn.execute("SELECT body FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+        if body is None:
+            return None
+        return ContextWindow(ContextDocument(**json.loads(body[0])), [ContextChunk(*row) for row in rows])
+
+    def get_document(self, document_id: str) -> Optional[ContextWindow]:
+        """All chunks of a document, in order."""
+        with closing(self._connect()) as conn:
+            body = conn.execute("SELECT body FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+            if body is None:
+                return None
+            rows = conn.execute(
+                "SELECT chunk_id, page_number, paragraph_number, content, citation_ref FROM chunks"
+                " WHERE document_id = ? ORDER BY chunk_id",
+                (document_id,),
+            ).fetchall()
+        return ContextWindow(ContextDocument(**json.loads(body[0])), [ContextChunk(*row) for row in rows])
+
+    def put_documents(self, index_documents: list[dict], page_counts: Optional[dict[str, int]] = None) -> None:
+        """Store chunks from search index documents, replacing earlier versions of their documents."""
+        by_document: dict[str, list[dict]] = {}
+        for doc in index_documents:
+            by_document.setdefault(doc["documentId"], []).append(doc)
+
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for document_id, docs in by_document.items():
+                document = context_document(docs[0], (page_counts or {}).get(document_id))
+                conn.execute(
+                    "INSERT OR REPLACE INTO documents (document_id, body) VALUES (?, ?)",
+                    (document_id, json.dumps(asdict(document))),
+                )
+                chunks = [context_chunk(doc) for doc in docs]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (document_id, c.chunk_id, c.page_number, c.paragraph_number, c.content, c.citation_ref)
+                        for c in chunks
+                    ],
+                )
+                # Drop chunks past the new last one when a document re-chunks shorter
+                conn.execute(
+                    "DELETE FROM chunks WHERE document_id = ? AND chunk_id > ?",
+                    (document_id, max(c.chunk_id for c in chunks)),
+                )
+            conn.execute("COMMIT")
+
+
+class EvidenceCache:
+    """Recently read or prefetched context windows, keyed by (document_id, chunk_id).
+
+    Holds at most max_bytes of chunk text, evicting the least recently used,
+    and drops entries older than ttl_seconds so re-ingested documents are
+    picked up. A window cached at one width serves requests for any
+    narrower one. Shared by all users: access is checked on every read.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[tuple[str, int], tuple[float, int, ContextWindow]] = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _remove(self, key: tuple[str, int]) -> None:
+        _, _, window = self.entries.pop(key)
+        self.size_bytes -= window.size_bytes
+
+    def get(self, document_id: str, chunk_id: int, context_window: int) -> Optional[ContextWindow]:
+        key = (document_id, chunk_id)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None or entry[1] < context_window:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        _, width, window = entry
+        return window if width == context_window else window.narrow(chunk_id, context_window)
+
+    def contains(self, document_id: str, chunk_id: int, context_window: int) -> bool:
+        with self.lock:
+            entry = self.entries.get((document_id, chunk_id))
+            return entry is not None and entry[1] >= context_window and entry[0] >= time.monotonic()
+
+    def invalidate(self, document_ids: set[str]) -> None:
+        with self.lock:
+            for key in [key for key in self.entries if key[0] in document_ids]:
+                self._remove(key)
+
+    def put(self, chunk_id: int, context_window: int, window: ContextWindow) -> None:
+        key = (window.document.document_id, chunk_id)
+        if window.size_bytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, context_window, window)
+            self.size_bytes += window.size_bytes
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+
+class CachedChunkStore:
+    """A chunk store with an EvidenceCache in front of its reads."""
+
+    def __init__(self, store: ChunkStore, cache: EvidenceCache) -> None:
+        self.store = store
+        self.cache = cache
+
+    def get_window(self, document_id: str, chunk_id: int, context_window: int) -> Optional[ContextWindow]:
+        window = self.cache.get(document_id, chunk_id, context_window)
+        if window is None:
+            window = self.store.get_window(document_id, chunk_id, context_window)
+            if window is not None:
+                self.cache.put(chunk_id, context_window, window)
+        return window
+
+    def get_document(self, document_id: str) -> Optional[ContextWindow]:
+        # Whole documents are read rarely and would crowd evidence windows out of the cache
+        return self.store.get_document(document_id)
+
+    def put_documents(self, index_documents: list[dict], page_counts: Optional[dict[str, int]] = None) -> None:
+        self.store.put_documents(index_documents, page_counts)
+        self.cache.invalidate({doc["documentId"] for doc in index_documents})
+
+    def prefetch(self, user_claims: UserClaims, results: list[SearchResult]) -> int:
+        """Cache the widest evidence windows of search results the user can open; returns windows fetched."""
+        fetched = 0
+        for result in results:
+            if result.chunk_id is None:
+                continue
+            if self.cache.contains(result.document_id, result.chunk_id, PREFETCH_CONTEXT_WINDOW):
+                continue
+            window = self.store.get_window(result.document_id, result.chunk_id, PREFETCH_CONTEXT_WINDOW)
+            # Search results are already security-filtered; check again so the cache only
+            # ever warms windows the requesting user could open themselves
+            document = window.document if window else None
+            if document is None or not can_access_level(user_claims, document.confidentiality_level, document.parties):
+                continue
+            self.cache.put(result.chunk_id, PREFETCH_CONTEXT_WINDOW, window)
+            fetched += 1
+        return fetched
+
+
+@lru_cache()
+def get_chunk_store() -> ChunkStore:
+    """Get the configured chunk store, cached when EVIDENCE_CACHE_MAX_BYTES > 0 (cached singleton)."""
+    if settings.evidence_store == "sqlite":
+        store: ChunkStore = SQLiteChunkStore(Path(settings.local_data_dir) / "chunks.db")
+    else:
+        store = SearchChunkStore()
+    if settings.evidence_cache_max_bytes > 0:
+        cache = EvidenceCache(settings.evidence_cache_max_bytes, settings.evidence_cache_ttl_seconds)
+        return CachedChunkStore(store, cache)
+    return store
+
+
+def prefetch_evidence(user_claims: UserClaims, results: list[SearchResult]) -> None:
+    """Warm the evidence cache for the top EVIDENCE_PREFETCH_TOP search results (run after responding)."""
+    store = get_chunk_store()
+    if settings.evidence_prefetch_top > 0 and isinstance(store, CachedChunkStore):
+        store.prefetch(user_claims, results[:settings.evidence_prefetch_top])
@@ -0,0 +1,93 @@
+"""Local stand-in for the Azure OpenAI chat completions API.
+
+Completions are deterministic and extractive: the reply to a conversation is
+a selection of sentences from its last user message, spread evenly over the
+message and limited to max_tokens words, one sentence per line. Replies are
+shorter than their input and identical for identical requests, which is
+enough to exercise document understanding offline. Requests for a JSON
+object get an empty one: the stand-in classifies nothing.
+"""
+
+import re
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import httpx
+import openai
+
+from src.local.faults import THROTTLED, FaultInjector
+
+WORD = re.compile(r"\w+")
+SENTENCE = re.compile(r"[^.!?\n]+[.!?]?")
+DEFAULT_MAX_TOKENS = 256
+MIN_SENTENCE_WORDS = 4
+
+
+def complete(messages: list[dict], max_tokens: int) -> str:
+    """Extractive reply to the last user message of a conversation."""
+    text = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    lines = [line.strip().lstrip("-*• ").strip() for line in text.splitlines()]
+    sentences = [
+        sentence.strip()
+        for line in lines
+        for sentence in SENTENCE.findall(line)
+        if len(WORD.findall(sentence)) >= MIN_SENTENCE_WORDS
+    ]
+    if not sentences:
+        return text.strip()[:max_tokens * 4]
+
+    lengths = [len(WORD.findall(sentence)) for sentence in sentences]
+    average = sum(lengths) / len(lengths)
+    wanted = max(1, min(len(sentences), int(max_tokens / average)))
+    step = len(sentences) / wanted
+    reply, words = [], 0
+    for i in range(wanted):
+        index = int(i * step)
+        if words + lengths[index] > max_tokens and reply:
+            break
+        reply.append(sentences[index])
+        words += lengths[index]
+    return "\n".join(reply)
+
+
+def _error(status: int) -> Exception:
+    response = httpx.Response(status, request=httpx.Request("POST", "http://local/chat/completions"))
+    if status == THROTTLED:
+        return openai.RateLimitError("Rate limit exceeded (injected)", response=response, body=None)
+    return openai.InternalServerError("Service unavailable (injected)", response=response, body=None)
+
+
+def _response(messages: list[dict], model: str, max_tokens: Optional[int], json_object: bool) -> SimpleNamespace:
+    content = "{}" if json_object else complete(messages, max_tokens or DEFAULT_MAX_TOKENS)
+    prompt_tokens = sum(len(WORD.findall(m["content"])) for m in messages)
+    completion_tokens = len(WORD.findall(content))
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(index=0, message=SimpleNamespace(role="assistant", content=content), finish_reason="stop")
+        ],
+        model=model,
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+class LocalCompletions:
+    def __init__(self, faults: FaultInjector) -> None:
+        self.faults = faults
+
+    def create(
+        self, messages: list[dict], model: str, max_tokens: Optional[int] = None, response_format: Any = None, **_kwargs
+    ) -> SimpleNamespace:
+        json_object = (response_format or {}).get("type") == "json_object"
+        return self.faults.run_sync(lambda: _response(messages, model, max_tokens, json_object), _error)
+
+
+class AsyncLocalCompletions(LocalCompletions):
+    async def create(
+        self, messages: list[dict], model: str, max_tokens: Optional[int] = None, response_format: Any = None, **_kwargs
+    ) -> SimpleNamespace:
+        json_object = (response_format or {}).get("type") == "json_object"
+        return await self.faults.run(lambda: _response(messages, model, max_tokens, json_object), _error)
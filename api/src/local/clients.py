@@ -0,0 +1,50 @@
+"""Local stand-in clients, used instead of Azure when USE_LOCAL_SERVICES is set.
+
+Each service has one fault injector per process, shared by its sync and async
+clients, so injected latency and error counts can be inspected afterwards.
+"""
+
+from functools import lru_cache
+
+from src.config import settings
+from src.local.cosmos import AsyncLocalContainer, LocalContainer
+from src.local.embeddings import AsyncLocalOpenAI, LocalOpenAI
+from src.local.faults import FaultInjector
+from src.local.search import AsyncLocalSearchClient, LocalSearchClient, LocalSearchIndexClient
+
+SERVICES = ("openai", "search", "cosmos")
+
+
+@lru_cache()
+def get_fault_injector(service: str) -> FaultInjector:
+    """Fault injector for one stand-in service, configured by the LOCAL_* settings."""
+    return FaultInjector.from_settings(service)
+
+
+def local_openai_client() -> LocalOpenAI:
+    return LocalOpenAI(get_fault_injector("openai"))
+
+
+def local_async_openai_client() -> AsyncLocalOpenAI:
+    return AsyncLocalOpenAI(get_fault_injector("openai"))
+
+
+def local_search_client(index_name: str) -> LocalSearchClient:
+    return LocalSearchClient(index_name, get_fault_injector("search"))
+
+
+def local_search_index_client() -> LocalSearchIndexClient:
+    return LocalSearchIndexClient(get_fault_injector("search"))
+
+
+def local_cosmos_container(name: str) -> LocalContainer:
+    return LocalContainer(name, get_fault_injector("cosmos"))
+
+
+def local_pipeline_clients(index_name: str) -> tuple[AsyncLocalOpenAI, AsyncLocalSearchClient, AsyncLocalContainer]:
+    """Async stand-ins for (openai_client, search_client, cosmos_container)."""
+    return (
+        AsyncLocalOpenAI(get_fault_injector("openai")),
+        AsyncLocalSearchClient(index_name, get_fault_injector("search")),
+        AsyncLocalContainer(settings.cosmos_container, get_fault_injector("cosmos")),
+    )
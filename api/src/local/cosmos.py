@@ -0,0 +1,330 @@
+"""Local stand-in for Azure Cosmos DB containers.
+
+Items live in memory per container name, shared by every client in the
+process, keyed by (partition key, id) with the partition key paths the infra
+templates use. Request charges are estimated (writes cost more than reads,
+cross-partition queries cost more than single-partition ones) and reported
+through response_hook as x-ms-request-charge, like the service. Each store
+also totals its charges and operations, so scripts can check what a request
+cost without threading response hooks through the code under test.
+
+Queries support the subset Hearings AI issues:
+    SELECT * FROM c [WHERE c.a = @p [AND c.b = 'x' ...]] [ORDER BY c.f [ASC|DESC]]
+and patches the "set", "replace", "add" and "remove" operations on object
+paths (/a/b), applied atomically like the service.
+"""
+
+import copy
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceExistsError, CosmosResourceNotFoundError
+
+from src.local.faults import FaultInjector
+
+# Partition key paths per container (infra/main.bicep)
+PARTITION_KEY_PATHS = {
+    "documents": "/proceedingId",
+    "proceedings": "/id",
+    "audit": "/userId",
+}
+
+QUERY = re.compile(
+    r"^\s*SELECT\s+\*\s+FROM\s+c"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+c\.(?P<order>\w+)(?:\s+(?P<direction>ASC|DESC))?)?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+CONDITION = re.compile(
+    r"^\s*c\.(?P<field>\w+)\s*=\s*(?P<value>@\w+|'[^']*'|-?\d+(?:\.\d+)?|true|false|null)\s*$",
+    re.IGNORECASE,
+)
+
+# Estimated request units
+WRITE_RU_BASE = 5.0
+READ_RU_BASE = 1.0
+RU_PER_KB = 1.0
+QUERY_RU_BASE = 2.8
+QUERY_RU_PER_PARTITION = 2.5
+QUERY_RU_PER_ITEM = 0.1
+
+
+class UnsupportedOperation(ValueError):
+    """A query, patch or batch operation the local stand-in does not implement (the service may support it)."""
+
+
+def _error(status: int) -> CosmosHttpResponseError:
+    return CosmosHttpResponseError(status_code=status, message=f"Injected error ({status})")
+
+
+def _size_kb(item: dict) -> float:
+    return len(json.dumps(item).encode("utf-8")) / 1024
+
+
+class InMemoryContainerStore:
+    """Items of one container."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.partition_key_field = PARTITION_KEY_PATHS.get(name, "/id").lstrip("/")
+        self.items: dict[tuple[Any, str], dict] = {}
+        self.request_charge = 0.0
+        self.operations: Counter = Counter()  # "read", "write", "query", "crossPartitionQuery", ...
+
+    def charge(self, operation: str, request_charge: float) -> float:
+        """Count an operation and its charge towards the store's totals."""
+        self.operations[operation] += 1
+        self.request_charge += request_charge
+        return request_charge
+
+    def partition_key(self, item: dict) -> Any:
+        return item.get(self.partition_key_field)
+
+    def upsert(self, item: dict) -> tuple[dict, float]:
+        stored = copy.deepcopy(item)
+        self.items[(self.partition_key(stored), stored["id"])] = stored
+        return copy.deepcopy(stored), self.charge("write", WRITE_RU_BASE + RU_PER_KB * _size_kb(stored))
+
+    def create(self, item: dict) -> tuple[dict, float]:
+        if (self.partition_key(item), item["id"]) in self.items:
+            raise CosmosResourceExistsError(status_code=409, message=f"Item {item['id']} already exists")
+        return self.upsert(item)
+
+    def patch(self, item_id: str, partition_key: Any, operations: list[dict]) -> tuple[dict, float]:
+        stored = self.items.get((partition_key, item_id))
+        if stored is None:
+            self.charge("patch", WRITE_RU_BASE)
+            raise CosmosResourceNotFoundError(status_code=404, message=f"Item {item_id} not found")
+        patched = copy.deepcopy(stored)
+        for operation in operations:
+            *parents, name = [part.replace("~1", "/").replace("~0", "~") for part in operation["path"].split("/")[1:]]
+            target = patched
+            for part in parents:
+                if not isinstance(target.get(part), dict):
+                    raise CosmosHttpResponseError(status_code=400, message=f"Invalid patch path {operation['path']}")
+                target = target[part]
+            if operation["op"] in ("remove", "replace") and name not in target:
+                raise CosmosHttpResponseError(status_code=400, message=f"Patch path not found {operation['path']}")
+            if operation["op"] == "remove":
+                del target[name]
+            elif operation["op"] in ("set", "replace", "add"):
+                target[name] = copy.deepcopy(operation["value"])
+            else:
+                raise UnsupportedOperation(f"Patch operation not supported locally: {operation['op']}")
+        self.items[(partition_key, item_id)] = patched
+        return copy.deepcopy(patched), self.charge("patch", WRITE_RU_BASE + RU_PER_KB * _size_kb(patched))
+
+    def read(self, item_id: str, partition_key: Any) -> tuple[dict, float]:
+        stored = self.items.get((partition_key, item_id))
+        if stored is None:
+            # The service charges for misses too
+            self.charge("read", READ_RU_BASE)
+            raise CosmosResourceNotFoundError(status_code=404, message=f"Item {item_id} not found")
+        return copy.deepcopy(stored), self.charge("read", READ_RU_BASE + RU_PER_KB * _size_kb(stored))
+
+    def delete(self, item_id: str, partition_key: Any) -> float:
+        if self.items.pop((partition_key, item_id), None) is None:
+            raise CosmosResourceNotFoundError(status_code=404, message=f"Item {item_id} not found")
+        return self.charge("delete", WRITE_RU_BASE)
+
+    def query(
+        self,
+        query: str,
+        parameters: Optional[list[dict]] = None,
+        partition_key: Any = None,
+        cross_partition: bool = False,
+    ) -> tuple[list[dict], float]:
+        match = QUERY.match(query)
+        if not match:
+            raise UnsupportedOperation(f"Query not supported by the local Cosmos stand-in: {query}")
+        if partition_key is None and not cross_partition:
+            raise CosmosHttpResponseError(
+                status_code=400, message="Cross partition query is required but disabled"
+            )
+
+        values = {p["name"]: p["value"] for p in parameters or []}
+        conditions = []
+        if match.group("where"):
+            for clause in re.split(r"\s+AND\s+", match.group("where"), flags=re.IGNORECASE):
+                condition = CONDITION.match(clause)
+                if not condition:
+                    raise UnsupportedOperation(f"Condition not supported by the local Cosmos stand-in: {clause}")
+                raw = condition.group("value")
+                if raw.startswith("@"):
+                    value = values[raw]
+                elif raw.startswith("'"):
+                    value = raw[1:-1]
+                else:
+                    value = json.loads(raw.lower())
+                conditions.append((condition.group("field"), value))
+
+        if partition_key is not None:
+            scanned = [item for (pk, _), item in self.items.items() if pk == partition_key]
+            partitions = 1
+        else:
+            scanned = list(self.items.values())
+            partitions = max(1, len({pk for pk, _ in self.items}))
+
+        results = [item for item in scanned if all(item.get(f) == v for f, v in conditions)]
+        if match.group("order"):
+            field = match.group("order")
+            results.sort(
+                key=lambda item: (item.get(field) is None, item.get(field)),
+                reverse=(match.group("direction") or "").upper() == "DESC",
+            )
+
+        charge = QUERY_RU_BASE + QUERY_RU_PER_PARTITION * (partitions - 1) + QUERY_RU_PER_ITEM * len(scanned)
+        operation = "query" if partition_key is not None else "crossPartitionQuery"
+        return [copy.deepcopy(item) for item in results], self.charge(operation, charge)
+
+
+@lru_cache()
+def get_container_store(name: str) -> InMemoryContainerStore:
+    """In-memory container by name, shared by all local Cosmos clients in the process."""
+    return InMemoryContainerStore(name)
+
+
+def _charged(operation: Callable[[], tuple[Any, float]], response_hook: Optional[Callable]) -> Callable[[], Any]:
+    def run() -> Any:
+        result, charge = operation()
+        if response_hook:
+            response_hook({"x-ms-request-charge": f"{charge:.2f}"}, result)
+        return result
+
+    return run
+
+
+class LocalContainer:
+    """Stand-in for azure.cosmos.ContainerProxy."""
+
+    def __init__(self, name: str, faults: FaultInjector) -> None:
+        self.store = get_container_store(name)
+        self.faults = faults
+
+    def upsert_item(self, body: dict, response_hook: Optional[Callable] = None, **_kwargs) -> dict:
+        return self.faults.run_sync(_charged(lambda: self.store.upsert(body), response_hook), _error)
+
+    def create_item(self, body: dict, response_hook: Optional[Callable] = None, **_kwargs) -> dict:
+        return self.faults.run_sync(_charged(lambda: self.store.create(body), response_hook), _error)
+
+    def patch_item(
+        self,
+        item: str,
+        partition_key: Any,
+        patch_operations: list[dict],
+        response_hook: Optional[Callable] = None,
+        **_kwargs,
+    ) -> dict:
+        return self.faults.run_sync(
+            _charged(lambda: self.store.patch(item, partition_key, patch_operations), response_hook), _error
+        )
+
+    def read_item(self, item: str, partition_key: Any, response_hook: Optional[Callable] = None, **_kwargs) -> dict:
+        return self.faults.run_sync(_charged(lambda: self.store.read(item, partition_key), response_hook), _error)
+
+    def delete_item(self, item: str, partition_key: Any, response_hook: Optional[Callable] = None, **_kwargs) -> None:
+        self.faults.run_sync(_charged(lambda: (None, self.store.delete(item, partition_key)), response_hook), _error)
+
+    def query_items(
+        self,
+        query: str,
+        parameters: Optional[list[dict]] = None,
+        partition_key: Any = None,
+        enable_cross_partition_query: Optional[bool] = None,
+        response_hook: Optional[Callable] = None,
+        **_kwargs,
+    ) -> list[dict]:
+        return self.faults.run_sync(
+            _charged(
+                lambda: self.store.query(query, parameters, partition_key, bool(enable_cross_partition_query)),
+                response_hook,
+            ),
+            _error,
+        )
+
+
+class AsyncItemIterator:
+    """Async iterable of query results, like the SDK's AsyncItemPaged."""
+
+    def __init__(self, fetch: Callable) -> None:
+        self.fetch = fetch
+
+    async def __aiter__(self):
+        for item in await self.fetch():
+            yield item
+
+
+class AsyncLocalContainer:
+    """Stand-in for azure.cosmos.aio.ContainerProxy."""
+
+    def __init__(self, name: str, faults: FaultInjector) -> None:
+        self.store = get_container_store(name)
+        self.faults = faults
+
+    async def upsert_item(self, body: dict, response_hook: Optional[Callable] = None, **_kwargs) -> dict:
+        return await self.faults.run(_charged(lambda: self.store.upsert(body), response_hook), _error)
+
+    async def create_item(self, body: dict, response_hook: Optional[Callable] = None, **_kwargs) -> dict:
+        return await self.faults.run(_charged(lambda: self.store.create(body), response_hook), _error)
+
+    async def patch_item(
+        self,
+        item: str,
+        partition_key: Any,
+        patch_operations: list[dict],
+        response_hook: Optional[Callable] = None,
+        **_kwargs,
+    ) -> dict:
+        return await self.faults.run(
+            _charged(lambda: self.store.patch(item, partition_key, patch_operations), response_hook), _error
+        )
+
+    async def read_item(
+        self, item: str, partition_key: Any, response_hook: Optional[Callable] = None, **_kwargs
+    ) -> dict:
+        return await self.faults.run(_charged(lambda: self.store.read(item, partition_key), response_hook), _error)
+
+    async def delete_item(
+        self, item: str, partition_key: Any, response_hook: Optional[Callable] = None, **_kwargs
+    ) -> None:
+        await self.faults.run(
+            _charged(lambda: (None, self.store.delete(item, partition_key)), response_hook), _error
+        )
+
+    async def execute_item_batch(
+        self,
+        batch_operations: list[tuple],
+        partition_key: Any,
+        response_hook: Optional[Callable] = None,
+        **_kwargs,
+    ) -> list[dict]:
+        """Transactional batch of upserts within one partition."""
+
+        def run() -> tuple[list[dict], float]:
+            items = []
+            for operation, args, *_ in batch_operations:
+                if operation != "upsert":
+                    raise UnsupportedOperation(f"Batch operation not supported locally: {operation}")
+                if self.store.partition_key(args[0]) != partition_key:
+                    raise CosmosHttpResponseError(status_code=400, message="Batch item outside the partition key")
+                items.append(args[0])
+            results = [self.store.upsert(item) for item in items]
+            return [result for result, _ in results], sum(charge for _, charge in results)
+
+        return await self.faults.run(_charged(run, response_hook), _error)
+
+    def query_items(
+        self,
+        query: str,
+        parameters: Optional[list[dict]] = None,
+        partition_key: Any = None,
+        response_hook: Optional[Callable] = None,
+        **_kwargs,
+    ) -> AsyncItemIterator:
+        # The async SDK always allows cross-partition queries
+        return AsyncItemIterator(lambda: self.faults.run(
+            _charged(lambda: self.store.query(query, parameters, partition_key, True), response_hook), _error
+        ))
@@ -0,0 +1,100 @@
+"""Local stand-in for the Azure OpenAI embeddings API.
+
+Embeddings are deterministic feature-hashed bags of words: each word adds
+signed weight to a few hash-chosen dimensions, and the vector is L2
+normalized. Identical texts always get identical vectors and texts sharing
+words are close by cosine similarity, which is enough to exercise the
+pipeline and vector search without calling Azure OpenAI.
+"""
+
+import hashlib
+import math
+import re
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Union
+
+import httpx
+import openai
+
+from src.config import settings
+from src.local.chat import AsyncLocalCompletions, LocalCompletions
+from src.local.faults import THROTTLED, FaultInjector
+
+WORD = re.compile(r"\w+")
+HASHES_PER_WORD = 4
+
+
+@lru_cache(maxsize=100_000)
+def _word_features(word: str, dimensions: int) -> tuple[tuple[int, float], ...]:
+    digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4 * HASHES_PER_WORD).digest()
+    features = []
+    for i in range(HASHES_PER_WORD):
+        value = int.from_bytes(digest[4 * i:4 * i + 4], "little")
+        features.append((value % dimensions, 1.0 if value & 0x80000000 else -1.0))
+    return tuple(features)
+
+
+def embed_text(text: str, dimensions: int) -> list[float]:
+    """Deterministic unit vector for text."""
+    vector = [0.0] * dimensions
+    words = WORD.findall(text.lower()) or [text]
+    for word in words:
+        for index, sign in _word_features(word, dimensions):
+            vector[index] += sign
+
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _error(status: int) -> Exception:
+    response = httpx.Response(status, request=httpx.Request("POST", "http://local/embeddings"))
+    if status == THROTTLED:
+        return openai.RateLimitError("Rate limit exceeded (injected)", response=response, body=None)
+    return openai.InternalServerError("Service unavailable (injected)", response=response, body=None)
+
+
+def _response(input: Union[str, list[str]], model: str, dimensions: int) -> SimpleNamespace:
+    texts = [input] if isinstance(input, str) else input
+    tokens = sum(len(WORD.findall(text)) for text in texts)
+    return SimpleNamespace(
+        data=[SimpleNamespace(index=i, embedding=embed_text(text, dimensions)) for i, text in enumerate(texts)],
+        model=model,
+        usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens),
+    )
+
+
+class LocalEmbeddings:
+    def __init__(self, faults: FaultInjector, dimensions: int) -> None:
+        self.faults = faults
+        self.dimensions = dimensions
+
+    def create(self, input: Union[str, list[str]], model: str, **_kwargs) -> SimpleNamespace:
+        return self.faults.run_sync(lambda: _response(input, model, self.dimensions), _error)
+
+
+class AsyncLocalEmbeddings(LocalEmbeddings):
+    async def create(self, input: Union[str, list[str]], model: str, **_kwargs) -> SimpleNamespace:
+        return await self.faults.run(lambda: _response(input, model, self.dimensions), _error)
+
+
+class LocalOpenAI:
+    """Stand-in for AzureOpenAI (embeddings and chat completions)."""
+
+    def __init__(self, faults: FaultInjector, dimensions: int = 0) -> None:
+        self.embeddings = LocalEmbeddings(faults, dimensions or settings.local_embedding_dimensions)
+        self.chat = SimpleNamespace(completions=LocalCompletions(faults))
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncLocalOpenAI:
+    """Stand-in for AsyncAzureOpenAI (embeddings and chat completions)."""
+
+    def __init__(self, faults: FaultInjector, dimensions: int = 0) -> None:
+        self.embeddings = AsyncLocalEmbeddings(faults, dimensions or settings.local_embedding_dimensions)
+        self.chat = SimpleNamespace(completions=AsyncLocalCompletions(faults))
+
+    async def close(self) -> None:
+        pass
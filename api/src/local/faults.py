@@ -0,0 +1,94 @@
+"""Latency, throttling and failure injection for the local service stand-ins.
+
+Each stand-in call waits a configurable latency and may be throttled (429) or
+fail (503) at configurable rates. Like the Azure and OpenAI SDKs they replace,
+the stand-ins retry throttled and failed calls with exponential backoff before
+surfacing an error. A seeded RNG keeps runs reproducible.
+"""
+
+import asyncio
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TypeVar
+
+from src.config import settings
+
+T = TypeVar("T")
+
+THROTTLED = 429
+UNAVAILABLE = 503
+
+
+@dataclass
+class FaultInjector:
+    """Injected latency and error rates for one stand-in service."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+    max_retries: int = 2
+    retry_backoff_seconds: float = 0.05
+
+    calls: int = field(default=0, init=False)
+    throttled: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.random = random.Random(self.seed)
+
+    @classmethod
+    def from_settings(cls, service: str) -> "FaultInjector":
+        """Injector configured by the LOCAL_* settings, seeded per service."""
+        return cls(
+            latency_ms=settings.local_latency_ms,
+            jitter_ms=settings.local_latency_jitter_ms,
+            throttle_rate=settings.local_throttle_rate,
+            failure_rate=settings.local_failure_rate,
+            # crc32 rather than hash(): str hashes are randomized per process
+            seed=zlib.crc32(f"{settings.local_seed}:{service}".encode()),
+        )
+
+    def _delay(self) -> float:
+        jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _roll(self) -> Optional[int]:
+        """Status code of an injected error for this call, if any."""
+        self.calls += 1
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            self.throttled += 1
+            return THROTTLED
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            self.failed += 1
+            return UNAVAILABLE
+        return None
+
+    def item_fails(self) -> bool:
+        """Whether one item of a batch call fails on its own (e.g. a search document upload)."""
+        return bool(self.failure_rate) and self.random.random() < self.failure_rate
+
+    async def run(self, operation: Callable[[], T], error: Callable[[int], Exception]) -> T:
+        """Run an operation after the injected latency, retrying injected errors."""
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._delay())
+            status = self._roll()
+            if status is None:
+                return operation()
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_backoff_seconds * 2 ** attempt)
+        raise error(status)
+
+    def run_sync(self, operation: Callable[[], T], error: Callable[[int], Exception]) -> T:
+        """Blocking variant of run() for the synchronous clients."""
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._delay())
+            status = self._roll()
+            if status is None:
+                return operation()
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff_seconds * 2 ** attempt)
+        raise error(status)
@@ -0,0 +1,536 @@
+"""Local stand-in for Azure AI Search.
+
+An in-memory index per index name, shared by every client in the process,
+supporting the parts of the API Hearings AI uses:
+- upload_documents (merge-or-upload by key, 16 MB request limit, per-document failures)
+- search with search_text (BM25 over content and title), vector_queries
+  (exhaustive cosine kNN), hybrid ranking by reciprocal rank fusion,
+  OData filters, facets, select, top and skip
+- get_document and get_document_count
+- index management and index aliases (LocalSearchIndexClient); clients
+  resolve aliases on every call, so repointing an alias is seen immediately
+"""
+
+import asyncio
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+from src.local.faults import FaultInjector
+
+KEY_FIELD = "id"
+SEARCHABLE_FIELDS = ("content", "title")
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+TERM = re.compile(r"\w+")
+
+# BM25 and reciprocal rank fusion parameters (the service defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+
+def _error(status: int, message: str = "Injected error") -> HttpResponseError:
+    error = HttpResponseError(message=f"({status}) {message}")
+    error.status_code = status
+    return error
+
+
+def analyze(text: Optional[str]) -> list[str]:
+    return TERM.findall(text.lower()) if text else []
+
+
+# OData filter subset: comparisons, and/or/not, parentheses,
+# collection/any(x: ...) lambdas, search.ismatch('text', 'field') and
+# search.in(field, 'a,b', ',').
+FILTER_TOKEN = re.compile(
+    r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<number>-?\d+(?:\.\d+)?)|(?P<punct>[(),:/])|(?P<word>[A-Za-z_@][\w.]*))"
+)
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "ge": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "le": lambda a, b: a is not None and a <= b,
+}
+
+Predicate = Callable[[dict, dict], bool]
+
+
+class FilterParser:
+    """Compiles an OData filter expression into a predicate over documents."""
+
+    def __init__(self, expression: str) -> None:
+        self.tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = FILTER_TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                raise _error(400, f"Invalid filter near: {expression[position:]}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.position != len(self.tokens):
+            raise _error(400, f"Unexpected filter token: {self.tokens[self.position][1]}")
+        return predicate
+
+    def _peek(self) -> Optional[tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self, expected: Optional[str] = None) -> tuple[str, str]:
+        token = self._peek()
+        if token is None or (expected and token[1] != expected):
+            raise _error(400, f"Expected {expected or 'token'} in filter")
+        self.position += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token and token[0] == "word" and token[1].lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def _or(self) -> Predicate:
+        terms = [self._and()]
+        while self._keyword("or"):
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else lambda doc, scope: any(t(doc, scope) for t in terms)
+
+    def _and(self) -> Predicate:
+        terms = [self._not()]
+        while self._keyword("and"):
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else lambda doc, scope: all(t(doc, scope) for t in terms)
+
+    def _not(self) -> Predicate:
+        if self._keyword("not"):
+            inner = self._not()
+            return lambda doc, scope: not inner(doc, scope)
+        return self._primary()
+
+    def _literal(self) -> Any:
+        kind, value = self._next()
+        if kind == "string":
+            return value[1:-1].replace("''", "'")
+        if kind == "number":
+            return float(value) if "." in value else int(value)
+        if kind == "word" and value.lower() in ("true", "false", "null"):
+            return {"true": True, "false": False, "null": None}[value.lower()]
+        raise _error(400, f"Expected a literal in filter, got {value}")
+
+    def _primary(self) -> Predicate:
+        kind, value = self._next()
+        if value == "(":
+            inner = self._or()
+            self._next(")")
+            return inner
+        if kind != "word":
+            raise _error(400, f"Unexpected filter token: {value}")
+        if value.lower() in ("true", "false"):
+            constant = value.lower() == "true"
+            return lambda doc, scope: constant
+        if value.lower() == "search.ismatch":
+            self._next("(")
+            text = self._literal()
+            field = None
+            if self._peek() and self._peek()[1] == ",":
+                self._next(",")
+                field = self._literal()
+            self._next(")")
+            terms = set(analyze(text))
+
+            def ismatch(doc: dict, scope: dict) -> bool:
+                fields = [field] if field else list(SEARCHABLE_FIELDS)
+                values = []
+                for name in fields:
+                    value = scope[name] if name in scope else doc.get(name)
+                    values.extend(value if isinstance(value, list) else [value])
+                return any(terms <= set(analyze(v)) for v in values if isinstance(v, str))
+
+            return ismatch
+        if value.lower() == "search.in":
+            self._next("(")
+            field = self._next()[1]
+            self._next(",")
+            values = self._literal()
+            delimiters = " ,"
+            if self._peek() and self._peek()[1] == ",":
+                self._next(",")
+                delimiters = self._literal()
+            self._next(")")
+            allowed = set(re.split(f"[{re.escape(delimiters)}]", values)) - {""}
+            return lambda doc, scope: (scope[field] if field in scope else doc.get(field)) in allowed
+
+        field = value
+        if self._peek() and self._peek()[1] == "/":
+            self._next("/")
+            function = self._next()[1].lower()
+            if function not in ("any", "all"):
+                raise _error(400, f"Unsupported lambda: {function}")
+            self._next("(")
+            variable = self._next()[1]
+            self._next(":")
+            body = self._or()
+            self._next(")")
+            combine = any if function == "any" else all
+            return lambda doc, scope: combine(
+                body(doc, {**scope, variable: item}) for item in (doc.get(field) or [])
+            )
+
+        operator = self._next()[1].lower()
+        if operator not in COMPARISONS:
+            raise _error(400, f"Unsupported filter operator: {operator}")
+        literal = self._literal()
+        compare = COMPARISONS[operator]
+        return lambda doc, scope: compare(scope[field] if field in scope else doc.get(field), literal)
+
+
+@lru_cache(maxsize=256)
+def compile_filter(expression: str) -> Predicate:
+    return FilterParser(expression).parse()
+
+
+class InMemorySearchIndex:
+    """Documents of one index with an inverted index and vectors for scoring."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.documents: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self.lengths: dict[str, int] = {}
+        self.vector_norms: dict[tuple[str, str], float] = {}
+
+    def _remove(self, key: str) -> None:
+        doc = self.documents.pop(key, None)
+        if doc is None:
+            return
+        for term in set(t for f in SEARCHABLE_FIELDS for t in analyze(doc.get(f))):
+            self.postings[term].pop(key, None)
+        self.lengths.pop(key, None)
+        for vector_key in [k for k in self.vector_norms if k[0] == key]:
+            del self.vector_norms[vector_key]
+
+    def put(self, doc: dict) -> None:
+        key = doc[KEY_FIELD]
+        self._remove(key)
+        self.documents[key] = doc
+        terms = Counter(t for f in SEARCHABLE_FIELDS for t in analyze(doc.get(f)))
+        for term, count in terms.items():
+            self.postings[term][key] = count
+        self.lengths[key] = sum(terms.values())
+        for field, value in doc.items():
+            if isinstance(value, list) and value and isinstance(value[0], float):
+                self.vector_norms[(key, field)] = math.sqrt(sum(v * v for v in value)) or 1.0
+
+    def keyword_scores(self, text: str, candidates: Optional[set[str]]) -> dict[str, float]:
+        """BM25 scores of documents matching any query term."""
+        if not text or text.strip() == "*":
+            keys = candidates if candidates is not None else set(self.documents)
+            return {key: 1.0 for key in keys}
+
+        total = len(self.documents) or 1
+        average_length = (sum(self.lengths.values()) / total) or 1.0
+        scores: dict[str, float] = defaultdict(float)
+        for term in set(analyze(text)):
+            postings = self.postings.get(term, {})
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                if candidates is not None and key not in candidates:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[key] / average_length)
+                scores[key] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return dict(scores)
+
+    def vector_scores(self, query: Any, candidates: Optional[set[str]]) -> dict[str, float]:
+        """Cosine similarity of the k nearest documents (exhaustive search)."""
+        vector = query.vector
+        field = query.fields.split(",")[0].strip()
+        nonzero = [(i, v) for i, v in enumerate(vector) if v]
+        query_norm = math.sqrt(sum(v * v for _, v in nonzero)) or 1.0
+
+        scores = {}
+        for key, doc in self.documents.items():
+            if candidates is not None and key not in candidates:
+                continue
+            values = doc.get(field)
+            if not values:
+                continue
+            dot = sum(v * values[i] for i, v in nonzero)
+            scores[key] = dot / (query_norm * self.vector_norms[(key, field)])
+
+        k = query.k_nearest_neighbors or 50
+        nearest = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        # The service reports 1 / (1 + cosine distance) for cosine similarity
+        return {key: 1 / (2 - similarity) for key, similarity in nearest}
+
+    def search(
+        self,
+        search_text: Optional[str] = None,
+        vector_queries: Optional[list] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+        skip: Optional[int] = None,
+        select: Optional[list[str]] = None,
+        facets: Optional[list[str]] = None,
+        **_kwargs,
+    ) -> "LocalSearchResults":
+        candidates = None
+        if filter:
+            predicate = compile_filter(filter)
+            candidates = {key for key, doc in self.documents.items() if predicate(doc, {})}
+
+        rankings = []
+        if search_text is not None or not vector_queries:
+            rankings.append(self.keyword_scores(search_text or "*", candidates))
+        for query in vector_queries or []:
+            rankings.append(self.vector_scores(query, candidates))
+
+        if len(rankings) == 1:
+            scores = rankings[0]
+        else:
+            scores = defaultdict(float)
+            for ranking in rankings:
+                ordered = sorted(ranking, key=ranking.get, reverse=True)
+                for rank, key in enumerate(ordered, start=1):
+                    scores[key] += 1 / (RRF_K + rank)
+
+        ordered = sorted(scores, key=lambda key: (-scores[key], key))
+        page = ordered[skip or 0:(skip or 0) + (top or 50)]
+
+        results = []
+        for key in page:
+            doc = self.documents[key]
+            fields = select or [f for f in doc if not isinstance(doc[f], list) or not doc[f] or
+                                not isinstance(doc[f][0], float)]
+            results.append({**{f: doc.get(f) for f in fields}, "@search.score": scores[key]})
+
+        return LocalSearchResults(results, self._facets(ordered, facets), len(ordered))
+
+    def _facets(self, keys: list[str], facets: Optional[list[str]]) -> dict[str, list[dict]]:
+        found = {}
+        for spec in facets or []:
+            field, *options = [part.strip() for part in spec.split(",")]
+            count = 10
+            for option in options:
+                name, _, value = option.partition(":")
+                if name == "count":
+                    count = int(value)
+            counter = Counter()
+            for key in keys:
+                value = self.documents[key].get(field)
+                for item in value if isinstance(value, list) else [value]:
+                    if item is not None:
+                        counter[item] += 1
+            found[field] = [{"value": value, "count": n} for value, n in counter.most_common(count)]
+        return found
+
+    def upload(self, documents: list[dict], faults: FaultInjector) -> list[SimpleNamespace]:
+        if len(json.dumps(documents).encode("utf-8")) > MAX_REQUEST_BYTES:
+            raise _error(413, "Request entity too large")
+
+        results = []
+        for doc in documents:
+            key = doc[KEY_FIELD]
+            if faults.item_fails():
+                results.append(SimpleNamespace(
+                    key=key, succeeded=False, status_code=503, error_message="Service unavailable (injected)"
+                ))
+                continue
+            self.put(dict(doc))
+            results.append(SimpleNamespace(key=key, succeeded=True, status_code=201, error_message=None))
+        return results
+
+
+class LocalSearchService:
+    """Indexes and aliases of the in-process search service."""
+
+    def __init__(self) -> None:
+        self.indexes: dict[str, InMemorySearchIndex] = {}
+        self.aliases: dict[str, str] = {}
+
+    def index(self, name: str) -> InMemorySearchIndex:
+        """Index by name or alias; indexes are created on first use."""
+        name = self.aliases.get(name, name)
+        if name not in self.indexes:
+            self.indexes[name] = InMemorySearchIndex(name)
+        return self.indexes[name]
+
+
+@lru_cache()
+def get_search_service() -> LocalSearchService:
+    """The search service shared by all local search clients in the process."""
+    return LocalSearchService()
+
+
+def get_search_index(name: str) -> InMemorySearchIndex:
+    """In-memory index by name or alias."""
+    return get_search_service().index(name)
+
+
+class LocalSearchResults:
+    """Search results iterable like the SDK's SearchItemPaged."""
+
+    def __init__(self, results: list[dict], facets: dict, count: int) -> None:
+        self.results = results
+        self.facets = facets
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def get_facets(self) -> dict:
+        return self.facets
+
+    def get_count(self) -> int:
+        return self.count
+
+
+class AsyncLocalSearchResults(LocalSearchResults):
+    """Search results iterable like the SDK's AsyncSearchItemPaged."""
+
+    async def __aiter__(self):
+        for result in self.results:
+            yield result
+
+    async def get_facets(self) -> dict:
+        return self.facets
+
+    async def get_count(self) -> int:
+        return self.count
+
+
+class LocalSearchClient:
+    """Stand-in for azure.search.documents.SearchClient."""
+
+    def __init__(self, index_name: str, faults: FaultInjector) -> None:
+        self.index_name = index_name
+        self.faults = faults
+
+    @property
+    def index(self) -> InMemorySearchIndex:
+        return get_search_index(self.index_name)
+
+    def upload_documents(self, documents: list[dict], **_kwargs) -> list[SimpleNamespace]:
+        return self.faults.run_sync(lambda: self.index.upload(documents, self.faults), _error)
+
+    def search(self, search_text: Optional[str] = None, **kwargs) -> LocalSearchResults:
+        return self.faults.run_sync(lambda: self.index.search(search_text, **kwargs), _error)
+
+    def get_document(self, key: str, **_kwargs) -> dict:
+        doc = self.index.documents.get(key)
+        if doc is None:
+            raise ResourceNotFoundError(f"Document {key} not found")
+        return dict(doc)
+
+    def get_document_count(self) -> int:
+        return len(self.index.documents)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncLocalSearchClient:
+    """Stand-in for azure.search.documents.aio.SearchClient."""
+
+    def __init__(self, index_name: str, faults: FaultInjector) -> None:
+        self.index_name = index_name
+        self.faults = faults
+
+    @property
+    def index(self) -> InMemorySearchIndex:
+        return get_search_index(self.index_name)
+
+    async def upload_documents(self, documents: list[dict], **_kwargs) -> list[SimpleNamespace]:
+        return await self.faults.run(lambda: self.index.upload(documents, self.faults), _error)
+
+    async def search(self, search_text: Optional[str] = None, **kwargs) -> AsyncLocalSearchResults:
+        results = await self.faults.run(lambda: self.index.search(search_text, **kwargs), _error)
+        return AsyncLocalSearchResults(results.results, results.facets, results.count)
+
+    async def get_document(self, key: str, **_kwargs) -> dict:
+        await asyncio.sleep(0)
+        doc = self.index.documents.get(key)
+        if doc is None:
+            raise ResourceNotFoundError(f"Document {key} not found")
+        return dict(doc)
+
+    async def get_document_count(self) -> int:
+        return len(self.index.documents)
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalSearchIndexClient:
+    """Stand-in for azure.search.documents.indexes.SearchIndexClient (index and alias management)."""
+
+    def __init__(self, faults: FaultInjector) -> None:
+        self.service = get_search_service()
+        self.faults = faults
+
+    def _require_index(self, name: str) -> InMemorySearchIndex:
+        if name not in self.service.indexes:
+            raise ResourceNotFoundError(f"Index {name} not found")
+        return self.service.indexes[name]
+
+    def create_or_update_index(self, index: Any, **_kwargs) -> Any:
+        if index.name in self.service.aliases:
+            raise _error(400, f"An alias named {index.name} already exists")
+        self.faults.run_sync(lambda: self.service.index(index.name), _error)
+        return index
+
+    def create_index(self, index: Any, **_kwargs) -> Any:
+        if index.name in self.service.indexes:
+            raise _error(409, f"Index {index.name} already exists")
+        return self.create_or_update_index(index)
+
+    def delete_index(self, index: Any, **_kwargs) -> None:
+        name = getattr(index, "name", index)
+        self._require_index(name)
+        if name in self.service.aliases.values():
+            raise _error(400, f"Index {name} is referenced by an alias")
+        del self.service.indexes[name]
+
+    def list_index_names(self, **_kwargs) -> list[str]:
+        return sorted(self.service.indexes)
+
+    def get_index_statistics(self, index_name: str, **_kwargs) -> dict:
+        index = self._require_index(index_name)
+        return {
+            "document_count": len(index.documents),
+            "storage_size": sum(len(json.dumps(doc)) for doc in index.documents.values()),
+            "vector_index_size": 4 * sum(len(doc.get("contentVector") or []) for doc in index.documents.values()),
+        }
+
+    def get_alias(self, alias: str, **_kwargs) -> SimpleNamespace:
+        if alias not in self.service.aliases:
+            raise ResourceNotFoundError(f"Alias {alias} not found")
+        return SimpleNamespace(name=alias, indexes=[self.service.aliases[alias]])
+
+    def create_or_update_alias(self, alias: Any, **_kwargs) -> Any:
+        if alias.name in self.service.indexes:
+            raise _error(400, f"An index named {alias.name} already exists")
+        (target,) = alias.indexes
+        self._require_index(target)
+        self.service.aliases[alias.name] = target
+        return alias
+
+    def delete_alias(self, alias: Any, **_kwargs) -> None:
+        self.service.aliases.pop(getattr(alias, "name", alias), None)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,89 @@
+"""Populate the local stand-ins with the test corpus.
+
+Used by the load-test and evaluation scripts to give the in-memory search
+index and Cosmos container realistic contents, either by running PDFs through
+the ingestion pipeline (fast on repeat runs thanks to the extraction cache)
+or by importing a bundle written by `ingest-documents.py --export`.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+
+
+def corpus_metadata(pdf_path: Path) -> dict:
+    """Pipeline metadata for a test-data decision PDF (named by its ABAER citation)."""
+    return {
+        "filename": pdf_path.name,
+        "abaer_citation": pdf_path.stem,
+        "document_type": "decision",
+        "title": f"Decision {pdf_path.stem}",
+        "confidentiality_level": "public",
+    }
+
+
+async def seed_from_documents(pdf_files: list[Path], index_name: Optional[str] = None) -> int:
+    """Ingest PDFs into the local stand-ins; returns the number of chunks indexed."""
+    from src.documents.pipeline import (
+        CosmosMetadataWriter,
+        EmbeddingDeduplicator,
+        compute_document_id,
+        pipeline_clients,
+        process_document,
+        store_source_document,
+    )
+
+    if not settings.use_local_services:
+        raise RuntimeError("Seeding is only for the local stand-ins (USE_LOCAL_SERVICES=true)")
+
+    indexed = 0
+    async with pipeline_clients(index_name) as (openai_client, search_client, container):
+        metadata_writer = CosmosMetadataWriter(container)
+        deduplicator = EmbeddingDeduplicator()
+        for pdf_path in pdf_files:
+            data = pdf_path.read_bytes()
+            document_id = compute_document_id(data)
+            metadata = corpus_metadata(pdf_path)
+            metadata["blob_name"] = await store_source_document(data, document_id, metadata)
+            result = await process_document(
+                pdf_path,
+                document_id,
+                metadata,
+                openai_client,
+                search_client,
+                metadata_writer,
+                deduplicator=deduplicator,
+            )
+            indexed += result.get("indexed", 0)
+        await metadata_writer.flush()
+    return indexed
+
+
+async def seed_from_bundle(bundle_path: Path, index_name: Optional[str] = None) -> int:
+    """Import a bundle into the local stand-ins; returns the number of chunks indexed."""
+    from src.documents.bundle import BundleReader
+    from src.documents.pipeline import CosmosMetadataWriter, pipeline_clients, upload_documents
+    from src.documents.storage import get_document_store
+    from src.evidence.store import get_chunk_store
+    from src.proceedings.overview import set_details
+
+    if not settings.use_local_services:
+        raise RuntimeError("Seeding is only for the local stand-ins (USE_LOCAL_SERVICES=true)")
+
+    bundle = BundleReader(bundle_path)
+    page_counts = {record["id"]: record.get("pageCount") for record in bundle.iter_metadata_records()}
+    indexed = 0
+    async with pipeline_clients(index_name) as (_, search_client, container):
+        for batch in bundle.iter_index_documents():
+            indexed += await upload_documents(search_client, batch)
+            get_chunk_store().put_documents(batch, page_counts)
+        for blob_name, path in bundle.iter_sources():
+            get_document_store().put(blob_name, path.read_bytes())
+        metadata_writer = CosmosMetadataWriter(container)
+        for record in bundle.iter_metadata_records():
+            await metadata_writer.add(record)
+        await metadata_writer.flush()
+        for proceeding in bundle.proceedings:
+            await set_details(container, proceeding)
+    return indexed
@@ -4,25 +4,35 @@ This API provides semantic search, evidence retrieval, and document understandin
 for hearing documents.
 """
 
+import asyncio
+import json
 import uuid
 from contextlib import asynccontextmanager
-from typing import Annotated, AsyncGenerator
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, AsyncGenerator, Optional
 
 import structlog
-from fastapi import Depends, FastAPI, HTTPException, Request, UploadFile, status
+from fastapi import BackgroundTasks, Depends, FastAPI, Form, HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
-from src.auth import build_search_filter, get_current_user, can_access_document
+from src.auth import build_search_filter, get_current_user, can_access_document, can_access_level
 from src.config import settings
 from src.models import (
+    DocumentSummary,
     DocumentUnderstandingRequest,
     DocumentUnderstandingResponse,
     ErrorResponse,
+    EvidenceChunk,
     EvidenceRetrievalRequest,
     EvidenceRetrievalResponse,
+    IngestionJob,
     IngestionRequest,
     IngestionResponse,
+    IngestionStatusResponse,
+    ProcessingStatus,
     ProceedingOverview,
     SearchRequest,
     SearchResponse,
@@ -182,13 +192,16 @@ async def health_check():
 async def search_documents_endpoint(
     request: SearchRequest,
     user_claims: Annotated[UserClaims, Depends(get_current_user)],
+    background_tasks: BackgroundTasks,
 ):
     """Semantic search across hearing documents with role-based filtering.
 
     Supports hybrid search (vector + keyword) with faceting by document type,
     parties, and regulatory citations. Results are filtered based on user's
-    confidentiality access level.
+    confidentiality access level. After responding, the evidence windows of
+    the top hits are prefetched into the evidence cache.
     """
+    from src.evidence.store import prefetch_evidence
     from src.search.service import search_documents
     
     log = logger.bind(
@@ -205,6 +218,7 @@ async def search_documents_endpoint(
     response = search_documents(request, user_claims, security_filter)
 
     log.info("Search completed", result_count=response.total_count)
+    background_tasks.add_task(prefetch_evidence, user_claims, response.results)
 
     return response
 
@@ -220,8 +234,11 @@ async def retrieve_evidence(
     """Retrieve evidence chunk with surrounding context.
 
     Returns the target chunk plus context_window chunks before and after,
-    preserving paragraph numbers for proper citation.
+    preserving paragraph numbers for proper citation. The window and the
+    document fields for the access check come from one chunk store read.
     """
+    from src.evidence.store import get_chunk_store
+
     log = logger.bind(
         user_oid=user_claims.oid,
         document_id=request.document_id,
@@ -229,21 +246,89 @@ async def retrieve_evidence(
     )
     log.info("Evidence retrieval request")
 
-    # TODO: Implement evidence retrieval
-    # 1. Fetch document metadata from Cosmos DB
-    # 2. Check access with can_access_document()
-    # 3. Retrieve chunks from search index
-    # 4. Return with proper citation formatting
+    window = await asyncio.to_thread(
+        get_chunk_store().get_window, request.document_id, request.chunk_id, request.context_window
+    )
+    if window is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "DOC_001", "message": "Document or chunk not found"},
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail={"code": "NOT_IMPLEMENTED", "message": "Evidence retrieval not yet implemented"},
+    document = window.document
+    if not can_access_level(user_claims, document.confidentiality_level, document.parties):
+        log.warning("Evidence access denied", confidentiality_level=document.confidentiality_level)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "DOC_003", "message": "Document is restricted by its confidentiality level"},
+        )
+
+    target = next(chunk for chunk in window.chunks if chunk.chunk_id == request.chunk_id)
+    log.info("Evidence retrieved", chunks=len(window.chunks))
+
+    return EvidenceRetrievalResponse(
+        document=DocumentSummary(
+            id=document.document_id,
+            title=document.title,
+            document_type=document.document_type,
+            abaer_citation=document.abaer_citation,
+            page_count=document.page_count,
+        ),
+        proceeding_id=document.proceeding_id,
+        citation_ref=target.citation_ref,
+        chunks=[
+            EvidenceChunk(
+                chunk_id=chunk.chunk_id,
+                paragraph_number=chunk.paragraph_number,
+                content=chunk.content,
+                is_target=chunk.chunk_id == request.chunk_id,
+            )
+            for chunk in window.chunks
+        ],
+        page_range=window.page_range,
+        source_url=document.source_url,
     )
 
 
 # === Document Understanding Endpoints ===
 
 
+async def _document_for_understanding(request: DocumentUnderstandingRequest, user_claims: UserClaims):
+    """The whole document an understanding request is about, after the existence, access and operation checks."""
+    from src.evidence.store import get_chunk_store
+    from src.understanding.service import SUPPORTED_OPERATIONS
+
+    log = logger.bind(
+        user_oid=user_claims.oid,
+        document_id=request.document_id,
+        operations=request.operations,
+    )
+    log.info("Document understanding request")
+
+    window = await asyncio.to_thread(get_chunk_store().get_document, request.document_id)
+    if window is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "DOC_001", "message": "Document not found"},
+        )
+
+    document = window.document
+    if not can_access_level(user_claims, document.confidentiality_level, document.parties):
+        log.warning("Document understanding access denied", confidentiality_level=document.confidentiality_level)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "DOC_003", "message": "Document is restricted by its confidentiality level"},
+        )
+
+    unsupported = sorted(set(request.operations) - SUPPORTED_OPERATIONS)
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"code": "NOT_IMPLEMENTED", "message": f"Operations not yet implemented: {', '.join(unsupported)}"},
+        )
+    return window
+
+
 @app.post("/api/documents/understand", response_model=DocumentUnderstandingResponse)
 async def understand_document(
     request: DocumentUnderstandingRequest,
@@ -251,24 +336,50 @@ async def understand_document(
 ):
     """Analyze document for summary, entities, key points, and regulatory citations.
 
-    Uses Azure OpenAI to extract structured information from hearing documents.
+    Summaries and key points are map-reduced over the whole document with
+    Azure OpenAI (src.understanding.summarize), reusing cached section
+    summaries for text seen before.
     """
-    log = logger.bind(
-        user_oid=user_claims.oid,
-        document_id=request.document_id,
-        operations=request.operations,
-    )
-    log.info("Document understanding request")
+    from src.understanding.service import analyze_document
+
+    window = await _document_for_understanding(request, user_claims)
+    return await analyze_document(window, request.operations)
 
-    # TODO: Implement document understanding
-    # 1. Fetch document from storage
-    # 2. Check access
-    # 3. Run requested operations with Azure OpenAI
-    # 4. Extract entities (legal sections, well IDs, etc.)
 
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail={"code": "NOT_IMPLEMENTED", "message": "Document understanding not yet implemented"},
+@app.post("/api/documents/understand/stream")
+async def stream_document_understanding(
+    request: DocumentUnderstandingRequest,
+    user_claims: Annotated[UserClaims, Depends(get_current_user)],
+):
+    """Analyze a document like /api/documents/understand, streaming progress as server-sent events.
+
+    Events: "section" for each section summary as it completes, "result" as
+    each operation finishes (stored results first), then "done" with the
+    whole response, or "error". Comment lines keep idle connections open.
+    When the client disconnects, the analysis and its chat calls are
+    cancelled; section summaries already finished are cached for next time.
+    """
+    from src.understanding.service import stream_document
+
+    window = await _document_for_understanding(request, user_claims)
+
+    async def events() -> AsyncGenerator[str, None]:
+        stream = stream_document(window, request.operations)
+        try:
+            async for event in stream:
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event[0]}\ndata: {json.dumps(event[1])}\n\n"
+        except Exception as e:
+            logger.error("Document understanding failed", document_id=request.document_id, error=str(e))
+            error = {"code": "DOC_005", "message": "Document understanding failed"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -278,44 +389,180 @@ async def understand_document(
 @app.post("/api/documents/ingest", response_model=IngestionResponse)
 async def ingest_document(
     file: UploadFile,
-    metadata: IngestionRequest,
+    metadata: Annotated[str, Form(description="IngestionRequest as JSON")],
     user_claims: Annotated[UserClaims, Depends(get_current_user)],
 ):
     """Upload and process a new hearing document.
 
     Requires Staff or Hearing_Panel role. Document is processed asynchronously:
     1. Stored in blob storage
-    2. Text extracted with Document Intelligence
-    3. Chunked and embedded
-    4. Indexed in Azure AI Search
+    2. Metadata record created in Cosmos DB with status "pending"
+    3. Queued for the ingestion worker, which extracts, chunks, embeds and
+       indexes it (poll GET /api/documents/{document_id}/status)
     """
+    from src.documents.queue import get_ingestion_queue
+    from src.documents.service import build_metadata_record, save_metadata_record
+    from src.documents.storage import compute_document_id, get_document_store, upload_blob_name
+
     if "Staff" not in user_claims.roles and "Hearing_Panel" not in user_claims.roles:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={"code": "AUTH_002", "message": "Document ingestion requires Staff or Hearing_Panel role"},
         )
 
+    try:
+        ingestion_request = IngestionRequest.model_validate_json(metadata)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "code": "DOC_002",
+                "message": "Invalid ingestion metadata",
+                "details": {"errors": e.errors(include_context=False, include_url=False)},
+            },
+        )
+
     log = logger.bind(
         user_oid=user_claims.oid,
-        proceeding_id=metadata.proceeding_id,
-        document_type=metadata.document_type,
+        proceeding_id=ingestion_request.proceeding_id,
+        document_type=ingestion_request.document_type,
         filename=file.filename,
     )
     log.info("Document ingestion request")
 
-    # TODO: Implement ingestion pipeline
-    # 1. Upload to blob storage
-    # 2. Create metadata record in Cosmos DB
-    # 3. Queue for async processing
+    data = await file.read()
+    if not data.startswith(b"%PDF"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "DOC_002", "message": "Only PDF documents can be ingested"},
+        )
+
+    document_id = compute_document_id(data)
+    job = IngestionJob(
+        document_id=document_id,
+        blob_name=upload_blob_name(ingestion_request.proceeding_id, document_id),
+        filename=file.filename or f"{document_id}.pdf",
+        metadata=ingestion_request,
+        submitted_by=user_claims.oid,
+        submitted_at=datetime.utcnow(),
+    )
+
+    # Persist the upload and a pending status record before queueing, so the
+    # worker never sees a job whose source document is missing
+    await asyncio.to_thread(get_document_store().put, job.blob_name, data)
+    record = build_metadata_record(
+        document_id,
+        job.filename,
+        {**ingestion_request.model_dump(mode="json"), "blob_name": job.blob_name},
+        ProcessingStatus.PENDING.value,
+    )
+    await asyncio.to_thread(save_metadata_record, record)
+    await get_ingestion_queue().enqueue(job)
+
+    log.info("Document queued for ingestion", document_id=document_id, size_bytes=len(data))
 
-    document_id = str(uuid.uuid4())
     return IngestionResponse(
         document_id=document_id,
-        status="pending",
+        status=ProcessingStatus.PENDING,
         estimated_completion_minutes=5,
     )
 
 
+@app.get("/api/documents/{document_id}/status", response_model=IngestionStatusResponse)
+async def get_ingestion_status(
+    document_id: str,
+    user_claims: Annotated[UserClaims, Depends(get_current_user)],
+):
+    """Get the processing status of an ingested document.
+
+    Requires Staff or Hearing_Panel role, matching document ingestion.
+    """
+    from src.documents.service import get_metadata_record
+
+    if "Staff" not in user_claims.roles and "Hearing_Panel" not in user_claims.roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "AUTH_002", "message": "Ingestion status requires Staff or Hearing_Panel role"},
+        )
+
+    record = await asyncio.to_thread(get_metadata_record, document_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "DOC_001", "message": "Document not found"},
+        )
+
+    return IngestionStatusResponse(
+        document_id=document_id,
+        status=record.get("processingStatus", ProcessingStatus.INDEXED.value),
+        page_count=record.get("pageCount"),
+        chunk_count=record.get("chunkCount"),
+        error=record.get("processingError"),
+        uploaded_at=record.get("uploadedAt"),
+    )
+
+
+@app.get("/api/documents/{document_id}/pages")
+async def get_document_pages(
+    document_id: str,
+    user_claims: Annotated[UserClaims, Depends(get_current_user)],
+    first: Annotated[int, Query(ge=1, description="First page (1-based)")],
+    last: Annotated[Optional[int], Query(ge=1, description="Last page; defaults to first")] = None,
+):
+    """Serve a page or page range of a stored source document as a PDF.
+
+    Only the byte ranges holding the requested pages are read from storage,
+    and cut pages are cached on disk, so reviewers never download a whole
+    decision to read one paragraph. Single pages support HTTP Range requests.
+    """
+    from src.documents.pages import PageRangeError, get_pages
+    from src.documents.service import get_metadata_record
+
+    last = last or first
+    log = logger.bind(user_oid=user_claims.oid, document_id=document_id, first=first, last=last)
+    if last < first or last - first + 1 > settings.page_range_max_pages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "DOC_004",
+                "message": f"Request 1 to {settings.page_range_max_pages} pages, with last >= first",
+            },
+        )
+
+    record = await asyncio.to_thread(get_metadata_record, document_id)
+    if record is None or not record.get("blobName"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "DOC_001", "message": "Source document not found"},
+        )
+
+    parties = [p.get("name", p) if isinstance(p, dict) else p for p in record.get("parties") or []]
+    if not can_access_level(user_claims, record.get("confidentialityLevel", "public"), parties):
+        log.warning("Page access denied", confidentiality_level=record.get("confidentialityLevel"))
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "DOC_003", "message": "Document is restricted by its confidentiality level"},
+        )
+
+    try:
+        pages = await asyncio.to_thread(get_pages, document_id, record["blobName"], first, last)
+    except PageRangeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "DOC_004", "message": str(e)},
+        )
+    log.info("Pages served")
+
+    filename = f"{document_id}-p{first}.pdf" if first == last else f"{document_id}-p{first}-{last}.pdf"
+    headers = {"Cache-Control": "private, max-age=86400"}
+    if isinstance(pages, Path):
+        return FileResponse(
+            pages, media_type="application/pdf", filename=filename, content_disposition_type="inline", headers=headers
+        )
+    headers["Content-Disposition"] = f'inline; filename="{filename}"'
+    return Response(content=pages, media_type="application/pdf", headers=headers)
+
+
 # === Proceeding Endpoints ===
 
 
@@ -327,21 +574,22 @@ async def get_proceeding(
     """Get proceeding overview with all associated documents.
 
     Returns proceeding metadata, parties, timeline, and documents grouped by type.
-    Document lists are filtered based on user's access level.
+    Document lists are filtered based on user's access level. The overview is
+    one point read of the materialized item ingestion keeps current
+    (src.proceedings.overview).
     """
+    from src.proceedings.overview import build_overview, get_overview_item
+
     log = logger.bind(user_oid=user_claims.oid, proceeding_id=proceeding_id)
     log.info("Proceeding overview request")
 
-    # TODO: Implement proceeding retrieval
-    # 1. Fetch proceeding from Cosmos DB
-    # 2. Query all documents for this proceeding
-    # 3. Filter by user access
-    # 4. Group by document type
-
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail={"code": "NOT_IMPLEMENTED", "message": "Proceeding overview not yet implemented"},
-    )
+    item = await asyncio.to_thread(get_overview_item, proceeding_id)
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "SEARCH_002", "message": "Proceeding not found"},
+        )
+    return build_overview(item, user_claims)
 
 
 if __name__ == "__main__":
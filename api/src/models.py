@@ -149,6 +149,7 @@ class SearchResult(BaseModel):
     """A single search result with citation."""
 
     document_id: str
+    chunk_id: Optional[int] = None  # For /api/evidence/retrieve
     title: str
     abaer_citation: Optional[str] = None
     snippet: str
@@ -305,6 +306,28 @@ class IngestionResponse(BaseModel):
     estimated_completion_minutes: int
 
 
+class IngestionJob(BaseModel):
+    """A queued ingestion job for the ingestion worker."""
+
+    document_id: str
+    blob_name: str
+    filename: str
+    metadata: IngestionRequest
+    submitted_by: str
+    submitted_at: datetime
+
+
+class IngestionStatusResponse(BaseModel):
+    """Processing status of an ingested document."""
+
+    document_id: str
+    status: ProcessingStatus
+    page_count: Optional[int] = None
+    chunk_count: Optional[int] = None
+    error: Optional[str] = None
+    uploaded_at: Optional[datetime] = None
+
+
 # === Error Models ===
 
 
@@ -0,0 +1,245 @@
+"""Materialized proceeding overviews for /api/proceedings/{proceeding_id}.
+
+Each proceeding has one overview item in the documents container, in the
+proceeding's own partition (src.documents.layout). It holds a small
+entry per indexed document, keyed by document ID, and optional
+proceeding-level details (title, status, parties, hearing dates, timeline).
+CosmosMetadataWriter keeps it current as metadata records are written: each
+document is one patch "set" of its entry, so re-ingesting a document replaces
+its entry and concurrent writers never overwrite each other. A document moved
+to another proceeding has its entry removed from the old overview.
+
+Serving an overview is one point read. Groupings, parties and the timeline
+are derived from the entries the user may see, so confidentiality trimming
+stays per request without a query over the proceeding's documents.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import structlog
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceExistsError, CosmosResourceNotFoundError
+from pydantic import ValidationError
+
+from src.auth import can_access_level
+from src.documents.layout import overview_id
+from src.models import (
+    DocumentSummary,
+    HearingDates,
+    Party,
+    ProceedingDocuments,
+    ProceedingOverview,
+    TimelineEvent,
+    UserClaims,
+)
+
+logger = structlog.get_logger()
+
+RECORD_TYPE = "proceedingOverview"
+
+# Operations per patch request (a Cosmos DB limit), one reserved for updatedAt
+PATCH_MAX_DOCUMENTS = 9
+
+# ProceedingDocuments group per document type; information requests and responses are filed as evidence
+DOCUMENT_GROUPS = {
+    "decision": "decisions",
+    "transcript": "transcripts",
+    "evidence": "evidence",
+    "information_request": "evidence",
+    "procedural": "procedural",
+    "notice": "notices",
+}
+
+
+def _pointer(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def document_entry(record: dict) -> dict:
+    """A document's overview entry, from its metadata record."""
+    return {
+        "title": record.get("title"),
+        "documentType": record.get("documentType"),
+        "abaerCitation": record.get("abaerCitation"),
+        "pageCount": record.get("pageCount"),
+        "volumeNumber": record.get("volumeNumber"),
+        "confidentialityLevel": record.get("confidentialityLevel", "public"),
+        "parties": record.get("parties") or [],
+        "decisionDate": record.get("decisionDate"),
+    }
+
+
+def _new_overview(proceeding_id: str, documents: dict[str, dict], details: Optional[dict] = None) -> dict:
+    return {
+        "id": overview_id(proceeding_id),
+        "proceedingId": proceeding_id,
+        "recordType": RECORD_TYPE,
+        "details": details,
+        "documents": documents,
+        "updatedAt": datetime.utcnow().isoformat(),
+    }
+
+
+async def _set(
+    container: Any, proceeding_id: str, values: dict[str, Any], new_item: dict, response_hook: Optional[Callable]
+) -> None:
+    """Patch-set top-level paths of an overview, creating it if the proceeding has none yet."""
+    operations = [{"op": "set", "path": path, "value": value} for path, value in values.items()]
+    operations.append({"op": "set", "path": "/updatedAt", "value": datetime.utcnow().isoformat()})
+    for _ in range(2):
+        try:
+            await container.patch_item(
+                overview_id(proceeding_id), partition_key=proceeding_id, patch_operations=operations,
+                response_hook=response_hook,
+            )
+            return
+        except CosmosResourceNotFoundError:
+            try:
+                await container.create_item(new_item, response_hook=response_hook)
+                return
+            except CosmosResourceExistsError:
+                # Created concurrently by another writer: patch it on the next attempt
+                continue
+    raise RuntimeError(f"Could not update the overview of proceeding {proceeding_id}")
+
+
+async def add_documents(
+    container: Any, proceeding_id: str, records: list[dict], response_hook: Optional[Callable] = None
+) -> None:
+    """Add or replace the entries of indexed documents in their proceeding's overview (async container)."""
+    entries = {record["id"]: document_entry(record) for record in records}
+    ids = list(entries)
+    for i in range(0, len(ids), PATCH_MAX_DOCUMENTS):
+        batch = {document_id: entries[document_id] for document_id in ids[i:i + PATCH_MAX_DOCUMENTS]}
+        await _set(
+            container,
+            proceeding_id,
+            {f"/documents/{_pointer(document_id)}": entry for document_id, entry in batch.items()},
+            _new_overview(proceeding_id, batch),
+            response_hook,
+        )
+
+
+def _removal(document_id: str) -> list[dict]:
+    return [
+        {"op": "remove", "path": f"/documents/{_pointer(document_id)}"},
+        {"op": "set", "path": "/updatedAt", "value": datetime.utcnow().isoformat()},
+    ]
+
+
+def _removed(error: CosmosHttpResponseError) -> bool:
+    # No overview (404), or no entry for the document in it (400): nothing to remove
+    return error.status_code in (400, 404)
+
+
+async def remove_document(
+    container: Any, proceeding_id: str, document_id: str, response_hook: Optional[Callable] = None
+) -> None:
+    """Remove a document's entry from a proceeding's overview (async container)."""
+    try:
+        await container.patch_item(
+            overview_id(proceeding_id), partition_key=proceeding_id, patch_operations=_removal(document_id),
+            response_hook=response_hook,
+        )
+    except CosmosHttpResponseError as e:
+        if not _removed(e):
+            raise
+
+
+def remove_document_sync(container: Any, proceeding_id: str, document_id: str) -> None:
+    """remove_document for a sync container."""
+    try:
+        container.patch_item(
+            overview_id(proceeding_id), partition_key=proceeding_id, patch_operations=_removal(document_id)
+        )
+    except CosmosHttpResponseError as e:
+        if not _removed(e):
+            raise
+
+
+async def set_details(container: Any, proceeding: dict) -> None:
+    """Set proceeding-level details from a proceeding description (as in sample-proceedings.json)."""
+    proceeding_id = proceeding["proceeding_id"]
+    details = {
+        "title": proceeding.get("title"),
+        "status": proceeding.get("status"),
+        "applicant": proceeding.get("applicant"),
+        "interveners": proceeding.get("interveners") or [],
+        "hearingDates": proceeding.get("hearing_dates"),
+        "timeline": proceeding.get("timeline") or [],
+    }
+    await _set(container, proceeding_id, {"/details": details}, _new_overview(proceeding_id, {}, details), None)
+
+
+def get_overview_item(proceeding_id: str) -> Optional[dict]:
+    """Fetch a proceeding's overview item (one point read), or None if nothing was ingested for it."""
+    from src.clients import get_cosmos_container
+
+    try:
+        return get_cosmos_container().read_item(overview_id(proceeding_id), partition_key=proceeding_id)
+    except CosmosResourceNotFoundError:
+        return None
+
+
+def _party(value: Any) -> Optional[Party]:
+    if not isinstance(value, dict):
+        return None
+    try:
+        return Party.model_validate(value)
+    except ValidationError:
+        return None
+
+
+def _party_names(parties: list) -> list[str]:
+    return [p.get("name", p) if isinstance(p, dict) else p for p in parties]
+
+
+def build_overview(item: dict, user_claims: UserClaims) -> ProceedingOverview:
+    """The overview a user may see: documents above their access level, and what only those mention, left out."""
+    proceeding_id = item["proceedingId"]
+    details = item.get("details") or {}
+    visible = {
+        document_id: entry for document_id, entry in (item.get("documents") or {}).items()
+        if can_access_level(user_claims, entry.get("confidentialityLevel", "public"), _party_names(entry["parties"]))
+    }
+
+    groups: dict[str, list[tuple]] = {group: [] for group in ProceedingDocuments.model_fields}
+    applicant = _party(details.get("applicant"))
+    interveners = {party.name: party for party in map(_party, details.get("interveners") or []) if party}
+    timeline = list(details.get("timeline") or [])
+    for document_id, entry in visible.items():
+        group = DOCUMENT_GROUPS.get(entry.get("documentType"))
+        if group:
+            summary = DocumentSummary(
+                id=document_id,
+                title=entry.get("title") or document_id,
+                document_type=entry["documentType"],
+                abaer_citation=entry.get("abaerCitation"),
+                page_count=entry.get("pageCount"),
+            )
+            groups[group].append((entry.get("volumeNumber") or 0, summary.title, summary))
+        for party in filter(None, map(_party, entry["parties"])):
+            if party.role == "applicant" and applicant is None:
+                applicant = party
+            elif party.role == "intervener":
+                interveners.setdefault(party.name, party)
+        if entry.get("decisionDate"):
+            label = entry.get("abaerCitation") or entry.get("title") or document_id
+            timeline.append({"date": entry["decisionDate"], "event": f"Decision issued: {label}"})
+
+    return ProceedingOverview(
+        proceeding_id=proceeding_id,
+        title=details.get("title") or f"Proceeding {proceeding_id}",
+        status=details.get("status") or "active",
+        applicant=applicant,
+        interveners=sorted(interveners.values(), key=lambda party: party.name),
+        hearing_dates=HearingDates.model_validate(details["hearingDates"]) if details.get("hearingDates") else None,
+        documents=ProceedingDocuments(**{
+            group: [summary for *_, summary in sorted(documents, key=lambda d: d[:2])]
+            for group, documents in groups.items()
+        }),
+        timeline=sorted(
+            (TimelineEvent.model_validate(event) for event in timeline),
+            key=lambda event: (event.date, event.event),
+        ),
+    )
@@ -0,0 +1,128 @@
+"""Retrieval quality evaluation for Hearings AI search.
+
+Scores search results against a versioned query set (test-data/eval) with
+recall@k and MRR at two levels: "document" (the hit's ABAER citation is
+expected) and "passage" (it also matches the expected page and, where the
+query lists them, one of the expected paragraphs). Used by
+scripts/evaluate-retrieval.py and to validate new index versions before
+they go live (scripts/reindex.py).
+"""
+
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+SEARCH_MODES = ["hybrid", "keyword", "vector"]
+CUTOFFS = [1, 5, 10]
+LEVELS = ("document", "passage")
+
+# Searches run as Hearing_Panel so confidentiality filtering does not hide expected results
+EVAL_ROLE = "Hearing_Panel"
+
+# (search mode, query, top) -> hits as SearchResult dicts
+Search = Callable[[str, str, int], list[dict]]
+
+
+def load_eval_set(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def index_search(search_client: Any = None) -> Search:
+    """Search function running search_documents in-process, against search_client if given."""
+    from src.auth import DEMO_USERS, build_search_filter
+    from src.models import SearchRequest
+    from src.search.service import search_documents
+
+    user = DEMO_USERS[EVAL_ROLE]
+    security_filter = build_search_filter(user)
+
+    def search(mode: str, query: str, top: int) -> list[dict]:
+        request = SearchRequest(query=query, search_mode=mode, top=top)
+        response = search_documents(request, user, security_filter, search_client=search_client)
+        return [result.model_dump() for result in response.results]
+
+    return search
+
+
+def matches_passage(hit: dict, expected: dict) -> bool:
+    if hit.get("abaer_citation") != expected["abaerCitation"]:
+        return False
+    if expected.get("page") is not None and hit.get("page_number") != expected["page"]:
+        return False
+    paragraphs = expected.get("paragraphs")
+    if paragraphs and hit.get("paragraph_number") is not None:
+        return int(hit["paragraph_number"]) in paragraphs
+    return True
+
+
+def score_query(hits: list[dict], expected: list[dict]) -> dict:
+    """Recall@k and reciprocal rank at document and passage level for one query."""
+    citations = {e["abaerCitation"] for e in expected}
+    levels = {
+        "document": [hit.get("abaer_citation") in citations for hit in hits],
+        "passage": [any(matches_passage(hit, e) for e in expected) for hit in hits],
+    }
+
+    scores = {}
+    for level, relevant in levels.items():
+        first = next((rank for rank, is_relevant in enumerate(relevant, 1) if is_relevant), None)
+        recall = {}
+        for k in CUTOFFS:
+            top_hits = hits[:k]
+            if level == "document":
+                found = len(citations & {hit.get("abaer_citation") for hit in top_hits})
+                recall[k] = found / len(citations)
+            else:
+                found = sum(1 for e in expected if any(matches_passage(hit, e) for hit in top_hits))
+                recall[k] = found / len(expected)
+        scores[level] = {"recall": recall, "rr": 1 / first if first else 0.0, "first_rank": first}
+    return scores
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1] if ordered else 0.0
+
+
+def evaluate_mode(search: Search, mode: str, queries: list[dict], top: int, repeat: int = 1) -> dict:
+    """Metrics, latency and per-query ranks for one search mode."""
+    latencies = []
+    per_query = []
+    for query in queries:
+        hits = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = search(mode, query["query"], top)
+            latencies.append((time.perf_counter() - started) * 1000)
+        scores = score_query(hits, query["expected"])
+        per_query.append({
+            "id": query["id"],
+            "category": query.get("category"),
+            "document_rank": scores["document"]["first_rank"],
+            "passage_rank": scores["passage"]["first_rank"],
+            "scores": scores,
+        })
+
+    def mean(level: str, key: str, k: Optional[int] = None) -> float:
+        values = [q["scores"][level][key][k] if k else q["scores"][level][key] for q in per_query]
+        return round(statistics.fmean(values), 4)
+
+    return {
+        "metrics": {
+            level: {
+                **{f"recall@{k}": mean(level, "recall", k) for k in CUTOFFS},
+                "mrr": mean(level, "rr"),
+            }
+            for level in LEVELS
+        },
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "mean": round(statistics.fmean(latencies), 1),
+        },
+        "misses": [q["id"] for q in per_query if q["document_rank"] is None],
+        "queries": [{k: v for k, v in q.items() if k != "scores"} for q in per_query],
+    }
@@ -0,0 +1,241 @@
+"""Search index schema and versioning for Hearings AI.
+
+Indexes are versioned (hearings-index-v1, hearings-index-v2, ...) and the API
+queries an index alias named settings.azure_search_index. A new version is
+built alongside the live one and the alias is repointed once it validates,
+so schema changes never take search offline (see scripts/reindex.py).
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import (
+    AzureOpenAIVectorizer,
+    AzureOpenAIVectorizerParameters,
+    HnswAlgorithmConfiguration,
+    SearchAlias,
+    SearchField,
+    SearchFieldDataType,
+    SearchIndex,
+    SemanticConfiguration,
+    SemanticField,
+    SemanticPrioritizedFields,
+    SemanticSearch,
+    VectorSearch,
+    VectorSearchProfile,
+)
+
+HNSW_PARAMETER_KEYS = ("m", "efConstruction", "efSearch", "metric")
+
+
+def versioned_index_name(alias: str, version: int) -> str:
+    return f"{alias}-v{version}"
+
+
+def index_version(alias: str, index_name: str) -> Optional[int]:
+    """Version number of a versioned index belonging to alias, else None."""
+    match = re.fullmatch(rf"{re.escape(alias)}-v(\d+)", index_name)
+    return int(match.group(1)) if match else None
+
+
+def load_hnsw_parameters(path: Path) -> dict:
+    """HNSW algorithm parameters from a JSON file (infra/search-hnsw.json)."""
+    parameters = json.loads(path.read_text())
+    return {key: parameters[key] for key in HNSW_PARAMETER_KEYS}
+
+
+def build_index_schema(
+    name: str,
+    hnsw_parameters: dict,
+    openai_endpoint: str,
+    embedding_deployment: str,
+    dimensions: int = 3072,
+) -> SearchIndex:
+    """Create the search index schema per COPILOT.md specification."""
+
+    fields = [
+        # Key field
+        SearchField(
+            name="id",
+            type=SearchFieldDataType.String,
+            key=True,
+            filterable=True,
+        ),
+        # Document reference
+        SearchField(
+            name="documentId",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            sortable=True,
+        ),
+        # structured fields
+        SearchField(
+            name="proceedingId",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+            sortable=True,
+        ),
+        SearchField(
+            name="documentType",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+        ),
+        SearchField(
+            name="abaerCitation",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            searchable=True,
+        ),
+        # Chunk metadata
+        SearchField(
+            name="chunkId",
+            type=SearchFieldDataType.Int32,
+            sortable=True,
+        ),
+        SearchField(
+            name="pageNumber",
+            type=SearchFieldDataType.Int32,
+            filterable=True,
+            sortable=True,
+        ),
+        SearchField(
+            name="paragraphNumber",
+            type=SearchFieldDataType.String,
+            filterable=True,
+        ),
+        SearchField(
+            name="sectionTitle",
+            type=SearchFieldDataType.String,
+            searchable=True,
+        ),
+        # Content fields
+        SearchField(
+            name="content",
+            type=SearchFieldDataType.String,
+            searchable=True,
+            analyzer_name="en.microsoft",
+        ),
+        SearchField(
+            name="contentVector",
+            type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+            searchable=True,
+            vector_search_dimensions=dimensions,
+            vector_search_profile_name="hnsw-profile",
+        ),
+        # Access control
+        SearchField(
+            name="confidentialityLevel",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+        ),
+        # Parties (for filtering by party name)
+        SearchField(
+            name="parties",
+            type=SearchFieldDataType.Collection(SearchFieldDataType.String),
+            filterable=True,
+            facetable=True,
+        ),
+        # Regulatory citations
+        SearchField(
+            name="regulatoryCitations",
+            type=SearchFieldDataType.Collection(SearchFieldDataType.String),
+            filterable=True,
+            facetable=True,
+        ),
+        # Document metadata
+        SearchField(
+            name="title",
+            type=SearchFieldDataType.String,
+            searchable=True,
+        ),
+        SearchField(
+            name="sourceUrl",
+            type=SearchFieldDataType.String,
+        ),
+    ]
+
+    # Vector search configuration
+    vector_search = VectorSearch(
+        algorithms=[
+            HnswAlgorithmConfiguration(
+                name="hnsw",
+                parameters=hnsw_parameters,
+            ),
+        ],
+        profiles=[
+            VectorSearchProfile(
+                name="hnsw-profile",
+                algorithm_configuration_name="hnsw",
+                vectorizer_name="openai-vectorizer",
+            ),
+        ],
+        vectorizers=[
+            AzureOpenAIVectorizer(
+                vectorizer_name="openai-vectorizer",
+                parameters=AzureOpenAIVectorizerParameters(
+                    resource_url=openai_endpoint,
+                    deployment_name=embedding_deployment,
+                    model_name="text-embedding-3-large",
+                ),
+            ),
+        ],
+    )
+
+    # Semantic search configuration
+    semantic_search = SemanticSearch(
+        configurations=[
+            SemanticConfiguration(
+                name="semantic-config",
+                prioritized_fields=SemanticPrioritizedFields(
+                    title_field=SemanticField(field_name="sectionTitle"),
+                    content_fields=[SemanticField(field_name="content")],
+                    keywords_fields=[
+                        SemanticField(field_name="regulatoryCitations"),
+                        SemanticField(field_name="parties"),
+                    ],
+                ),
+            ),
+        ],
+    )
+
+    return SearchIndex(
+        name=name,
+        fields=fields,
+        vector_search=vector_search,
+        semantic_search=semantic_search,
+    )
+
+
+def list_versions(index_client: SearchIndexClient, alias: str) -> list[tuple[int, str]]:
+    """(version, index name) of every versioned index for alias, oldest first."""
+    versions = []
+    for name in index_client.list_index_names():
+        version = index_version(alias, name)
+        if version is not None:
+            versions.append((version, name))
+    return sorted(versions)
+
+
+def next_index_name(index_client: SearchIndexClient, alias: str) -> str:
+    versions = list_versions(index_client, alias)
+    return versioned_index_name(alias, versions[-1][0] + 1 if versions else 1)
+
+
+def alias_target(index_client: SearchIndexClient, alias: str) -> Optional[str]:
+    """Index the alias points at, or None if there is no such alias."""
+    try:
+        return index_client.get_alias(alias).indexes[0]
+    except ResourceNotFoundError:
+        return None
+
+
+def point_alias(index_client: SearchIndexClient, alias: str, index_name: str) -> None:
+    """Atomically switch the alias (and every client querying it) to index_name."""
+    index_client.create_or_update_alias(SearchAlias(name=alias, indexes=[index_name]))
@@ -91,6 +91,7 @@ def search_documents(
     request: SearchRequest,
     user_claims: UserClaims,
     security_filter: Optional[str],
+    search_client: Optional[SearchClient] = None,
 ) -> SearchResponse:
     """Execute hybrid search against Azure AI Search.
     
@@ -99,8 +100,11 @@ def search_documents(
     - Keyword search for exact terms (citations, names)
     - Faceting for structured filtering
     - Role-based security filtering
+
+    search_client defaults to the configured index; pass one to query
+    another index (e.g. a new version before it goes live).
     """
-    search_client = get_search_client()
+    search_client = search_client or get_search_client()
     
     # Build combined filter
     filters = []
@@ -157,7 +161,7 @@ def search_documents(
         "filter": final_filter,
         "top": request.top,
         "select": [
-            "id", "documentId", "proceedingId", "documentType", "abaerCitation",
+            "id", "documentId", "chunkId", "proceedingId", "documentType", "abaerCitation",
             "content", "pageNumber", "paragraphNumber", "sectionTitle",
             "confidentialityLevel", "parties", "regulatoryCitations", "title",
         ],
@@ -213,6 +217,7 @@ def search_documents(
         
         search_results.append(SearchResult(
             document_id=result.get("documentId", result["id"]),
+            chunk_id=result.get("chunkId"),
             title=raw_title,
             abaer_citation=result.get("abaerCitation"),
             snippet=highlight_snippet(result.get("content", "")),
@@ -0,0 +1,63 @@
+"""The chat deployment used by document understanding.
+
+Every call is admitted by the process-wide TokenRateLimiter first: the
+reservation covers the prompt and max_tokens, and what the completion did
+not use is returned afterwards.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import tiktoken
+
+from src.config import settings
+from src.understanding.ratelimit import TokenRateLimiter, get_rate_limiter
+
+TOKENIZER = tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    return len(TOKENIZER.encode(text))
+
+
+@dataclass
+class ChatResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class ChatModel:
+    """A chat deployment behind a token-rate limiter."""
+
+    def __init__(self, openai_client: Any, deployment: str, limiter: TokenRateLimiter) -> None:
+        self.openai_client = openai_client
+        self.deployment = deployment
+        self.limiter = limiter
+
+    async def complete(self, system_prompt: str, user_prompt: str, max_tokens: int, **kwargs: Any) -> ChatResult:
+        """One deterministic (temperature 0) completion; kwargs are passed to the API (e.g. response_format)."""
+        reserved = count_tokens(system_prompt) + count_tokens(user_prompt) + max_tokens
+        await self.limiter.acquire(reserved)
+        response = await self.openai_client.chat.completions.create(
+            model=self.deployment,
+            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            max_tokens=max_tokens,
+            temperature=0,
+            **kwargs,
+        )
+        result = ChatResult(text=(response.choices[0].message.content or "").strip())
+        if response.usage:
+            self.limiter.refund(reserved - response.usage.total_tokens)
+            result.prompt_tokens = response.usage.prompt_tokens
+            result.completion_tokens = response.usage.completion_tokens
+        return result
+
+
+@lru_cache()
+def get_chat_model() -> ChatModel:
+    """Get the AZURE_OPENAI_DEPLOYMENT_CHAT model (cached singleton)."""
+    from src.clients import get_async_openai_client
+
+    return ChatModel(get_async_openai_client(), settings.azure_openai_deployment_chat, get_rate_limiter())
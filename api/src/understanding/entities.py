@@ -0,0 +1,507 @@
+"""Rules-first entity extraction for Hearings AI.
+
+Most entities in hearing documents have regular forms: legislation and
+directive references, Alberta legal land descriptions, well identifiers and
+dates. Each form has its own rule, skipped for paragraphs that lack its
+trigger text, and what no rule claimed is scanned for capitalized name
+phrases. Those are classified by gazetteer lookup (gazetteer.py plus
+ENTITY_GAZETTEER_PATH) and by their head words (Ltd., First Nation, River,
+County...). A chunk takes well under a millisecond, so the pipeline stores
+every document's entities in its metadata record at ingestion.
+
+Name phrases the rules cannot classify are kept as unclassified. When a
+request asks for entities, the most frequent of them are sent to the chat
+deployment in one call, and its labels are cached per phrase.
+"""
+
+import asyncio
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from src.config import settings
+from src.models import ExtractedCitation, ExtractedEntities
+from src.understanding.chat import ChatModel, get_chat_model
+from src.understanding.gazetteer import GAZETTEER
+from src.understanding.summarize import SummaryCache, content_hash, get_summary_cache
+
+CATEGORIES = ("locations", "organizations", "well_identifiers", "dates", "regulations")
+UNCLASSIFIED = "unclassified"
+
+# Record field names (camelCase, like the rest of the metadata record)
+RECORD_FIELDS = {
+    "locations": "locations",
+    "organizations": "organizations",
+    "well_identifiers": "wellIdentifiers",
+    "dates": "dates",
+    "regulations": "regulations",
+    UNCLASSIFIED: "unclassified",
+}
+
+MAX_ENTITIES = 50  # Per category in a response, most frequent first
+MAX_UNCLASSIFIED = 200  # Unclassified phrases kept per document
+MAX_CLASSIFIED_PHRASES = 100  # Unclassified phrases sent to the chat deployment per request
+MIN_PHRASE_COUNT = 2  # Occurrences before an unclassified phrase is worth classifying
+CONTEXT_CHARS = 240
+
+# Bump when CLASSIFY_PROMPT changes, so cached labels from older prompts are not reused
+PROMPT_VERSION = "1"
+# Bump when the rules change, so stored results from older rules are not reused
+RULES_VERSION = "2"
+
+CLASSIFY_PROMPT = (
+    "Classify each name, taken from an Alberta Energy Regulator hearing document, as \"location\", "
+    "\"organization\" or \"other\". Reply with a JSON object mapping every name, exactly as given, to its class."
+)
+LABEL_CATEGORIES = {"location": "locations", "organization": "organizations"}
+
+MONTHS = {
+    name: number for number, name in enumerate(
+        ("January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+         "November", "December"),
+        start=1,
+    )
+}
+MONTH = "|".join(MONTHS)
+SECTION = r"\d+(?:\.\d+)*(?:\(\w{1,4}\))*"
+SECTION_WORD = r"(?:[Ss]ection|s\.)\s*"
+# A capitalized word, and the gap allowed between words of a name (not a paragraph break)
+NAME_WORD = r"[A-Z][\w’'&-]*\.?"
+NAME_GAP = r"(?:[ \t]+|[ \t]*\n[ \t]*)"
+NAME_CONNECTORS = r"(?:of|and|the|de|du|des|la|le|for)"
+
+LEADING_WORDS = {
+    "The", "A", "An", "And", "For", "By", "In", "On", "At", "To", "Of", "This", "That", "These", "Those", "Its",
+    "Their", "His", "Her", "Our", "If", "As", "When", "While", "Under", "With", "From", "Further", "However",
+    "Although", "Because", "Since", "Where", "Both", "Each", "Any", "All", "No", "Not", "Per", "Mr.", "Ms.",
+    "Mrs.", "Dr.",
+}
+ORGANIZATION_HEADS = {
+    "Ltd", "Ltd.", "Inc", "Inc.", "Corp", "Corp.", "Corporation", "Limited", "LP", "LLP", "ULC", "Partnership",
+    "Company", "Association", "Council", "Society", "Nation", "Nations", "Band", "Agency", "Commission",
+    "Ministry", "Department", "Board", "Regulator", "Institute", "University", "Foundation", "Cooperative",
+    "Group", "Authority",
+}
+LEGISLATION_HEADS = {"Act", "Regulation", "Regulations", "Code"}
+LOCATION_HEADS = {
+    "River", "Lake", "Creek", "County", "Park", "Pass", "Range", "Valley", "Hills", "Hill", "Mountain",
+    "Mountains", "Reservoir", "Delta", "Watershed", "Basin", "Island", "Bay", "Falls", "Springs", "Reserve",
+    "Settlement", "Slough", "Coulee", "Plateau",
+}
+LOCATION_PREFIXES = (
+    "County of ", "Municipal District of ", "Town of ", "City of ", "Village of ", "Summer Village of ",
+    "Hamlet of ", "Municipality of ", "Regional Municipality of ",
+)
+# Title-case words of headings and procedural terms; phrases made only of these are not names
+COMMON_WORDS = {
+    "Panel", "Decision", "Hearing", "Commissioner", "Commissioners", "Application", "Applications", "Project",
+    "Report", "Statement", "Statements", "Concern", "Concerns", "Section", "Sections", "Appendix", "Table",
+    "Figure", "Condition", "Conditions", "Issue", "Issues", "Background", "Introduction", "Conclusion",
+    "Conclusions", "Order", "Notice", "Evidence", "Approval", "Approvals", "Licence", "Licences", "Rules",
+    "Practice", "Information", "Request", "Requests", "Response", "Reasons", "Summary", "Regulatory", "Appeal",
+    "Review", "Plan", "Program", "Assessment", "Environmental", "Impact", "Impacts", "Analysis", "Findings",
+    "Submission", "Submissions", "Argument", "Arguments", "Participation", "Participants", "Views", "Chair",
+    "Presiding", "Member", "Members", "Staff", "Counsel", "Witness", "Witnesses", "Exhibit", "Exhibits",
+    "Transcript", "Volume", "Page", "Part", "Schedule", "Map", "Phase", "Stage", "Area", "Areas", "Operations",
+    "Facility", "Facilities", "Well", "Wells", "Pipeline", "Pipelines", "Water", "Land", "Lands", "Public",
+    "Interest", "Directive", "Manual", "Act", "Regulation", "Regulations", "Energy", "Alberta", "No", "Holder",
+    "File",
+}
+
+
+class EntityMatch(NamedTuple):
+    category: str  # One of CATEGORIES, UNCLASSIFIED or "paragraph"
+    value: str
+    start: int
+    end: int
+
+
+@lru_cache()
+def get_gazetteer() -> dict[str, tuple[str, str]]:
+    """Names as written -> (category, canonical name), built in plus ENTITY_GAZETTEER_PATH."""
+    gazetteer = {
+        name: (category, canonical) for category, names in GAZETTEER.items() for name, canonical in names.items()
+    }
+    if settings.entity_gazetteer_path:
+        extra = json.loads(Path(settings.entity_gazetteer_path).read_text(encoding="utf-8"))
+        for category, names in extra.items():
+            if category not in GAZETTEER:
+                raise ValueError(f"Unknown gazetteer category: {category}")
+            gazetteer.update({name: (category, canonical) for name, canonical in names.items()})
+    return gazetteer
+
+
+@lru_cache()
+def extractor_version() -> str:
+    """Hash of everything besides a document's text that entity results depend on: rules, prompt and gazetteer."""
+    gazetteer = json.dumps(sorted(get_gazetteer().items()), ensure_ascii=False)
+    return content_hash(RULES_VERSION, PROMPT_VERSION, str(settings.understanding_entity_model), gazetteer)
+
+
+@lru_cache()
+def _acts_pattern() -> str:
+    legislation = [name for name, (category, _) in get_gazetteer().items() if category == "regulations"]
+    return "|".join(re.escape(name) for name in sorted(legislation, key=len, reverse=True))
+
+
+def _bounded(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is not part of a longer word."""
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+def _iso_date(year: str, month: str, day: Optional[str] = None) -> Optional[str]:
+    if day is None:
+        return f"{year}-{MONTHS[month]:02d}"
+    try:
+        return date(int(year), MONTHS[month], int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _regulation(kind: str, number: str, section: Optional[str]) -> str:
+    reference = f"{kind} {int(number):03d}"
+    return f"{reference} s. {section}" if section else reference
+
+
+def _act(name: str, section: Optional[str]) -> str:
+    act = get_gazetteer()[name][1]
+    return f"{act} s. {section}" if section else act
+
+
+# Rules return (category, value, start) for a match, or None to drop it. Each pattern starts with a
+# literal or a character class so the regex engine can skip ahead to candidate offsets, and rules
+# whose gate (a cheap search for text every match contains) finds nothing in a paragraph are not run.
+RuleMatch = Optional[tuple[str, str, int]]
+Rule = Callable[[str, re.Match], RuleMatch]
+
+
+def _paragraph_rule(text: str, match: re.Match) -> RuleMatch:
+    return "paragraph", match.group(1), match.start()
+
+
+def _section_of_rule(text: str, match: re.Match) -> RuleMatch:
+    section, act, kind, number = match.groups()
+    if not _bounded(text, match.start(), match.end()):
+        return None
+    value = _act(act, section) if act else _regulation(kind, number, section)
+    return "regulations", value, match.start()
+
+
+def _act_rule(text: str, match: re.Match) -> RuleMatch:
+    if not _bounded(text, match.start(), match.end()):
+        return None
+    return "regulations", _act(match.group(1), match.group(2)), match.start()
+
+
+def _directive_rule(text: str, match: re.Match) -> RuleMatch:
+    if not _bounded(text, match.start(), match.end()):
+        return None
+    return "regulations", _regulation(*match.groups()), match.start()
+
+
+def _well_rule(text: str, match: re.Match) -> RuleMatch:
+    if not _bounded(text, match.start(), match.end()):
+        return None
+    return "well_identifiers", " ".join(match.group(0).split()), match.start()
+
+
+def _township_rule(text: str, match: re.Match) -> RuleMatch:
+    start = match.start()
+    prefix = LLD_LONG_PREFIX.search(text, max(0, start - 80), start)
+    if prefix:
+        start = prefix.start()
+    value = " ".join(text[start:match.end()].split())
+    value = re.sub(r"West of the ([4-6])(?:th)? Meridian", r"W\1M", value)
+    value = re.sub(r"Legal Subdivision (?:\(LSD\) )?", "LSD ", value)
+    return "locations", value, start
+
+
+def _lld_rule(text: str, match: re.Match) -> RuleMatch:
+    start = match.start()
+    prefix = LLD_PREFIX.search(text, max(0, start - 12), start)
+    if prefix:
+        start = prefix.start()
+    if not _bounded(text, start, match.end()):
+        return None
+    return "locations", " ".join(text[start:match.end()].upper().split()), start
+
+
+def _month_rule(text: str, match: re.Match) -> RuleMatch:
+    month, day, year = match.groups()
+    start = match.start()
+    if not _bounded(text, start, match.end()):
+        return None
+    before = DAY_BEFORE.search(text, max(0, start - 4), start) if day is None else None
+    if before and _bounded(text, before.start(), before.end() - 1):
+        day, start = before.group(1), before.start()
+    value = _iso_date(year, month, day)
+    return ("dates", value, start) if value else None
+
+
+def _iso_date_rule(text: str, match: re.Match) -> RuleMatch:
+    if not _bounded(text, match.start(), match.end()):
+        return None
+    try:
+        return "dates", date.fromisoformat(match.group(0)).isoformat(), match.start()
+    except ValueError:
+        return None
+
+
+LLD_LONG_PREFIX = re.compile(
+    r"(?:(?:Legal\s+Subdivision\s+(?:\(LSD\)\s+)?|LSD\s+)\d{1,2},?\s+)?"
+    r"Sections?\s+\d{1,2}(?:\s+and\s+\d{1,2})?,?\s+$"
+)
+LLD_PREFIX = re.compile(r"(?:[NS][EW]\s*(?:1/4\s*)?|LSD\s*)?\d{1,2}-$|(?:[NS][EW]\s*(?:1/4\s*)?|LSD\s*)$")
+DAY_BEFORE = re.compile(r"(\d{1,2})\s+$")
+
+
+@lru_cache()
+def get_rules() -> list[tuple[Optional[re.Pattern], re.Pattern, Rule]]:
+    """(gate or None, pattern, rule) for every entity rule, in priority order."""
+    acts = _acts_pattern()
+    section = rf"{SECTION_WORD}({SECTION})"
+    return [
+        (None, re.compile(r"\[(\d{1,4})\]"), _paragraph_rule),
+        # "section 80 of the Water Act", "s. 9 of Directive 023"
+        (re.compile(" of "), re.compile(
+            rf"[Ss](?:ection|\.)\s*({SECTION})\s+of\s+(?:the\s+)?(?:AER\s+|Alberta\s+Energy\s+Regulator\s+)?"
+            rf"(?:({acts})|(Directive|Manual)\s+(\d{{1,3}}))"
+        ), _section_of_rule),
+        # "REDA s. 34", "EPEA, section 2", "Water Act"
+        (None, re.compile(rf"({acts})(?:,?\s+{section})?"), _act_rule),
+        # "Directive 056 s. 2.1", "Manual 012"
+        (None, re.compile(rf"(Directive|Manual)\s+(\d{{1,3}})\b(?:,?\s+{section})?"), _directive_rule),
+        # Unique well identifiers (100/01-03-075-09W4/02), well licences and monitoring wells (MW-3, GW-A)
+        (re.compile("/"), re.compile(r"1\d{2}/\d{2}-\d{2}-\d{3}-\d{2}\s?W[4-6]M?/\d{2}"), _well_rule),
+        (re.compile("icen"), re.compile(r"[Ww]ell\s+[Ll]icen[cs]e\s+(?:[Nn]o\.\s*)?\d{7}"), _well_rule),
+        (None, re.compile(r"(?:MW|GW|OW|BH|TW|PW|WW|DW)(?:-?\d{1,4}[A-Z]?|-[A-Z])"), _well_rule),
+        # "Legal Subdivision (LSD) 10, Section 25, Township 85, Range 10, West of the 4th Meridian"
+        (re.compile("Township"), re.compile(
+            r"Township\s+\d{1,3},?\s+Range\s+\d{1,2},?\s+(?:West\s+of\s+the\s+[4-6](?:th)?\s+Meridian|W[4-6]M?\b)"
+        ), _township_rule),
+        # "SE 14-55-22 W4", "10-25-085-10W4M", "8-18-31-1-W5M"
+        (re.compile(r"W\s?[4-6]"), re.compile(r"\d{1,2}-\d{1,3}-\d{1,2}-?\s?W\s?[4-6]M?\b"), _lld_rule),
+        # "July 16, 2019", "16 July 2019", "July 2019"
+        (None, re.compile(rf"({MONTH})(?:\s+(\d{{1,2}}),?)?\s+((?:19|20)\d{{2}})"), _month_rule),
+        (re.compile(r"-[01]\d-[0-3]\d"), re.compile(r"(?:19|20)\d{2}-[01]\d-[0-3]\d"), _iso_date_rule),
+    ]
+
+
+@lru_cache(maxsize=100_000)
+def classify_name(phrase: str) -> Optional[tuple[str, str]]:
+    """(category, name) for a capitalized phrase: UNCLASSIFIED if it looks like a name the rules cannot place,
+    None if it is not a name."""
+    words = phrase.replace("- ", "-").split()
+    # A name ends at a full stop ("Athabasca River. The"), unless the word is a title or "Ltd." and the like
+    for i, word in enumerate(words[:-1]):
+        if word.endswith(".") and word not in LEADING_WORDS and word not in ORGANIZATION_HEADS:
+            del words[i + 1:]
+            break
+    while words and (words[0] in LEADING_WORDS or words[0].islower()):
+        words.pop(0)
+    if not words:
+        return None
+    if words[-1].endswith(".") and words[-1] not in ORGANIZATION_HEADS:
+        words[-1] = words[-1].rstrip(".")
+    if words[-1].endswith(("’s", "'s")):
+        words[-1] = words[-1][:-2]
+    name = " ".join(words)
+
+    gazetteer = get_gazetteer()
+    # The longest gazetteer name ending the phrase ("Existing Water Act" -> "Water Act")
+    for i in range(len(words)):
+        entry = gazetteer.get(" ".join(words[i:]))
+        if entry:
+            return entry
+    if words[-1] in LEGISLATION_HEADS and len(words) > 1:
+        return "regulations", name
+    if words[-1] in ORGANIZATION_HEADS and len(words) > 1:
+        return "organizations", name
+    if (words[-1] in LOCATION_HEADS and len(words) > 1) or name.startswith(LOCATION_PREFIXES):
+        return "locations", name
+    if len(words) > 1 and not all(word.title() in COMMON_WORDS for word in words if word[0].isupper()):
+        return UNCLASSIFIED, name
+    return None
+
+
+# A full stop and whitespace, or a blank line, not after "s.", "ss.", "No." and the like
+SENTENCE_END = re.compile(
+    r"(?<!\bs)(?<!\bss)(?<!\bNo)(?<!\bNos)(?<!\bSec)(?<!\bsubs)(?<!\bpara)(?<!\bart)\.\s+|\n\s*\n",
+    re.IGNORECASE,
+)
+
+NAME = re.compile(rf"{NAME_WORD}(?:{NAME_GAP}(?:{NAME_CONNECTORS}{NAME_GAP})?{NAME_WORD})*")
+
+
+def scan_entities(text: str) -> list[EntityMatch]:
+    """Entities and paragraph numbers in text, in order of appearance.
+
+    Rule matches win over overlapping ones found later in priority order, and
+    over the part of any capitalized name phrase they overlap.
+    """
+    matches: list[EntityMatch] = []
+    taken = bytearray(len(text))
+    for gate, pattern, rule in get_rules():
+        if gate is not None and not gate.search(text):
+            continue
+        for match in pattern.finditer(text):
+            found = rule(text, match)
+            if found is None or any(taken[found[2]:match.end()]):
+                continue
+            category, value, start = found
+            taken[start:match.end()] = b"\x01" * (match.end() - start)
+            matches.append(EntityMatch(category, value, start, match.end()))
+
+    # Names are found in the text left over by the rules, so a phrase running
+    # into a rule match ("MW-3. The Athabasca River") keeps its own part
+    masked, pos = [], 0
+    for match in sorted(matches, key=lambda match: match.start):
+        masked += [text[pos:match.start], "\0" * (match.end - match.start)]
+        pos = match.end
+    for match in NAME.finditer("".join(masked) + text[pos:] if masked else text):
+        start, end = match.span()
+        if start and (text[start - 1].isalnum() or text[start - 1] in "’'-"):
+            continue
+        classified = classify_name(match.group(0))
+        if classified:
+            matches.append(EntityMatch(classified[0], classified[1], start, end))
+
+    matches.sort(key=lambda match: match.start)
+    return matches
+
+
+def sentence_at(text: str, start: int, end: int) -> str:
+    """The sentence of text around [start, end), whitespace collapsed and shortened to CONTEXT_CHARS.
+
+    The sentence always covers [start, end), and full stops of section and
+    number abbreviations ("s. 80", "No. 3") do not end it.
+    """
+    left = 0
+    for boundary in SENTENCE_END.finditer(text, 0, start):
+        left = boundary.end()
+    right = next(SENTENCE_END.finditer(text, max(end - 1, start)), None)
+    sentence = " ".join(text[left:right.start() + 1 if right else len(text)].split())
+    return sentence if len(sentence) <= CONTEXT_CHARS else sentence[:CONTEXT_CHARS - 1].rstrip() + "…"
+
+
+def citation_type(reference: str) -> str:
+    if reference.startswith("Directive"):
+        return "directive"
+    if reference.startswith("Manual"):
+        return "manual"
+    return "legislation"
+
+
+@dataclass
+class DocumentEntities:
+    """Entities of one document, counted, with the paragraphs and context of each regulatory citation."""
+
+    counts: dict[str, Counter] = field(default_factory=lambda: {c: Counter() for c in (*CATEGORIES, UNCLASSIFIED)})
+    citation_paragraphs: dict[str, dict[str, None]] = field(default_factory=dict)
+    citation_context: dict[str, str] = field(default_factory=dict)
+
+    def unclassified_phrases(self) -> list[str]:
+        """The unclassified phrases worth asking the chat deployment about, most frequent first."""
+        return [
+            phrase for phrase, count in self.counts[UNCLASSIFIED].most_common(MAX_CLASSIFIED_PHRASES)
+            if count >= MIN_PHRASE_COUNT
+        ]
+
+    def apply_labels(self, labels: dict[str, str]) -> None:
+        """Move unclassified phrases into the categories the chat deployment gave them."""
+        for phrase, label in labels.items():
+            category = LABEL_CATEGORIES.get(label)
+            if category and phrase in self.counts[UNCLASSIFIED]:
+                self.counts[category][phrase] += self.counts[UNCLASSIFIED].pop(phrase)
+
+    def to_model(self) -> ExtractedEntities:
+        top = {category: [value for value, _ in self.counts[category].most_common(MAX_ENTITIES)]
+               for category in CATEGORIES}
+        top["dates"].sort()
+        return ExtractedEntities(**top)
+
+    def to_record(self) -> dict:
+        """Entities for the document's metadata record, most frequent first."""
+        return {
+            RECORD_FIELDS[category]: [value for value, _ in counts.most_common(MAX_UNCLASSIFIED)]
+            for category, counts in self.counts.items()
+        }
+
+    def citations(self) -> list[ExtractedCitation]:
+        """Regulatory citations, most cited first, with the paragraphs citing them."""
+        return [
+            ExtractedCitation(
+                type=citation_type(reference),
+                reference=reference,
+                context=self.citation_context.get(reference),
+                paragraphs=[f"[{paragraph}]" for paragraph in self.citation_paragraphs.get(reference, {})],
+            )
+            for reference, _ in self.counts["regulations"].most_common()
+        ]
+
+
+def document_entities(paragraphs: list[str]) -> DocumentEntities:
+    """Extract the entities of a document from its paragraphs, in order, with the rules alone."""
+    entities = DocumentEntities()
+    paragraph_number: Optional[str] = None
+    for text in paragraphs:
+        for match in scan_entities(text):
+            if match.category == "paragraph":
+                paragraph_number = match.value
+                continue
+            entities.counts[match.category][match.value] += 1
+            if match.category == "regulations":
+                if paragraph_number:
+                    entities.citation_paragraphs.setdefault(match.value, {})[paragraph_number] = None
+                if match.value not in entities.citation_context:
+                    entities.citation_context[match.value] = sentence_at(text, match.start, match.end)
+    return entities
+
+
+class EntityClassifier:
+    """Labels name phrases the rules cannot classify with one chat call, caching labels per phrase."""
+
+    def __init__(self, model: ChatModel, cache: Optional[SummaryCache] = None) -> None:
+        self.model = model
+        self.cache = cache
+
+    def _key(self, phrase: str) -> str:
+        return content_hash(PROMPT_VERSION, self.model.deployment, "classifyEntity", phrase)
+
+    async def classify(self, phrases: list[str]) -> dict[str, str]:
+        """Label per phrase ("location", "organization" or "other"); phrases the model skipped are left out."""
+        if not phrases:
+            return {}
+        keys = {phrase: self._key(phrase) for phrase in phrases}
+        cached = await asyncio.to_thread(self.cache.get_many, list(keys.values())) if self.cache else {}
+        labels = {phrase: cached[key] for phrase, key in keys.items() if key in cached}
+        missing = [phrase for phrase in phrases if phrase not in labels]
+        if not missing:
+            return labels
+
+        result = await self.model.complete(
+            CLASSIFY_PROMPT, "\n".join(missing), max_tokens=16 * len(missing) + 16,
+            response_format={"type": "json_object"},
+        )
+        try:
+            answer = json.loads(result.text)
+        except ValueError:
+            answer = {}
+        found = {
+            phrase: label for phrase, label in answer.items()
+            if phrase in keys and label in ("location", "organization", "other")
+        } if isinstance(answer, dict) else {}
+        if self.cache and found:
+            await asyncio.to_thread(self.cache.put_many, {keys[phrase]: label for phrase, label in found.items()})
+        return {**labels, **found}
+
+
+@lru_cache()
+def get_entity_classifier() -> EntityClassifier:
+    """Get the classifier for the chat deployment (cached singleton)."""
+    return EntityClassifier(get_chat_model(), get_summary_cache())
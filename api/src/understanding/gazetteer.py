@@ -0,0 +1,120 @@
+"""Built-in gazetteer for entity extraction.
+
+Names that recur across Alberta Energy Regulator proceedings, keyed by
+category. Each entry maps a name (or abbreviation) as written in documents
+to the canonical form reported. Deployments can add names with a JSON file
+of the same shape (ENTITY_GAZETTEER_PATH).
+"""
+
+LEGISLATION = {
+    "Responsible Energy Development Act": "REDA",
+    "REDA": "REDA",
+    "Environmental Protection and Enhancement Act": "EPEA",
+    "EPEA": "EPEA",
+    "Oil and Gas Conservation Act": "OGCA",
+    "OGCA": "OGCA",
+    "Oil Sands Conservation Act": "OSCA",
+    "OSCA": "OSCA",
+    "Coal Conservation Act": "Coal Conservation Act",
+    "Pipeline Act": "Pipeline Act",
+    "Water Act": "Water Act",
+    "Public Lands Act": "Public Lands Act",
+    "Mines and Minerals Act": "Mines and Minerals Act",
+    "Alberta Land Stewardship Act": "Alberta Land Stewardship Act",
+    "ALSA": "Alberta Land Stewardship Act",
+    "Geothermal Resource Development Act": "Geothermal Resource Development Act",
+    "Mineral Resource Development Act": "Mineral Resource Development Act",
+    "Administrative Procedures and Jurisdiction Act": "Administrative Procedures and Jurisdiction Act",
+    "Impact Assessment Act": "Impact Assessment Act",
+    "Rules of Practice": "Rules of Practice",
+    "Oil and Gas Conservation Rules": "Oil and Gas Conservation Rules",
+    "OGCR": "Oil and Gas Conservation Rules",
+    "Oil Sands Conservation Rules": "Oil Sands Conservation Rules",
+    "Pipeline Rules": "Pipeline Rules",
+    "Coal Conservation Rules": "Coal Conservation Rules",
+    "Conservation and Reclamation Regulation": "Conservation and Reclamation Regulation",
+    "Water (Ministerial) Regulation": "Water (Ministerial) Regulation",
+}
+
+ORGANIZATIONS = {
+    "Alberta Energy Regulator": "Alberta Energy Regulator",
+    "AER": "Alberta Energy Regulator",
+    "Energy Resources Conservation Board": "Energy Resources Conservation Board",
+    "ERCB": "Energy Resources Conservation Board",
+    "Alberta Utilities Commission": "Alberta Utilities Commission",
+    "AUC": "Alberta Utilities Commission",
+    "Canada Energy Regulator": "Canada Energy Regulator",
+    "CER": "Canada Energy Regulator",
+    "Alberta Environment and Parks": "Alberta Environment and Parks",
+    "AEP": "Alberta Environment and Parks",
+    "Alberta Environment and Protected Areas": "Alberta Environment and Protected Areas",
+    "Alberta Energy": "Alberta Energy",
+    "Government of Alberta": "Government of Alberta",
+    "Land Compensation Board": "Land Compensation Board",
+    "Surface Rights Board": "Surface Rights Board",
+    "Orphan Well Association": "Orphan Well Association",
+    "OWA": "Orphan Well Association",
+    "Impact Assessment Agency of Canada": "Impact Assessment Agency of Canada",
+    "Environment and Climate Change Canada": "Environment and Climate Change Canada",
+    "Fisheries and Oceans Canada": "Fisheries and Oceans Canada",
+    "Alberta Wilderness Association": "Alberta Wilderness Association",
+    "Oldman Watershed Council": "Oldman Watershed Council",
+    "Canadian Association of Petroleum Producers": "Canadian Association of Petroleum Producers",
+    "CAPP": "Canadian Association of Petroleum Producers",
+    "Métis Nation of Alberta": "Métis Nation of Alberta",
+}
+
+LOCATIONS = {
+    "Fort McMurray": "Fort McMurray",
+    "Fort McKay": "Fort McKay",
+    "Fort Chipewyan": "Fort Chipewyan",
+    "Fort Saskatchewan": "Fort Saskatchewan",
+    "Regional Municipality of Wood Buffalo": "Regional Municipality of Wood Buffalo",
+    "Wood Buffalo National Park": "Wood Buffalo National Park",
+    "Peace-Athabasca Delta": "Peace-Athabasca Delta",
+    "Lake Athabasca": "Lake Athabasca",
+    "Athabasca": "Athabasca",
+    "Calgary": "Calgary",
+    "Edmonton": "Edmonton",
+    "Red Deer": "Red Deer",
+    "Lethbridge": "Lethbridge",
+    "Medicine Hat": "Medicine Hat",
+    "Grande Prairie": "Grande Prairie",
+    "Grande Cache": "Grande Cache",
+    "Peace River": "Peace River",
+    "Cold Lake": "Cold Lake",
+    "Lac La Biche": "Lac La Biche",
+    "Bonnyville": "Bonnyville",
+    "Drayton Valley": "Drayton Valley",
+    "Whitecourt": "Whitecourt",
+    "Slave Lake": "Slave Lake",
+    "High Level": "High Level",
+    "Hinton": "Hinton",
+    "Canmore": "Canmore",
+    "Pincher Creek": "Pincher Creek",
+    "Crowsnest Pass": "Crowsnest Pass",
+    "Livingstone Range": "Livingstone Range",
+    "Rocky Mountain House": "Rocky Mountain House",
+    "Sundre": "Sundre",
+    "Airdrie": "Airdrie",
+    "Okotoks": "Okotoks",
+    "Strathmore": "Strathmore",
+    "Lloydminster": "Lloydminster",
+    "Vermilion": "Vermilion",
+    "Wainwright": "Wainwright",
+    "Camrose": "Camrose",
+    "Leduc": "Leduc",
+    "Sherwood Park": "Sherwood Park",
+    "Strathcona County": "Strathcona County",
+    "Sturgeon County": "Sturgeon County",
+    "Parkland County": "Parkland County",
+    "Clearwater County": "Clearwater County",
+    "Mountain View County": "Mountain View County",
+    "Yellowhead County": "Yellowhead County",
+}
+
+GAZETTEER = {
+    "regulations": LEGISLATION,
+    "organizations": ORGANIZATIONS,
+    "locations": LOCATIONS,
+}
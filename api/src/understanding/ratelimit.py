@@ -0,0 +1,60 @@
+"""Token-rate limiting for Azure OpenAI chat deployments.
+
+A chat deployment has a tokens-per-minute quota shared by every request the
+process serves; going over it only buys 429s and retry backoff. Callers
+reserve their estimated tokens (prompt plus max_tokens) before each call and
+return what the completion did not use afterwards.
+"""
+
+import asyncio
+import threading
+import time
+from functools import lru_cache
+
+from src.config import settings
+
+
+class TokenRateLimiter:
+    """Token bucket refilled at tokens_per_minute, holding at most one minute of tokens.
+
+    Reservations are taken in arrival order and may overdraw the bucket; each
+    caller then sleeps until the bucket has refilled past its reservation, so
+    no lock is held while waiting and one limiter can serve several event loops.
+    """
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens: int) -> float:
+        """Take tokens from the bucket; returns the seconds to wait before using them."""
+        with self.lock:
+            self._refill()
+            self.tokens -= min(tokens, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, tokens: int) -> None:
+        """Return reserved tokens a call did not use."""
+        if tokens > 0:
+            with self.lock:
+                self._refill()
+                self.tokens = min(self.capacity, self.tokens + tokens)
+
+    async def acquire(self, tokens: int) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@lru_cache()
+def get_rate_limiter() -> TokenRateLimiter:
+    """Get the limiter for the chat deployment's UNDERSTANDING_TOKENS_PER_MINUTE quota (cached singleton)."""
+    return TokenRateLimiter(settings.understanding_tokens_per_minute)
@@ -0,0 +1,86 @@
+"""Stored document-understanding results.
+
+Each operation's result for a document is kept in the documents container
+next to the document's metadata record (same proceedingId partition, see
+src.documents.layout), so a repeat request costs one point read per
+operation instead of chat calls.
+A stored result carries the stamp it was computed under: a hash of the
+document's chunk texts, the chat deployment and the operation's version
+(prompts and summary sizes, or entity rules and gazetteer). A result whose
+stamp no longer matches is recomputed and overwritten, so re-chunked text,
+a new deployment or a prompt change invalidate it without any bookkeeping.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+import structlog
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
+
+from src.config import settings
+from src.documents.layout import result_id
+
+logger = structlog.get_logger()
+
+RECORD_TYPE = "understandingResult"
+
+
+class ResultStamp(NamedTuple):
+    """What a stored result was computed from; any change invalidates it."""
+
+    content_hash: str
+    deployment: str
+    version: str
+
+
+class UnderstandingResultStore:
+    """Understanding results in the Cosmos DB documents container.
+
+    Cosmos DB errors are logged and treated as misses: a request then costs
+    chat calls, but does not fail.
+    """
+
+    def __init__(self, container: Any) -> None:
+        self.container = container
+
+    def get(self, proceeding_id: str, document_id: str, operation: str, stamp: ResultStamp) -> Optional[dict]:
+        """An operation's stored result, if its stamp still matches."""
+        try:
+            item = self.container.read_item(result_id(document_id, operation), partition_key=proceeding_id)
+        except CosmosResourceNotFoundError:
+            return None
+        except CosmosHttpResponseError as e:
+            logger.warning("Failed to read understanding result", document_id=document_id, error=str(e))
+            return None
+        if (item.get("contentHash"), item.get("deployment"), item.get("version")) != stamp:
+            return None
+        return item["result"]
+
+    def put(self, proceeding_id: str, document_id: str, operation: str, stamp: ResultStamp, result: dict) -> None:
+        """Store an operation's result, replacing any computed under an older stamp."""
+        try:
+            self.container.upsert_item({
+                "id": result_id(document_id, operation),
+                "proceedingId": proceeding_id,
+                "recordType": RECORD_TYPE,
+                "documentId": document_id,
+                "operation": operation,
+                "contentHash": stamp.content_hash,
+                "deployment": stamp.deployment,
+                "version": stamp.version,
+                "result": result,
+                "createdAt": datetime.utcnow().isoformat(),
+            })
+        except CosmosHttpResponseError as e:
+            logger.warning("Failed to save understanding result", document_id=document_id, error=str(e))
+
+
+@lru_cache()
+def get_result_store() -> Optional[UnderstandingResultStore]:
+    """Get the result store, or None if UNDERSTANDING_RESULT_CACHE is off (cached singleton)."""
+    if not settings.understanding_result_cache:
+        return None
+    from src.clients import get_cosmos_container
+
+    return UnderstandingResultStore(get_cosmos_container())
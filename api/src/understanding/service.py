@@ -0,0 +1,179 @@
+"""Document understanding operations for /api/documents/understand (and its event stream)."""
+
+import asyncio
+import re
+from dataclasses import asdict
+from typing import AsyncIterator, Callable, Optional
+
+import structlog
+
+from src.config import settings
+from src.evidence.store import ContextWindow
+from src.models import DocumentUnderstandingResponse
+from src.understanding.chat import get_chat_model
+from src.understanding.entities import DocumentEntities, document_entities, extractor_version, get_entity_classifier
+from src.understanding.results import ResultStamp, get_result_store
+from src.understanding.summarize import SectionSummary, content_hash, document_paragraphs, get_summarizer
+
+logger = structlog.get_logger()
+
+# Operations answered by a map-reduce run over the whole document
+SUMMARY_OPERATIONS = ("summarize", "extractKeyPoints")
+
+# Operations answered by the rules-first entity extractor
+ENTITY_OPERATIONS = ("extractEntities", "extractRegulatoryCitations")
+
+SUPPORTED_OPERATIONS = {*SUMMARY_OPERATIONS, *ENTITY_OPERATIONS}
+
+MAX_KEY_POINTS = 10
+
+LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+# Progress callback: ("section" | "result", event data)
+EventCallback = Callable[[str, dict], None]
+
+HEARTBEAT_SECONDS = 15.0
+FINISHED = object()
+
+
+def parse_key_points(text: str) -> list[str]:
+    """Key points from a model's one-per-line list, without list markers or duplicates."""
+    points = [LIST_MARKER.sub("", line).strip() for line in text.splitlines()]
+    return list(dict.fromkeys(point for point in points if point))[:MAX_KEY_POINTS]
+
+
+async def extract_entities(paragraphs: list[str], classify: bool) -> DocumentEntities:
+    """Entities of a document; with classify, the chat deployment labels the names the rules could not."""
+    entities = await asyncio.to_thread(document_entities, paragraphs)
+    if classify and settings.understanding_entity_model:
+        entities.apply_labels(await get_entity_classifier().classify(entities.unclassified_phrases()))
+    return entities
+
+
+async def run_operations(
+    window: ContextWindow, operations: list[str], on_event: Optional[EventCallback] = None
+) -> dict[str, dict]:
+    """Run operations over a whole document (all its chunks, in order); response fields per operation.
+
+    on_event is called with ("section", ...) for each intermediate summary and
+    ("result", ...) as each operation finishes.
+    """
+    paragraphs = document_paragraphs([chunk.content for chunk in window.chunks])
+    results: dict[str, dict] = {}
+
+    def finish(operation: str, response: DocumentUnderstandingResponse) -> None:
+        results[operation] = response.model_dump(mode="json", exclude_none=True)
+        if on_event:
+            on_event("result", {"operation": operation, **results[operation]})
+
+    async def summarize(operation: str) -> None:
+        def report(section: SectionSummary) -> None:
+            on_event("section", {"operation": operation, **asdict(section)})
+
+        run = await get_summarizer().summarize(operation, paragraphs, on_section=report if on_event else None)
+        logger.info(
+            "Document understanding operation complete",
+            document_id=window.document.document_id,
+            operation=operation,
+            levels=run.levels,
+            calls=run.calls,
+            cached=run.cached,
+            prompt_tokens=run.prompt_tokens,
+            completion_tokens=run.completion_tokens,
+        )
+        if operation == "summarize":
+            finish(operation, DocumentUnderstandingResponse(summary=run.text))
+        else:
+            finish(operation, DocumentUnderstandingResponse(key_points=parse_key_points(run.text)))
+
+    async def extract() -> None:
+        entities = await extract_entities(paragraphs, "extractEntities" in operations)
+        if "extractEntities" in operations:
+            finish("extractEntities", DocumentUnderstandingResponse(entities=entities.to_model()))
+        if "extractRegulatoryCitations" in operations:
+            finish(
+                "extractRegulatoryCitations", DocumentUnderstandingResponse(regulatory_citations=entities.citations())
+            )
+
+    await asyncio.gather(
+        *(summarize(operation) for operation in SUMMARY_OPERATIONS if operation in operations),
+        *([extract()] if any(operation in operations for operation in ENTITY_OPERATIONS) else []),
+    )
+    return results
+
+
+def result_stamps(window: ContextWindow, operations: list[str]) -> dict[str, ResultStamp]:
+    """The stamp each operation's stored result must carry to be reused for this document."""
+    text_hash = content_hash(*(chunk.content for chunk in window.chunks))
+    deployment = get_chat_model().deployment
+    versions = {operation: get_summarizer().version for operation in SUMMARY_OPERATIONS}
+    versions.update({operation: extractor_version() for operation in ENTITY_OPERATIONS})
+    return {operation: ResultStamp(text_hash, deployment, versions[operation]) for operation in operations}
+
+
+async def analyze_document(
+    window: ContextWindow, operations: list[str], on_event: Optional[EventCallback] = None
+) -> DocumentUnderstandingResponse:
+    """Answer the requested operations for a document, from stored results where they are still valid.
+
+    on_event receives run_operations' events, and a ("result", ...) event for
+    each stored result.
+    """
+    document = window.document
+    operations = list(dict.fromkeys(operations))
+    store = get_result_store()
+    stamps = result_stamps(window, operations)
+    key = (document.proceeding_id, document.document_id)
+    stored = {}
+    if store:
+        found = await asyncio.gather(*(
+            asyncio.to_thread(store.get, *key, operation, stamps[operation]) for operation in operations
+        ))
+        stored = {operation: result for operation, result in zip(operations, found) if result is not None}
+    if on_event:
+        for operation, result in stored.items():
+            on_event("result", {"operation": operation, **result})
+    missing = [operation for operation in operations if operation not in stored]
+    computed = await run_operations(window, missing, on_event) if missing else {}
+    if store and computed:
+        await asyncio.gather(*(
+            asyncio.to_thread(store.put, *key, operation, stamps[operation], result)
+            for operation, result in computed.items()
+        ))
+    logger.info(
+        "Document understanding request complete",
+        document_id=document.document_id,
+        stored=sorted(stored),
+        computed=sorted(computed),
+    )
+
+    fields = {name: value for operation in operations for name, value in {**stored, **computed}[operation].items()}
+    return DocumentUnderstandingResponse.model_validate(fields)
+
+
+async def stream_document(window: ContextWindow, operations: list[str]) -> AsyncIterator[Optional[tuple[str, dict]]]:
+    """analyze_document as (event, data) pairs as they happen, ending with ("done", whole response).
+
+    Yields None when nothing happened for HEARTBEAT_SECONDS, so callers can
+    keep the connection alive and notice when the client has gone. Closing
+    the iterator early cancels the analysis, and with it any chat calls in
+    flight.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(analyze_document(window, operations, lambda *event: events.put_nowait(event)))
+    task.add_done_callback(lambda _: events.put_nowait(FINISHED))
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event is FINISHED:
+                break
+            yield event
+        yield "done", task.result().model_dump(mode="json")
+    finally:
+        if not task.done():
+            task.cancel()
+            logger.info("Document understanding cancelled", document_id=window.document.document_id)
@@ -0,0 +1,303 @@
+"""Map-reduce summarization of whole documents.
+
+Decisions run to hundreds of pages, far beyond one model context. A document's
+paragraphs are grouped into sections of at most UNDERSTANDING_SECTION_TOKENS,
+every section is summarized concurrently (the map), and the summaries are
+grouped and combined the same way, level by level, until one remains (the
+reduce). With the default sizes a 200-page decision takes one map level and
+one reduce call, so it finishes in about the time of two chat calls; calls
+are bounded by the deployment's token rate (TokenRateLimiter) and a
+per-request concurrency limit.
+
+Group boundaries are content defined: a group ends after a text whose hash
+falls below a threshold (once past a minimum size), not at fixed offsets, so
+an edit only changes the groups around it. Every call's result is cached
+under LOCAL_DATA_DIR by a hash of its inputs, so re-summarizing a revised
+document only calls the model for the changed sections and the reductions
+above them.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.config import settings
+from src.understanding.chat import ChatModel, count_tokens, get_chat_model
+
+# Bump when the prompts change, so cached summaries from older prompts are not reused
+PROMPT_VERSION = "1"
+
+# A group is at least this share of its token budget before a content-defined boundary may end it
+MIN_GROUP_FRACTION = 0.25
+
+# Expected tokens between content-defined boundaries past the minimum, as a share of the budget
+BOUNDARY_SPACING = 0.5
+
+PROMPTS = {
+    "summarize": (
+        "You summarize part of an Alberta Energy Regulator hearing document. Write a concise, factual summary "
+        "of the passage: the parties, the issues, the evidence, and any findings, conditions or directions. "
+        "Keep paragraph numbers such as [45] where the passage gives them. Do not add anything the passage "
+        "does not say.",
+        "You combine summaries of consecutive parts of an Alberta Energy Regulator hearing document into one "
+        "concise summary, in document order. Keep the parties, issues, findings, decision and conditions, and "
+        "paragraph numbers such as [45]. Drop repetition. Do not add anything the summaries do not say.",
+    ),
+    "extractKeyPoints": (
+        "List the key points of this part of an Alberta Energy Regulator hearing document: findings, "
+        "decisions, conditions, commitments and disputed issues. Write one point per line, starting with "
+        "\"- \", and keep paragraph numbers such as [45]. Do not add anything the passage does not say.",
+        "Merge these key point lists from consecutive parts of an Alberta Energy Regulator hearing document "
+        "into one list of the most important points, in document order. Combine duplicates, write one point "
+        "per line starting with \"- \", and keep paragraph numbers such as [45].",
+    ),
+}
+
+
+def chunk_overlap(previous: str, text: str) -> int:
+    """Length of the start of text that repeats the end of previous: the paragraphs or sentences chunking carries over.
+
+    The overlap starts at a word in previous and ends at whitespace (or the end) of text.
+    """
+    if not text or not previous:
+        return 0
+    first_word = text.split(None, 1)[0]
+    start = previous.find(first_word)
+    # Earliest match first: the longest overlap
+    while start != -1:
+        length = len(previous) - start
+        if (
+            (start == 0 or previous[start - 1].isspace())
+            and text.startswith(previous[start:])
+            and (length == len(text) or text[length].isspace())
+        ):
+            return length
+        start = previous.find(first_word, start + 1)
+    return 0
+
+
+def document_paragraphs(chunk_texts: list[str]) -> list[str]:
+    """Paragraphs of a document's chunk texts in order, without the overlap repeated between chunks."""
+    paragraphs: list[str] = []
+    previous = ""
+    for text in chunk_texts:
+        rest = text[chunk_overlap(previous, text):]
+        paragraphs.extend(paragraph.strip() for paragraph in rest.split("\n\n") if paragraph.strip())
+        previous = text
+    return paragraphs
+
+
+def content_hash(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def group_texts(texts: list[str], max_tokens: int) -> list[list[str]]:
+    """Split consecutive texts into groups of at most max_tokens (or one text) at content-defined boundaries.
+
+    A text ends its group with probability proportional to its size, decided
+    by its hash, so boundaries resynchronize right after an edited text.
+    """
+    groups: list[list[str]] = []
+    current: list[str] = []
+    tokens = 0
+    spacing = max_tokens * BOUNDARY_SPACING
+    for text in texts:
+        size = count_tokens(text)
+        if current and tokens + size > max_tokens:
+            groups.append(current)
+            current, tokens = [], 0
+        current.append(text)
+        tokens += size
+        if tokens >= max_tokens * MIN_GROUP_FRACTION and int(content_hash(text)[:16], 16) / 2**64 < size / spacing:
+            groups.append(current)
+            current, tokens = [], 0
+    if current:
+        groups.append(current)
+    return groups
+
+
+class SummaryCache:
+    """Map and reduce results (and other model outputs) in a local SQLite database, keyed by a hash of their inputs.
+
+    Safe to share between API processes on one machine; delete the file to clear it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at REAL NOT NULL) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT key, summary FROM summaries WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+        return dict(rows)
+
+    def put_many(self, summaries: dict[str, str]) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)",
+                [(key, summary, now) for key, summary in summaries.items()],
+            )
+
+
+@dataclass
+class SectionSummary:
+    """One summary of an intermediate level (level 0 is the map), reported as soon as it is available."""
+
+    level: int
+    index: int
+    sections: int  # Summaries in the level
+    text: str
+    cached: bool
+
+
+@dataclass
+class SummaryRun:
+    """The result of one map-reduce run, with its cost."""
+
+    text: str
+    levels: int = 0
+    calls: int = 0
+    cached: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class MapReduceSummarizer:
+    """Summarizes documents of any length with a chat deployment (see module docstring)."""
+
+    def __init__(
+        self,
+        model: ChatModel,
+        cache: Optional[SummaryCache] = None,
+        concurrency: int = 32,
+        section_tokens: int = 8000,
+        reduce_tokens: int = 24_000,
+        section_summary_tokens: int = 400,
+        final_tokens: int = 1000,
+    ) -> None:
+        self.model = model
+        self.cache = cache
+        self.concurrency = concurrency
+        self.section_tokens = section_tokens
+        self.reduce_tokens = reduce_tokens
+        self.section_summary_tokens = section_summary_tokens
+        self.final_tokens = final_tokens
+
+    @property
+    def version(self) -> str:
+        """Hash of everything besides a document's text that its summaries depend on: prompts and sizes."""
+        sizes = (self.section_tokens, self.reduce_tokens, self.section_summary_tokens, self.final_tokens)
+        return content_hash(PROMPT_VERSION, *map(str, sizes))
+
+    def _key(self, operation: str, stage: str, max_tokens: int, texts: list[str]) -> str:
+        return content_hash(PROMPT_VERSION, self.model.deployment, operation, stage, str(max_tokens), *texts)
+
+    async def _complete(
+        self, system_prompt: str, texts: list[str], max_tokens: int, run: SummaryRun, semaphore: asyncio.Semaphore
+    ) -> str:
+        async with semaphore:
+            result = await self.model.complete(system_prompt, "\n\n".join(texts), max_tokens)
+        run.calls += 1
+        run.prompt_tokens += result.prompt_tokens
+        run.completion_tokens += result.completion_tokens
+        return result.text
+
+    async def summarize(
+        self, operation: str, paragraphs: list[str], on_section: Optional[Callable[[SectionSummary], None]] = None
+    ) -> SummaryRun:
+        """Run an operation of PROMPTS ("summarize" or "extractKeyPoints") over a document's paragraphs.
+
+        on_section is called with each summary below the final one, cached
+        summaries first, the others as their calls complete.
+        """
+        map_prompt, reduce_prompt = PROMPTS[operation]
+        run = SummaryRun(text="")
+        if not paragraphs:
+            return run
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        texts = paragraphs
+        groups = group_texts(texts, self.section_tokens)
+        while True:
+            stage = "map" if run.levels == 0 else "reduce"
+            max_tokens = self.final_tokens if len(groups) == 1 else self.section_summary_tokens
+            keys = [self._key(operation, stage, max_tokens, group) for group in groups]
+            cached = await asyncio.to_thread(self.cache.get_many, keys) if self.cache else {}
+            report = on_section if len(groups) > 1 else None
+            if report:
+                for index, key in enumerate(keys):
+                    if key in cached:
+                        report(SectionSummary(run.levels, index, len(keys), cached[key], cached=True))
+
+            prompt = map_prompt if stage == "map" else reduce_prompt
+            computed: dict[str, str] = {}
+
+            async def complete(index: int, key: str, group: list[str]) -> None:
+                computed[key] = await self._complete(prompt, group, max_tokens, run, semaphore)
+                if report:
+                    report(SectionSummary(run.levels, index, len(keys), computed[key], cached=False))
+
+            try:
+                # A failed call cancels the others instead of leaving them running (and spending tokens) unseen
+                async with asyncio.TaskGroup() as tasks:
+                    for index, (key, group) in enumerate(zip(keys, groups)):
+                        if key not in cached:
+                            tasks.create_task(complete(index, key, group))
+            except ExceptionGroup as errors:
+                raise errors.exceptions[0]
+            finally:
+                # Also when cancelled: summaries already paid for are reused by the next request
+                if self.cache and computed:
+                    await asyncio.to_thread(self.cache.put_many, computed)
+            run.cached += len(cached)
+            run.levels += 1
+
+            texts = [cached[key] if key in cached else computed[key] for key in keys]
+            if len(texts) == 1:
+                run.text = texts[0]
+                return run
+            groups = group_texts(texts, self.reduce_tokens)
+            if len(groups) == len(texts):
+                # Summaries too long to share a reduce call: combine them in pairs so the tree still narrows
+                groups = [texts[i:i + 2] for i in range(0, len(texts), 2)]
+
+
+@lru_cache()
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Get the summary cache, or None if UNDERSTANDING_SUMMARY_CACHE is off (cached singleton)."""
+    if not settings.understanding_summary_cache:
+        return None
+    return SummaryCache(Path(settings.local_data_dir) / "summaries.db")
+
+
+@lru_cache()
+def get_summarizer() -> MapReduceSummarizer:
+    """Get the summarizer for the chat deployment, configured by the UNDERSTANDING_* settings (cached singleton)."""
+    return MapReduceSummarizer(
+        model=get_chat_model(),
+        cache=get_summary_cache(),
+        concurrency=settings.understanding_concurrency,
+        section_tokens=settings.understanding_section_tokens,
+        reduce_tokens=settings.understanding_reduce_tokens,
+        section_summary_tokens=settings.understanding_section_summary_tokens,
+        final_tokens=settings.understanding_final_tokens,
+    )
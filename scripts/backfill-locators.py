@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""One-time backfill of document locators for Hearings AI.
+
+Requests that only carry a document ID find its metadata record through the
+document's locator (api/src/documents/layout.py). Records written before
+locators existed have none, so those documents read as not found. This
+script queries the documents container once for every metadata record and
+writes the missing locators:
+
+    python backfill-locators.py --dry-run
+    python backfill-locators.py
+
+Existing locators are left alone. Until it has run, COSMOS_LOCATOR_FALLBACK=true
+makes the API query for an unlocated record on a locator miss instead.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+from dotenv import load_dotenv
+
+# Load environment before src.config reads it
+load_dotenv(ROOT / "api" / ".env")
+
+from src.clients import get_cosmos_container
+from src.config import settings
+from src.documents.layout import LOCATOR_RECORD_TYPE, locator_item
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Count the missing locators without writing them")
+    args = parser.parse_args()
+
+    print(f"Cosmos endpoint: {settings.cosmos_endpoint} (container {settings.cosmos_container})")
+    container = get_cosmos_container()
+    located, records = set(), []
+    for item in container.query_items(query="SELECT * FROM c", enable_cross_partition_query=True):
+        if item.get("recordType") == LOCATOR_RECORD_TYPE:
+            located.add(item["documentId"])
+        elif "processingStatus" in item:
+            records.append(item)
+
+    missing = [record for record in records if record["id"] not in located]
+    print(f"Metadata records: {len(records)}, without a locator: {len(missing)}")
+    if args.dry_run:
+        return
+    for record in missing:
+        container.upsert_item(locator_item(record))
+    print(f"Locators written: {len(missing)}")
+
+
+if __name__ == "__main__":
+    main()
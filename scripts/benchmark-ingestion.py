@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Ingestion benchmark for Hearings AI.
+
+Runs the full ingestion pipeline over test-data/documents against the local
+service stand-ins (src/local) and reports per-stage throughput, peak RSS and
+wall time as JSON:
+
+    python benchmark-ingestion.py --output ../benchmarks/baseline.json
+    python benchmark-ingestion.py --latency-ms 40 --throttle-rate 0.05 --output ../benchmarks/change.json
+    python benchmark-ingestion.py --compare ../benchmarks/baseline.json ../benchmarks/change.json
+
+Stage rates are work divided by the time spent in that stage, summed over
+documents: pages/sec extracted, tokens/sec chunked, chunks/sec embedded and
+search documents/sec uploaded. The extraction cache is off unless
+--extraction-cache is given, so extraction is measured from the PDFs.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+BENCHMARK_VERSION = 1
+
+# Metric name -> whether higher is better
+METRICS = {
+    "wall_seconds": False,
+    "documents_per_second": True,
+    "peak_rss_mb": False,
+    "stages.extract.pages_per_second": True,
+    "stages.chunk.tokens_per_second": True,
+    "stages.embed.chunks_per_second": True,
+    "stages.index.documents_per_second": True,
+    "stages.metadata.records_per_second": True,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=Path, default=ROOT / "test-data" / "documents", help="PDF directory")
+    parser.add_argument("--limit", type=int, help="Only the first N PDFs (sorted by name)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Documents processed concurrently")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--extraction-cache", action="store_true", help="Read and fill the extraction cache")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per service call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Injected latency jitter")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of calls throttled with 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of calls failing with 503")
+    parser.add_argument("--seed", type=int, default=0, help="Fault injection seed")
+    parser.add_argument(
+        "--compare", nargs=2, type=Path, metavar=("BASE", "NEW"), help="Compare two result files instead of running"
+    )
+    parser.add_argument("--threshold", type=float, default=5.0, help="Percent change flagged as a regression")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="Exit with status 1 if --compare finds a regression"
+    )
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Point settings at the local stand-ins before src.config is imported."""
+    os.environ["USE_LOCAL_SERVICES"] = "true"
+    os.environ["EXTRACTION_CACHE"] = "true" if args.extraction_cache else "false"
+    os.environ["LOCAL_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LOCAL_LATENCY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["LOCAL_THROTTLE_RATE"] = str(args.throttle_rate)
+    os.environ["LOCAL_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ["LOCAL_SEED"] = str(args.seed)
+    for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_SEARCH_ENDPOINT", "COSMOS_ENDPOINT"):
+        os.environ.setdefault(name, "https://local.invalid")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process and its reaped children (extraction workers)."""
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return (usage + children) / scale
+
+
+def rate(amount: float, seconds: float) -> float:
+    return round(amount / seconds, 2) if seconds else 0.0
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    import structlog
+
+    # Keep stdout for the JSON results
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+        logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
+    )
+
+    from src.config import settings
+    from src.documents.extraction import get_extraction_pool, resolve_backend
+    from src.documents.pipeline import (
+        CosmosMetadataWriter,
+        EmbeddingDeduplicator,
+        compute_document_id,
+        pipeline_clients,
+        process_document,
+    )
+    from src.local.clients import SERVICES, get_fault_injector
+
+    pdf_files = sorted(args.documents.glob("*.pdf"))[:args.limit]
+    if not pdf_files:
+        raise SystemExit(f"No PDFs found in {args.documents}")
+
+    results = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started = time.perf_counter()
+
+    async with pipeline_clients() as (openai_client, search_client, container):
+        metadata_writer = CosmosMetadataWriter(container)
+        deduplicator = EmbeddingDeduplicator()
+
+        async def ingest(pdf_path: Path) -> None:
+            async with semaphore:
+                metadata = {"filename": pdf_path.name, "abaer_citation": pdf_path.stem}
+                try:
+                    result = await process_document(
+                        pdf_path,
+                        compute_document_id(pdf_path.read_bytes()),
+                        metadata,
+                        openai_client,
+                        search_client,
+                        metadata_writer,
+                        deduplicator=deduplicator,
+                    )
+                except Exception as e:
+                    result = {"filename": pdf_path.name, "status": "failed", "reason": str(e)}
+                results.append(result)
+                print(f"  {'✓' if result['status'] == 'success' else '✗'} {pdf_path.name}", file=sys.stderr)
+
+        await asyncio.gather(*(ingest(pdf_path) for pdf_path in pdf_files))
+
+        metadata_started = time.perf_counter()
+        await metadata_writer.flush()
+        metadata_seconds = time.perf_counter() - metadata_started
+
+    wall_seconds = time.perf_counter() - started
+    if get_extraction_pool.cache_info().currsize:
+        # Reap the extraction workers so their peak RSS is counted
+        get_extraction_pool().shutdown()
+
+    success = [r for r in results if r["status"] == "success"]
+    stage_seconds = {
+        stage: sum(r["timings"][stage] for r in success) for stage in ("extract", "chunk", "embed", "index")
+    }
+    pages = sum(r["pages"] for r in success)
+    tokens = sum(r["tokens"] for r in success)
+    chunks = sum(r["chunks"] for r in success)
+    indexed = sum(r["indexed"] for r in success)
+
+    return {
+        "benchmark": "ingestion",
+        "version": BENCHMARK_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "documents": len(pdf_files),
+            "document_bytes": sum(p.stat().st_size for p in pdf_files),
+            "concurrency": args.concurrency,
+            "chunk_size_tokens": settings.chunk_size_tokens,
+            "chunk_overlap_tokens": settings.chunk_overlap_tokens,
+            "extraction_backend": resolve_backend(),
+            "extraction_workers": settings.extraction_workers,
+            "extraction_cache": settings.extraction_cache,
+            "boilerplate_stripping": settings.boilerplate_stripping,
+            "embedding_dimensions": settings.local_embedding_dimensions,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "throttle_rate": args.throttle_rate,
+            "failure_rate": args.failure_rate,
+            "seed": args.seed,
+        },
+        "results": {
+            "succeeded": len(success),
+            "failed": [{"filename": r["filename"], "reason": r.get("reason")} for r in results if r not in success],
+            "pages": pages,
+            "tokens": tokens,
+            "chunks": chunks,
+            "unique_chunks": deduplicator.unique,
+            "embedded_texts": deduplicator.embedded,
+            "indexed": indexed,
+            "metadata_records": metadata_writer.written,
+            "metadata_request_charge": round(metadata_writer.request_charge, 2),
+            "injected_faults": {
+                service: {
+                    "calls": get_fault_injector(service).calls,
+                    "throttled": get_fault_injector(service).throttled,
+                    "failed": get_fault_injector(service).failed,
+                }
+                for service in SERVICES
+            },
+        },
+        "metrics": {
+            "wall_seconds": round(wall_seconds, 3),
+            "documents_per_second": rate(len(success), wall_seconds),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "stages": {
+                "extract": {"seconds": round(stage_seconds["extract"], 3),
+                            "pages_per_second": rate(pages, stage_seconds["extract"])},
+                "chunk": {"seconds": round(stage_seconds["chunk"], 3),
+                          "tokens_per_second": rate(tokens, stage_seconds["chunk"])},
+                "embed": {"seconds": round(stage_seconds["embed"], 3),
+                          "chunks_per_second": rate(chunks, stage_seconds["embed"])},
+                "index": {"seconds": round(stage_seconds["index"], 3),
+                          "documents_per_second": rate(indexed, stage_seconds["index"])},
+                "metadata": {"seconds": round(metadata_seconds, 3),
+                             "records_per_second": rate(metadata_writer.written, metadata_seconds)},
+            },
+        },
+    }
+
+
+def metric_value(run: dict, name: str) -> float:
+    value = run["metrics"]
+    for part in name.split("."):
+        value = value[part]
+    return value
+
+
+def compare(base_path: Path, new_path: Path, threshold: float) -> bool:
+    """Print a metric-by-metric comparison; returns True if any metric regressed beyond threshold."""
+    base = json.loads(base_path.read_text())
+    new = json.loads(new_path.read_text())
+
+    print(f"Base: {base_path} ({base['git_commit']}, {base['created_at']})")
+    print(f"New:  {new_path} ({new['git_commit']}, {new['created_at']})")
+    changed_config = {k: (v, new["config"].get(k)) for k, v in base["config"].items() if new["config"].get(k) != v}
+    for key, (old, current) in changed_config.items():
+        print(f"  config {key}: {old} -> {current}")
+    print()
+    print(f"{'metric':<38} {'base':>12} {'new':>12} {'change':>9}")
+
+    regressed = False
+    for name, higher_is_better in METRICS.items():
+        old, current = metric_value(base, name), metric_value(new, name)
+        change = (current - old) / old * 100 if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag = "  ▼ regression"
+            regressed = True
+        elif -worse > threshold:
+            flag = "  ▲ improvement"
+        print(f"{name:<38} {old:>12,.2f} {current:>12,.2f} {change:>+8.1f}%{flag}")
+
+    return regressed
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.compare:
+        regressed = compare(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regressed and args.fail_on_regression else 0)
+
+    configure_environment(args)
+    run = asyncio.run(run_benchmark(args))
+    output = json.dumps(run, indent=2)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Cosmos DB request-charge check for the Hearings AI API endpoints.
+
+Seeds the local stand-ins from test-data/documents, calls each endpoint
+in-process and checks the Cosmos DB operations it made against its budget:
+no queries, at most the expected point reads and writes, and at most the
+expected request units, and the expected HTTP status. Charges come from the local stand-in's RU model
+(src.local.cosmos), which follows the service's shape (about 1 RU per point
+read of a 1 KB item, several per query, more per partition a query fans out
+to) rather than its exact numbers, so a failure means an endpoint's access
+pattern changed, not that a price did:
+
+    python check-cosmos-ru.py
+    python check-cosmos-ru.py --documents 5 --output ru.json
+
+Exits with status 1 if any endpoint is over budget.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+# Sees every document and may upload them
+ROLE = "Hearing_Panel"
+
+
+@dataclass
+class Budget:
+    """What one endpoint call may cost in Cosmos DB."""
+
+    name: str
+    reads: int
+    writes: int
+    request_units: float
+    status: int = 200
+
+
+@dataclass
+class Measurement:
+    name: str
+    status: int
+    reads: int
+    writes: int
+    queries: int
+    request_units: float
+    over_budget: list[str]
+
+
+BUDGETS = [
+    Budget("search", reads=0, writes=0, request_units=0.0),
+    Budget("evidence", reads=0, writes=0, request_units=0.0),
+    Budget("proceeding overview", reads=1, writes=0, request_units=10.0),
+    Budget("understand (first)", reads=2, writes=2, request_units=40.0),
+    Budget("understand (stored)", reads=2, writes=0, request_units=10.0),
+    Budget("understand stream (stored)", reads=2, writes=0, request_units=10.0),
+    Budget("ingest upload", reads=1, writes=2, request_units=16.0),
+    Budget("ingestion status", reads=2, writes=0, request_units=5.0),
+    Budget("ingestion status (unknown)", reads=1, writes=0, request_units=2.0, status=404),
+    Budget("pages", reads=2, writes=0, request_units=5.0),
+]
+
+
+def measure(store, budget: Budget, call) -> tuple[Measurement, dict]:
+    """Call an endpoint and compare the Cosmos DB operations it made with its budget."""
+    operations, charge = store.operations.copy(), store.request_charge
+    response = call()
+    used = store.operations - operations
+    writes = used["write"] + used["patch"] + used["delete"]
+    queries = used["query"] + used["crossPartitionQuery"]
+    request_units = round(store.request_charge - charge, 2)
+
+    over_budget = []
+    if response.status_code != budget.status:
+        over_budget.append(f"HTTP {response.status_code}")
+    if queries:
+        over_budget.append(f"{queries} queries")
+    if used["read"] > budget.reads:
+        over_budget.append(f"{used['read']} reads > {budget.reads}")
+    if writes > budget.writes:
+        over_budget.append(f"{writes} writes > {budget.writes}")
+    if request_units > budget.request_units:
+        over_budget.append(f"{request_units} RU > {budget.request_units}")
+    measurement = Measurement(
+        budget.name, response.status_code, used["read"], writes, queries, request_units, over_budget
+    )
+    body = response.json() if response.headers.get("content-type") == "application/json" else {}
+    return measurement, body
+
+
+def run(pdf_files: list[Path], upload: Path) -> list[Measurement]:
+    """Seed the local stand-ins with the PDFs and measure each endpoint, uploading one more document."""
+    import asyncio
+
+    from fastapi.testclient import TestClient
+
+    from src.config import settings
+    from src.documents.layout import UNKNOWN_PROCEEDING
+    from src.local.cosmos import get_container_store
+    from src.local.seed import seed_from_documents
+    from src.main import app
+
+    print(f"Seeding local stand-ins from {len(pdf_files)} PDFs...", file=sys.stderr)
+    asyncio.run(seed_from_documents(pdf_files))
+
+    store = get_container_store(settings.cosmos_container)
+    client = TestClient(app, headers={"X-Demo-Role": ROLE})
+    budgets = {budget.name: budget for budget in BUDGETS}
+    results = []
+
+    def check(name: str, call) -> dict:
+        measurement, body = measure(store, budgets[name], call)
+        results.append(measurement)
+        return body
+
+    hits = check("search", lambda: client.post("/api/search", json={"query": "groundwater contamination", "top": 5}))
+    hit = hits["results"][0]
+    check("evidence", lambda: client.post(
+        "/api/evidence/retrieve", json={"document_id": hit["document_id"], "chunk_id": hit["chunk_id"]}
+    ))
+    # The test corpus is seeded without proceedings
+    check("proceeding overview", lambda: client.get(f"/api/proceedings/{UNKNOWN_PROCEEDING}"))
+
+    understand = {"document_id": hit["document_id"], "operations": ["extractEntities", "extractRegulatoryCitations"]}
+    check("understand (first)", lambda: client.post("/api/documents/understand", json=understand))
+    check("understand (stored)", lambda: client.post("/api/documents/understand", json=understand))
+    check("understand stream (stored)", lambda: client.post("/api/documents/understand/stream", json=understand))
+
+    metadata = {
+        "proceeding_id": "ru-check",
+        "document_type": "decision",
+        "title": upload.stem,
+        "confidentiality_level": "public",
+    }
+    ingested = check("ingest upload", lambda: client.post(
+        "/api/documents/ingest",
+        files={"file": (upload.name, upload.read_bytes(), "application/pdf")},
+        data={"metadata": json.dumps(metadata)},
+    ))
+    document_id = ingested["document_id"]
+    check("ingestion status", lambda: client.get(f"/api/documents/{document_id}/status"))
+    check("pages", lambda: client.get(f"/api/documents/{document_id}/pages", params={"first": 1}))
+    # A locator miss is a 404, not a cross-partition query
+    check("ingestion status (unknown)", lambda: client.get(f"/api/documents/{'0' * 64}/status"))
+    return results
+
+
+def print_report(results: list[Measurement]) -> None:
+    print(f"\n{'Endpoint':<28} {'HTTP':>4} {'Reads':>5} {'Writes':>6} {'Queries':>7} {'RU':>7}  Result")
+    for m in results:
+        outcome = "ok" if not m.over_budget else "OVER BUDGET: " + ", ".join(m.over_budget)
+        print(
+            f"{m.name:<28} {m.status:>4} {m.reads:>5} {m.writes:>6} {m.queries:>7} {m.request_units:>7.2f}  {outcome}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=3, help="PDFs from test-data/documents to seed")
+    parser.add_argument("--data-dir", type=Path, help="LOCAL_DATA_DIR for the run (default: a temporary directory)")
+    parser.add_argument("--output", type=Path, help="Also write the measurements as JSON")
+    args = parser.parse_args()
+
+    os.environ["USE_LOCAL_SERVICES"] = "true"
+    os.environ["LOCAL_DATA_DIR"] = str(args.data_dir or tempfile.mkdtemp(prefix="cosmos-ru-"))
+    for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_SEARCH_ENDPOINT", "COSMOS_ENDPOINT"):
+        os.environ.setdefault(name, "https://local.invalid")
+
+    *pdf_files, upload = sorted((ROOT / "test-data" / "documents").glob("*.pdf"))[:args.documents + 1]
+    results = run(pdf_files, upload)
+    print_report(results)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps([asdict(m) for m in results], indent=2) + "\n")
+    sys.exit(1 if any(m.over_budget for m in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
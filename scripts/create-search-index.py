@@ -6,9 +6,13 @@ Creates the search index schema with:
 - Vector field for semantic search (3072 dimensions for text-embedding-3-large)
 - Filterable/facetable fields for structured queries
 - Semantic configuration for ranking
+
+When AZURE_SEARCH_INDEX is an index alias (blue/green deployments, see
+reindex.py), the index behind the alias is updated in place; use
+--new-version to create the next versioned index instead.
 """
 
-import asyncio
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -18,22 +22,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
 
 from azure.identity import DefaultAzureCredential
 from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents.indexes.models import (
-    SearchIndex,
-    SearchField,
-    SearchFieldDataType,
-    VectorSearch,
-    HnswAlgorithmConfiguration,
-    VectorSearchProfile,
-    AzureOpenAIVectorizer,
-    AzureOpenAIVectorizerParameters,
-    SemanticConfiguration,
-    SemanticField,
-    SemanticPrioritizedFields,
-    SemanticSearch,
-)
 from dotenv import load_dotenv
 
+from src.search.indexes import alias_target, build_index_schema, load_hnsw_parameters, next_index_name
+
 # Load environment
 load_dotenv(Path(__file__).parent.parent / "api" / ".env")
 
@@ -42,173 +34,19 @@ INDEX_NAME = os.environ.get("AZURE_SEARCH_INDEX", "hearings-index")
 OPENAI_ENDPOINT = os.environ["AZURE_OPENAI_ENDPOINT"]
 EMBEDDING_DEPLOYMENT = os.environ.get("AZURE_OPENAI_DEPLOYMENT_EMBEDDING", "text-embedding-3-large")
 
-
-def create_index_schema() -> SearchIndex:
-    """Create the search index schema per COPILOT.md specification."""
-    
-    fields = [
-        # Key field
-        SearchField(
-            name="id",
-            type=SearchFieldDataType.String,
-            key=True,
-            filterable=True,
-        ),
-        # Document reference
-        SearchField(
-            name="documentId",
-            type=SearchFieldDataType.String,
-            filterable=True,
-            sortable=True,
-        ),
-        # structured fields
-        SearchField(
-            name="proceedingId",
-            type=SearchFieldDataType.String,
-            filterable=True,
-            facetable=True,
-            sortable=True,
-        ),
-        SearchField(
-            name="documentType",
-            type=SearchFieldDataType.String,
-            filterable=True,
-            facetable=True,
-        ),
-        SearchField(
-            name="abaerCitation",
-            type=SearchFieldDataType.String,
-            filterable=True,
-            searchable=True,
-        ),
-        # Chunk metadata
-        SearchField(
-            name="chunkId",
-            type=SearchFieldDataType.Int32,
-            sortable=True,
-        ),
-        SearchField(
-            name="pageNumber",
-            type=SearchFieldDataType.Int32,
-            filterable=True,
-            sortable=True,
-        ),
-        SearchField(
-            name="paragraphNumber",
-            type=SearchFieldDataType.String,
-            filterable=True,
-        ),
-        SearchField(
-            name="sectionTitle",
-            type=SearchFieldDataType.String,
-            searchable=True,
-        ),
-        # Content fields
-        SearchField(
-            name="content",
-            type=SearchFieldDataType.String,
-            searchable=True,
-            analyzer_name="en.microsoft",
-        ),
-        SearchField(
-            name="contentVector",
-            type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-            searchable=True,
-            vector_search_dimensions=3072,
-            vector_search_profile_name="hnsw-profile",
-        ),
-        # Access control
-        SearchField(
-            name="confidentialityLevel",
-            type=SearchFieldDataType.String,
-            filterable=True,
-            facetable=True,
-        ),
-        # Parties (for filtering by party name)
-        SearchField(
-            name="parties",
-            type=SearchFieldDataType.Collection(SearchFieldDataType.String),
-            filterable=True,
-            facetable=True,
-        ),
-        # Regulatory citations
-        SearchField(
-            name="regulatoryCitations",
-            type=SearchFieldDataType.Collection(SearchFieldDataType.String),
-            filterable=True,
-            facetable=True,
-        ),
-        # Document metadata
-        SearchField(
-            name="title",
-            type=SearchFieldDataType.String,
-            searchable=True,
-        ),
-        SearchField(
-            name="sourceUrl",
-            type=SearchFieldDataType.String,
-        ),
-    ]
-
-    # Vector search configuration
-    vector_search = VectorSearch(
-        algorithms=[
-            HnswAlgorithmConfiguration(
-                name="hnsw",
-                parameters={
-                    "m": 4,
-                    "efConstruction": 400,
-                    "efSearch": 500,
-                    "metric": "cosine",
-                },
-            ),
-        ],
-        profiles=[
-            VectorSearchProfile(
-                name="hnsw-profile",
-                algorithm_configuration_name="hnsw",
-                vectorizer_name="openai-vectorizer",
-            ),
-        ],
-        vectorizers=[
-            AzureOpenAIVectorizer(
-                vectorizer_name="openai-vectorizer",
-                parameters=AzureOpenAIVectorizerParameters(
-                    resource_url=OPENAI_ENDPOINT,
-                    deployment_name=EMBEDDING_DEPLOYMENT,
-                    model_name="text-embedding-3-large",
-                ),
-            ),
-        ],
-    )
-
-    # Semantic search configuration
-    semantic_search = SemanticSearch(
-        configurations=[
-            SemanticConfiguration(
-                name="semantic-config",
-                prioritized_fields=SemanticPrioritizedFields(
-                    title_field=SemanticField(field_name="sectionTitle"),
-                    content_fields=[SemanticField(field_name="content")],
-                    keywords_fields=[
-                        SemanticField(field_name="regulatoryCitations"),
-                        SemanticField(field_name="parties"),
-                    ],
-                ),
-            ),
-        ],
-    )
-
-    return SearchIndex(
-        name=INDEX_NAME,
-        fields=fields,
-        vector_search=vector_search,
-        semantic_search=semantic_search,
-    )
+# HNSW parameters; tune-hnsw.py --write-schema updates this file
+HNSW_PARAMETERS_FILE = Path(__file__).parent.parent / "infra" / "search-hnsw.json"
 
 
 def main():
     """Create or update the search index."""
+    parser = argparse.ArgumentParser(description="Create or update the Hearings AI search index")
+    parser.add_argument(
+        "--new-version", action="store_true", help=f"Create the next {INDEX_NAME}-vN index instead of updating"
+    )
+    parser.add_argument("--dimensions", type=int, default=3072, help="Embedding dimensions of contentVector")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Hearings AI - Search Index Creator")
     print("=" * 60)
@@ -216,14 +54,28 @@ def main():
     print(f"Index name: {INDEX_NAME}")
     print(f"OpenAI endpoint: {OPENAI_ENDPOINT}")
     print(f"Embedding deployment: {EMBEDDING_DEPLOYMENT}")
+    print(f"HNSW parameters: {load_hnsw_parameters(HNSW_PARAMETERS_FILE)}")
 
     # Create client with managed identity
     credential = DefaultAzureCredential()
     client = SearchIndexClient(endpoint=SEARCH_ENDPOINT, credential=credential)
 
+    if args.new_version:
+        target = next_index_name(client, INDEX_NAME)
+    else:
+        target = alias_target(client, INDEX_NAME) or INDEX_NAME
+    if target != INDEX_NAME:
+        print(f"Target index: {target}")
+
     # Create index schema
     print("\nCreating index schema...")
-    index = create_index_schema()
+    index = build_index_schema(
+        target,
+        load_hnsw_parameters(HNSW_PARAMETERS_FILE),
+        OPENAI_ENDPOINT,
+        EMBEDDING_DEPLOYMENT,
+        dimensions=args.dimensions,
+    )
 
     # Create or update index
     try:
@@ -237,7 +89,10 @@ def main():
         raise
 
     print("\n" + "=" * 60)
-    print("Index ready for document ingestion")
+    if args.new_version:
+        print(f"Load it, then switch {INDEX_NAME} to it: python reindex.py swap --index {target}")
+    else:
+        print("Index ready for document ingestion")
     print("=" * 60)
 
 
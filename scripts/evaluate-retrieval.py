@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Retrieval quality and latency evaluation for Hearings AI search.
+
+Runs the versioned query set in test-data/eval through search_documents for
+each search mode and reports recall@k, MRR and latency, so changes that trade
+relevance for speed (embedding dimensions, quantization, HNSW parameters,
+caching) can be judged on both:
+
+    # Local stand-ins seeded from test-data/documents
+    python evaluate-retrieval.py --output ../benchmarks/eval-local.json
+
+    # The configured Azure index, or a candidate index
+    python evaluate-retrieval.py --target azure --label baseline --output ../benchmarks/eval-baseline.json
+    python evaluate-retrieval.py --target azure --index hearings-index-m8 --label m8 \\
+        --output ../benchmarks/eval-m8.json
+
+    # A deployed API
+    python evaluate-retrieval.py --url https://<api-host> --output ../benchmarks/eval-prod.json
+
+    # Side by side
+    python evaluate-retrieval.py --compare ../benchmarks/eval-baseline.json ../benchmarks/eval-m8.json
+
+Scoring is in src/search/evaluation.py: recall and MRR at "document" level
+(right decision) and "passage" level (right page and paragraph).
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_EVAL_SET = ROOT / "test-data" / "eval" / "retrieval-v1.json"
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+from src.search.evaluation import CUTOFFS, EVAL_ROLE, SEARCH_MODES, evaluate_mode, index_search, load_eval_set
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eval-set", type=Path, default=DEFAULT_EVAL_SET, help="Query set JSON")
+    parser.add_argument("--target", choices=["local", "azure"], default="local", help="Search backend to evaluate")
+    parser.add_argument("--url", help="Evaluate a running API over HTTP instead")
+    parser.add_argument("--index", help="Search index name (default: AZURE_SEARCH_INDEX)")
+    parser.add_argument("--label", help="Name for this configuration in reports (default: the index name)")
+    parser.add_argument("--modes", default=",".join(SEARCH_MODES), help="Comma-separated search modes")
+    parser.add_argument("--top", type=int, default=max(CUTOFFS), help="Results requested per query")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query (latency is over all runs)")
+    parser.add_argument("--documents", type=Path, default=ROOT / "test-data" / "documents", help="Local: PDFs")
+    parser.add_argument("--bundle", type=Path, help="Local: seed the index from a bundle instead of PDFs")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    parser.add_argument("--compare", nargs="+", type=Path, metavar="RESULTS", help="Compare result files")
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Select the backend and index before src.config is imported."""
+    if args.index:
+        os.environ["AZURE_SEARCH_INDEX"] = args.index
+    if args.target == "local":
+        os.environ["USE_LOCAL_SERVICES"] = "true"
+        for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_SEARCH_ENDPOINT", "COSMOS_ENDPOINT"):
+            os.environ.setdefault(name, "https://local.invalid")
+
+
+def seed_local_index(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from src.local.seed import seed_from_bundle, seed_from_documents
+
+    if args.bundle:
+        return asyncio.run(seed_from_bundle(args.bundle))
+    pdf_files = sorted(args.documents.glob("*.pdf"))
+    print(f"Seeding local index from {len(pdf_files)} PDFs...", file=sys.stderr)
+    return asyncio.run(seed_from_documents(pdf_files))
+
+
+def http_search(client, mode: str, query: str, top: int) -> list[dict]:
+    response = client.post(
+        "/api/search",
+        json={"query": query, "search_mode": mode, "top": top},
+        headers={"X-Demo-Role": EVAL_ROLE},
+    )
+    response.raise_for_status()
+    return response.json()["results"]
+
+
+def run_evaluation(args: argparse.Namespace, eval_set: dict) -> dict:
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(SEARCH_MODES)
+    if unknown:
+        raise SystemExit(f"Unknown search modes: {', '.join(sorted(unknown))}")
+
+    if args.url:
+        import httpx
+
+        client = httpx.Client(base_url=args.url, timeout=60.0)
+
+        def search(mode: str, query: str, top: int) -> list[dict]:
+            return http_search(client, mode, query, top)
+
+        index_name = args.index or "remote"
+        config = {"target": args.url}
+    else:
+        configure_environment(args)
+        import logging
+
+        import structlog
+
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+            logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
+        )
+        from src.config import settings
+
+        indexed = seed_local_index(args) if args.target == "local" else None
+        search = index_search()
+        index_name = settings.azure_search_index
+        config = {
+            "target": args.target,
+            "index": index_name,
+            "embedding_deployment": settings.azure_openai_deployment_embedding,
+            "embedding_dimensions": settings.local_embedding_dimensions if args.target == "local" else None,
+            "indexed_chunks": indexed,
+        }
+
+    # Warm up clients and caches so the first query's connection setup is not timed
+    search(modes[0], eval_set["queries"][0]["query"], args.top)
+
+    results = {}
+    for mode in modes:
+        print(f"Evaluating {mode}...", file=sys.stderr)
+        results[mode] = evaluate_mode(search, mode, eval_set["queries"], args.top, args.repeat)
+
+    return {
+        "evaluation": eval_set.get("name", "retrieval"),
+        "eval_set_version": eval_set["version"],
+        "label": args.label or index_name,
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {**config, "top": args.top, "repeat": args.repeat, "queries": len(eval_set["queries"])},
+        "modes": results,
+    }
+
+
+def print_report(run: dict) -> None:
+    print(f"\n{run['label']} (eval set v{run['eval_set_version']}, {run['config']['queries']} queries)")
+    header = f"{'mode':<8} " + " ".join(f"{'doc R@' + str(k):>9}" for k in CUTOFFS)
+    header += f" {'doc MRR':>8} {'psg R@5':>8} {'psg MRR':>8} {'p50 ms':>8} {'p95 ms':>8}"
+    print(header)
+    for mode, result in run["modes"].items():
+        document, passage, latency = result["metrics"]["document"], result["metrics"]["passage"], result["latency_ms"]
+        row = f"{mode:<8} " + " ".join(f"{document[f'recall@{k}']:>9.3f}" for k in CUTOFFS)
+        row += f" {document['mrr']:>8.3f} {passage['recall@5']:>8.3f} {passage['mrr']:>8.3f}"
+        row += f" {latency['p50']:>8.1f} {latency['p95']:>8.1f}"
+        print(row)
+        if result["misses"]:
+            print(f"         no relevant document in top {run['config']['top']}: {', '.join(result['misses'])}")
+
+
+def compare(paths: list[Path]) -> None:
+    """Print the quality/latency trade-off of several result files, per search mode."""
+    runs = [json.loads(path.read_text()) for path in paths]
+    versions = {run["eval_set_version"] for run in runs}
+    if len(versions) > 1:
+        print(f"Warning: results use different eval set versions {sorted(versions)}", file=sys.stderr)
+
+    modes = [mode for mode in SEARCH_MODES if any(mode in run["modes"] for run in runs)]
+    width = max(len(run["label"]) for run in runs) + 2
+    for mode in modes:
+        print(f"\n{mode}")
+        print(f"{'configuration':<{width}} {'doc R@5':>8} {'doc MRR':>8} {'psg R@5':>8} {'psg MRR':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8}")
+        for run in runs:
+            result = run["modes"].get(mode)
+            if not result:
+                continue
+            document, passage, latency = (
+                result["metrics"]["document"], result["metrics"]["passage"], result["latency_ms"]
+            )
+            print(f"{run['label']:<{width}} {document['recall@5']:>8.3f} {document['mrr']:>8.3f} "
+                  f"{passage['recall@5']:>8.3f} {passage['mrr']:>8.3f} {latency['p50']:>8.1f} {latency['p95']:>8.1f}")
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    eval_set = load_eval_set(args.eval_set)
+    run = run_evaluation(args, eval_set)
+    print_report(run)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(run, indent=2) + "\n")
+        print(f"\nResults written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
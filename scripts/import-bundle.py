@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Import an ingestion bundle into Azure AI Search, Cosmos DB and document storage.
+
+Loads a bundle written by `ingest-documents.py --export DIR` without calling
+Azure OpenAI, so an index can be rebuilt or a new environment populated from
+embeddings generated once:
+
+    python import-bundle.py bundles/2024-decisions --index hearings-index-v2
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from dotenv import load_dotenv
+
+# Load environment before src.config reads it
+load_dotenv(Path(__file__).parent.parent / "api" / ".env")
+
+from src.config import settings
+from src.documents.bundle import BundleReader
+from src.documents.pipeline import EMBEDDING_DEPLOYMENT, CosmosMetadataWriter, pipeline_clients, upload_documents
+from src.documents.storage import get_document_store
+from src.evidence.store import get_chunk_store
+from src.proceedings.overview import set_details
+
+
+async def import_bundle(bundle: BundleReader, index_name: str, skip_metadata: bool) -> None:
+    async with pipeline_clients(index_name) as (_, search_client, container):
+        chunk_store = get_chunk_store()
+        page_counts = {record["id"]: record.get("pageCount") for record in bundle.iter_metadata_records()}
+        indexed = 0
+        for batch in bundle.iter_index_documents():
+            indexed += await upload_documents(search_client, batch)
+            await asyncio.to_thread(chunk_store.put_documents, batch, page_counts)
+            print(f"  Indexed {indexed}/{bundle.manifest['chunks']} chunks", end="\r")
+        print(f"  Indexed {indexed}/{bundle.manifest['chunks']} chunks")
+
+        if skip_metadata:
+            return
+
+        # Source PDFs first: the pages endpoint reads them through the records' blobName
+        sources = 0
+        for blob_name, path in bundle.iter_sources():
+            await asyncio.to_thread(get_document_store().put, blob_name, path.read_bytes())
+            sources += 1
+        print(f"  Source documents stored: {sources}")
+
+        metadata_writer = CosmosMetadataWriter(container)
+        for record in bundle.iter_metadata_records():
+            await metadata_writer.add(record)
+        await metadata_writer.flush()
+        for proceeding in bundle.proceedings:
+            await set_details(container, proceeding)
+        print(f"  Metadata records written: {metadata_writer.written} ({metadata_writer.request_charge:,.1f} RU)")
+        if metadata_writer.failed:
+            print(f"  Metadata records failed: {len(metadata_writer.failed)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", type=Path, help="Bundle directory")
+    parser.add_argument("--index", default=settings.azure_search_index, help="Target search index")
+    parser.add_argument("--skip-metadata", action="store_true", help="Only load the search index")
+    args = parser.parse_args()
+
+    bundle = BundleReader(args.bundle)
+    manifest = bundle.manifest
+
+    print("=" * 60)
+    print("Hearings AI - Bundle Import")
+    print("=" * 60)
+    print(f"\nBundle: {args.bundle} (created {manifest['created_at']})")
+    print(f"Contents: {manifest['chunks']} chunks from {manifest['documents']} documents")
+    print(f"Vectors: {manifest['dimensions']} x {manifest['vector_dtype']} ({manifest['embedding_model']})")
+    print(f"Search endpoint: {settings.azure_search_endpoint} (index {args.index})")
+
+    if manifest["embedding_model"] != EMBEDDING_DEPLOYMENT:
+        # Queries are embedded with the configured deployment and must share its vector space
+        print(f"\n⚠ Bundle was embedded with {manifest['embedding_model']}, "
+              f"but this environment queries with {EMBEDDING_DEPLOYMENT}")
+
+    asyncio.run(import_bundle(bundle, args.index, args.skip_metadata))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,49 +6,49 @@ Processes PDF documents:
 2. Chunk text (512 tokens, 128 overlap)
 3. Generate embeddings via Azure OpenAI
 4. Index chunks in Azure AI Search
-5. Store metadata in Cosmos DB
+5. Store metadata in Cosmos DB, and proceeding overviews (with the
+   proceeding details in sample-proceedings.json)
+6. Store the source PDF for the pages endpoint (Blob Storage, or LOCAL_DATA_DIR)
+
+With --export DIR, steps 4-6 write a portable bundle instead (see
+src/documents/bundle.py); load it anywhere with scripts/import-bundle.py.
 """
 
+import argparse
 import asyncio
 import json
 import os
-import re
+import shutil
 import sys
-import uuid
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Optional
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
 
-import tiktoken
-from azure.cosmos.aio import CosmosClient
-from azure.identity.aio import DefaultAzureCredential
-from azure.search.documents.aio import SearchClient
-from azure.storage.blob.aio import BlobServiceClient
 from dotenv import load_dotenv
-from openai import AsyncAzureOpenAI
-from pypdf import PdfReader
 
-# Load environment
+# Load environment before src.config reads it
 load_dotenv(Path(__file__).parent.parent / "api" / ".env")
 
-# Configuration
-SEARCH_ENDPOINT = os.environ["AZURE_SEARCH_ENDPOINT"]
-INDEX_NAME = os.environ.get("AZURE_SEARCH_INDEX", "hearings-index")
-OPENAI_ENDPOINT = os.environ["AZURE_OPENAI_ENDPOINT"]
-EMBEDDING_DEPLOYMENT = os.environ.get("AZURE_OPENAI_DEPLOYMENT_EMBEDDING", "text-embedding-3-large")
-COSMOS_ENDPOINT = os.environ["COSMOS_ENDPOINT"]
-COSMOS_DATABASE = os.environ.get("COSMOS_DATABASE", "hearings")
-STORAGE_URL = os.environ["STORAGE_ACCOUNT_URL"]
-STORAGE_CONTAINER = os.environ.get("STORAGE_CONTAINER", "hearing-documents")
-
-CHUNK_SIZE = int(os.environ.get("CHUNK_SIZE_TOKENS", "512"))
-CHUNK_OVERLAP = int(os.environ.get("CHUNK_OVERLAP_TOKENS", "128"))
+from src.config import settings
+from src.documents.bundle import VECTOR_DTYPES, BundleWriter
+from src.documents.extraction import BACKENDS, available_backends, resolve_backend
+from src.documents.pipeline import (
+    EMBEDDING_DEPLOYMENT,
+    CosmosMetadataWriter,
+    EmbeddingDeduplicator,
+    RunJournal,
+    compute_document_id,
+    pipeline_clients,
+    pipeline_openai_client,
+    process_document,
+    store_source_document,
+)
+from src.proceedings.overview import set_details
 
-# Tokenizer for chunk sizing
-TOKENIZER = tiktoken.get_encoding("cl100k_base")
+# Run journal for resumable ingestion
+JOURNAL_DIR = Path(os.environ.get("INGEST_JOURNAL_DIR", Path(__file__).parent.parent / ".ingest-journal"))
 
 # Document metadata from sample-proceedings.json
 SAMPLE_METADATA = json.loads(
@@ -56,156 +56,6 @@ SAMPLE_METADATA = json.loads(
 )
 
 
-def extract_text_from_pdf(pdf_path: Path) -> list[dict]:
-    """Extract text from PDF, preserving page numbers."""
-    pages = []
-    try:
-        reader = PdfReader(pdf_path)
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text() or ""
-            if text.strip():
-                pages.append({
-                    "page_number": i + 1,
-                    "text": text,
-                })
-    except Exception as e:
-        print(f"    Warning: Error extracting PDF: {e}")
-    return pages
-
-
-def extract_paragraph_numbers(text: str) -> list[str]:
-    """Extract -style paragraph numbers like [1], [2], etc."""
-    return re.findall(r'\[(\d+)\]', text)
-
-
-def extract_regulatory_citations(text: str) -> list[str]:
-    """Extract regulatory citations from text."""
-    citations = set()
-    
-    # Legislation patterns
-    legislation_patterns = [
-        r'REDA\s+s\.?\s*\d+',
-        r'EPEA\s+s\.?\s*\d+',
-        r'OGCA\s+s\.?\s*\d+',
-        r'Pipeline\s+Act\s+s\.?\s*\d+',
-        r'Water\s+Act\s+s\.?\s*\d+',
-        r'Public\s+Lands\s+Act\s+s\.?\s*\d+',
-    ]
-    
-    # Directive patterns
-    directive_patterns = [
-        r'Directive\s+0?\d+',
-        r'Directive\s+0?\d+\s+s\.?\s*[\d\.]+',
-    ]
-    
-    for pattern in legislation_patterns + directive_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        citations.update(matches)
-    
-    return list(citations)
-
-
-def chunk_text(pages: list[dict], chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[dict]:
-    """Chunk text into token-sized pieces with overlap, preserving page info."""
-    chunks = []
-    current_chunk = []
-    current_tokens = 0
-    current_page = 1
-    chunk_id = 0
-    
-    for page in pages:
-        page_num = page["page_number"]
-        text = page["text"]
-        
-        # Split by paragraphs (try to preserve paragraph structure)
-        paragraphs = re.split(r'\n\s*\n', text)
-        
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-                
-            para_tokens = len(TOKENIZER.encode(para))
-            
-            # If this paragraph alone exceeds chunk size, split it
-            if para_tokens > chunk_size:
-                # First, save current chunk if any
-                if current_chunk:
-                    chunk_text = "\n\n".join(current_chunk)
-                    para_nums = extract_paragraph_numbers(chunk_text)
-                    chunks.append({
-                        "chunk_id": chunk_id,
-                        "content": chunk_text,
-                        "page_number": current_page,
-                        "paragraph_number": para_nums[0] if para_nums else None,
-                        "regulatory_citations": extract_regulatory_citations(chunk_text),
-                    })
-                    chunk_id += 1
-                    current_chunk = []
-                    current_tokens = 0
-                
-                # Split long paragraph by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', para)
-                for sent in sentences:
-                    sent_tokens = len(TOKENIZER.encode(sent))
-                    if current_tokens + sent_tokens > chunk_size and current_chunk:
-                        chunk_text = " ".join(current_chunk)
-                        para_nums = extract_paragraph_numbers(chunk_text)
-                        chunks.append({
-                            "chunk_id": chunk_id,
-                            "content": chunk_text,
-                            "page_number": current_page,
-                            "paragraph_number": para_nums[0] if para_nums else None,
-                            "regulatory_citations": extract_regulatory_citations(chunk_text),
-                        })
-                        chunk_id += 1
-                        # Keep overlap
-                        overlap_text = " ".join(current_chunk[-2:]) if len(current_chunk) >= 2 else ""
-                        current_chunk = [overlap_text] if overlap_text else []
-                        current_tokens = len(TOKENIZER.encode(overlap_text)) if overlap_text else 0
-                    
-                    current_chunk.append(sent)
-                    current_tokens += sent_tokens
-                    current_page = page_num
-            
-            elif current_tokens + para_tokens > chunk_size:
-                # Save current chunk
-                chunk_text = "\n\n".join(current_chunk)
-                para_nums = extract_paragraph_numbers(chunk_text)
-                chunks.append({
-                    "chunk_id": chunk_id,
-                    "content": chunk_text,
-                    "page_number": current_page,
-                    "paragraph_number": para_nums[0] if para_nums else None,
-                    "regulatory_citations": extract_regulatory_citations(chunk_text),
-                })
-                chunk_id += 1
-                
-                # Start new chunk with overlap
-                overlap_paragraphs = current_chunk[-1:] if current_chunk else []
-                current_chunk = overlap_paragraphs + [para]
-                current_tokens = sum(len(TOKENIZER.encode(p)) for p in current_chunk)
-                current_page = page_num
-            else:
-                current_chunk.append(para)
-                current_tokens += para_tokens
-                current_page = page_num
-    
-    # Don't forget the last chunk
-    if current_chunk:
-        chunk_text = "\n\n".join(current_chunk)
-        para_nums = extract_paragraph_numbers(chunk_text)
-        chunks.append({
-            "chunk_id": chunk_id,
-            "content": chunk_text,
-            "page_number": current_page,
-            "paragraph_number": para_nums[0] if para_nums else None,
-            "regulatory_citations": extract_regulatory_citations(chunk_text),
-        })
-    
-    return chunks
-
-
 def get_document_metadata(filename: str) -> Optional[dict]:
     """Get metadata for a document from sample-proceedings.json."""
     for doc in SAMPLE_METADATA.get("sample_documents", []):
@@ -235,209 +85,57 @@ def get_document_metadata(filename: str) -> Optional[dict]:
     return None
 
 
-async def generate_embeddings(
-    openai_client: AsyncAzureOpenAI,
-    texts: list[str],
-    batch_size: int = 16,
-) -> list[list[float]]:
-    """Generate embeddings for texts in batches."""
-    embeddings = []
-    
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-        response = await openai_client.embeddings.create(
-            input=batch,
-            model=EMBEDDING_DEPLOYMENT,
-        )
-        embeddings.extend([e.embedding for e in response.data])
-    
-    return embeddings
-
-
-async def index_chunks(
-    search_client: SearchClient,
-    document_id: str,
-    chunks: list[dict],
-    embeddings: list[list[float]],
-    metadata: dict,
-) -> int:
-    """Index chunks in Azure AI Search."""
-    documents = []
-    
-    for chunk, embedding in zip(chunks, embeddings):
-        doc = {
-            "id": f"{document_id}-{chunk['chunk_id']}",
-            "documentId": document_id,
-            "proceedingId": metadata.get("proceeding_id", "unknown"),
-            "documentType": metadata.get("document_type", "unknown"),
-            "abaerCitation": metadata.get("abaer_citation"),
-            "chunkId": chunk["chunk_id"],
-            "pageNumber": chunk["page_number"],
-            "paragraphNumber": chunk.get("paragraph_number"),
-            "sectionTitle": None,  # Could be extracted from headers
-            "content": chunk["content"],
-            "contentVector": embedding,
-            "confidentialityLevel": metadata.get("confidentiality_level", "public"),
-            "parties": [p.get("name", p) if isinstance(p, dict) else p for p in metadata.get("parties", [])],
-            "regulatoryCitations": chunk.get("regulatory_citations", []),
-            "title": metadata.get("title", "Unknown Document"),
-            "sourceUrl": metadata.get("source_url"),
-        }
-        documents.append(doc)
-    
-    # Upload in batches
-    batch_size = 100
-    indexed = 0
-    for i in range(0, len(documents), batch_size):
-        batch = documents[i:i + batch_size]
-        result = await search_client.upload_documents(documents=batch)
-        indexed += len([r for r in result if r.succeeded])
-    
-    return indexed
-
-
-async def save_document_metadata(
-    cosmos_container,
-    document_id: str,
-    filename: str,
-    metadata: dict,
-    chunk_count: int,
-) -> None:
-    """Save document metadata to Cosmos DB."""
-    doc = {
-        "id": document_id,
-        "proceedingId": metadata.get("proceeding_id", "unknown"),
-        "documentType": metadata.get("document_type", "unknown"),
-        "abaerCitation": metadata.get("abaer_citation"),
-        "title": metadata.get("title", filename),
-        "confidentialityLevel": metadata.get("confidentiality_level", "public"),
-        "parties": metadata.get("parties", []),
-        "regulatoryCitations": metadata.get("regulatory_citations", []),
-        "sourceUrl": metadata.get("source_url"),
-        "uploadedAt": datetime.utcnow().isoformat(),
-        "processingStatus": "indexed",
-        "chunkCount": chunk_count,
-        "filename": filename,
-    }
-    
-    await cosmos_container.upsert_item(doc)
-
-
-async def process_document(
-    pdf_path: Path,
-    credential,
-    openai_client: AsyncAzureOpenAI,
-    search_client: SearchClient,
-    cosmos_container,
-) -> dict:
-    """Process a single document end-to-end."""
-    filename = pdf_path.name
-    document_id = str(uuid.uuid4())
-    
-    print(f"\n  Processing: {filename}")
-    
-    # Get metadata
-    metadata = get_document_metadata(filename) or {}
-    metadata["source_url"] = f"https://static.aer.ca/prd/documents/decisions/2024/{filename}"
-    
-    # Extract text
-    print(f"    Extracting text...")
-    pages = extract_text_from_pdf(pdf_path)
-    if not pages:
-        print(f"    ✗ No text extracted")
-        return {"filename": filename, "status": "failed", "reason": "no text"}
-    
-    total_text = sum(len(p["text"]) for p in pages)
-    print(f"    Found {len(pages)} pages, {total_text:,} characters")
-    
-    # Chunk text
-    print(f"    Chunking...")
-    chunks = chunk_text(pages)
-    print(f"    Created {len(chunks)} chunks")
-    
-    if not chunks:
-        return {"filename": filename, "status": "failed", "reason": "no chunks"}
-    
-    # Generate embeddings
-    print(f"    Generating embeddings...")
-    texts = [c["content"] for c in chunks]
-    embeddings = await generate_embeddings(openai_client, texts)
-    print(f"    Generated {len(embeddings)} embeddings")
-    
-    # Index in search
-    print(f"    Indexing...")
-    indexed = await index_chunks(search_client, document_id, chunks, embeddings, metadata)
-    print(f"    Indexed {indexed} chunks")
-    
-    # Save metadata to Cosmos
-    print(f"    Saving metadata...")
-    await save_document_metadata(cosmos_container, document_id, filename, metadata, len(chunks))
-    
-    print(f"    ✓ Complete: {filename}")
-    
-    return {
-        "filename": filename,
-        "document_id": document_id,
-        "status": "success",
-        "pages": len(pages),
-        "chunks": len(chunks),
-        "indexed": indexed,
-    }
-
-
-async def main():
-    """Process all documents in test-data/documents."""
-    print("=" * 60)
-    print("Hearings AI - Document Ingestion Pipeline")
-    print("=" * 60)
-    
-    docs_dir = Path(__file__).parent.parent / "test-data" / "documents"
-    pdf_files = list(docs_dir.glob("*.pdf"))
-    
-    print(f"\nFound {len(pdf_files)} PDF files to process")
-    print(f"Search endpoint: {SEARCH_ENDPOINT}")
-    print(f"OpenAI endpoint: {OPENAI_ENDPOINT}")
-    print(f"Cosmos endpoint: {COSMOS_ENDPOINT}")
-    
-    # Initialize clients
-    credential = DefaultAzureCredential()
-    
-    # Create async token provider
-    async def get_token():
-        token = await credential.get_token("https://cognitiveservices.azure.com/.default")
-        return token.token
+async def ingest_files(
+    pdf_files: list[Path],
+    args: argparse.Namespace,
+    openai_client,
+    search_client,
+    container,
+    bundle: Optional[BundleWriter] = None,
+) -> tuple[list[dict], CosmosMetadataWriter, EmbeddingDeduplicator]:
+    """Run every PDF through the pipeline, checkpointing to the run journal."""
+    journal = None
+    # A bundle is only complete once closed, so exports always run from scratch
+    if not args.no_journal and not bundle:
+        if args.fresh and args.journal.exists():
+            shutil.rmtree(args.journal)
+        journal = RunJournal(args.journal)
+        print(f"Run journal: {args.journal}")
+    
+    def on_metadata_written(record: dict) -> None:
+        if journal:
+            journal.record(record["id"], "metadata_saved", pages=record["pageCount"], chunks=record["chunkCount"])
+    
+    metadata_writer = CosmosMetadataWriter(container, on_written=on_metadata_written)
+    deduplicator = EmbeddingDeduplicator()
     
-    openai_client = AsyncAzureOpenAI(
-        azure_endpoint=OPENAI_ENDPOINT,
-        azure_ad_token_provider=get_token,
-        api_version="2024-06-01",
-    )
-    
-    search_client = SearchClient(
-        endpoint=SEARCH_ENDPOINT,
-        index_name=INDEX_NAME,
-        credential=credential,
-    )
-    
-    cosmos_client = CosmosClient(
-        url=COSMOS_ENDPOINT,
-        credential=credential,
-    )
-    database = cosmos_client.get_database_client(COSMOS_DATABASE)
-    container = database.get_container_client("documents")
-    
-    # Process documents
     results = []
+    proceeding_ids = set()
     for pdf_path in pdf_files:
+        print(f"\n  Processing: {pdf_path.name}")
+        metadata = get_document_metadata(pdf_path.name) or {}
+        proceeding_ids.add(metadata.get("proceeding_id"))
+        metadata["source_url"] = f"https://static.aer.ca/prd/documents/decisions/2024/{pdf_path.name}"
         try:
+            data = pdf_path.read_bytes()
+            document_id = compute_document_id(data)
+            metadata["blob_name"] = await store_source_document(data, document_id, metadata, bundle)
             result = await process_document(
                 pdf_path,
-                credential,
+                document_id,
+                metadata,
                 openai_client,
                 search_client,
-                container,
+                metadata_writer,
+                journal,
+                deduplicator,
+                bundle,
             )
             results.append(result)
+            if result["status"] == "success":
+                print(f"    ✓ Complete: {pdf_path.name}")
+            else:
+                print(f"    ✗ Failed: {pdf_path.name} - {result['reason']}")
         except Exception as e:
             print(f"    ✗ Failed: {pdf_path.name} - {e}")
             results.append({
@@ -446,6 +144,73 @@ async def main():
                 "reason": str(e),
             })
     
+    await metadata_writer.flush()
+    if journal:
+        journal.close()
+    for proceeding in SAMPLE_METADATA.get("proceedings", []):
+        if proceeding["proceeding_id"] in proceeding_ids:
+            if bundle:
+                bundle.add_proceeding(proceeding)
+            else:
+                await set_details(container, proceeding)
+    
+    return results, metadata_writer, deduplicator
+
+
+async def main():
+    """Process all documents in test-data/documents."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--journal", type=Path, default=JOURNAL_DIR, help="Run journal directory for checkpoints")
+    parser.add_argument("--fresh", action="store_true", help="Discard the existing journal and start over")
+    parser.add_argument("--no-journal", action="store_true", help="Run without checkpointing")
+    parser.add_argument(
+        "--extraction-backend", choices=["auto", *BACKENDS], default=None, help="PDF text extraction backend"
+    )
+    parser.add_argument("--export", type=Path, help="Write chunks and vectors to a bundle directory instead of Azure")
+    parser.add_argument(
+        "--vector-dtype", choices=VECTOR_DTYPES, default="float16", help="Vector precision in exported bundles"
+    )
+    parser.add_argument(
+        "--no-extraction-cache", action="store_true", help="Re-parse PDFs instead of reusing cached extracted text"
+    )
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Hearings AI - Document Ingestion Pipeline")
+    print("=" * 60)
+    
+    docs_dir = Path(__file__).parent.parent / "test-data" / "documents"
+    pdf_files = list(docs_dir.glob("*.pdf"))
+    
+    print(f"\nFound {len(pdf_files)} PDF files to process")
+    if not args.export:
+        print(f"Search endpoint: {settings.azure_search_endpoint}")
+    print(f"OpenAI endpoint: {settings.azure_openai_endpoint}")
+    if not args.export:
+        print(f"Cosmos endpoint: {settings.cosmos_endpoint}")
+    if args.extraction_backend:
+        settings.extraction_backend = args.extraction_backend
+    if args.no_extraction_cache:
+        settings.extraction_cache = False
+    print(f"Extraction backend: {resolve_backend()} (installed: {', '.join(available_backends())})")
+    
+    bundle = BundleWriter(args.export, EMBEDDING_DEPLOYMENT, args.vector_dtype) if args.export else None
+    if bundle:
+        print(f"Exporting to bundle: {args.export}")
+    
+    if bundle:
+        # Only embeddings are needed; Azure AI Search and Cosmos DB are not touched
+        async with pipeline_openai_client() as openai_client:
+            results, metadata_writer, deduplicator = await ingest_files(
+                pdf_files, args, openai_client, None, None, bundle
+            )
+        bundle.close()
+    else:
+        async with pipeline_clients() as (openai_client, search_client, container):
+            results, metadata_writer, deduplicator = await ingest_files(
+                pdf_files, args, openai_client, search_client, container
+            )
+    
     # Summary
     print("\n" + "=" * 60)
     print("Ingestion Complete")
@@ -457,6 +222,8 @@ async def main():
     print(f"\nSuccessful: {len(success)}")
     for r in success:
         print(f"  ✓ {r['filename']}: {r['chunks']} chunks indexed")
+        if r.get("failed_pages"):
+            print(f"    ! pages not extracted: {', '.join(map(str, r['failed_pages']))}")
     
     if failed:
         print(f"\nFailed: {len(failed)}")
@@ -464,10 +231,25 @@ async def main():
             print(f"  ✗ {r['filename']}: {r.get('reason', 'unknown')}")
     
     total_chunks = sum(r.get("chunks", 0) for r in success)
-    print(f"\nTotal chunks indexed: {total_chunks}")
-    
-    await cosmos_client.close()
-    await search_client.close()
+    print(f"\nTotal chunks {'exported' if bundle else 'indexed'}: {total_chunks}")
+    if deduplicator.total:
+        print(f"Embeddings: {deduplicator.unique} unique of {deduplicator.total} total chunks "
+              f"({deduplicator.embedded} sent to Azure OpenAI)")
+    parsed = [r for r in success if r.get("extraction_seconds") and not r.get("extraction_cached")]
+    extraction_seconds = sum(r["extraction_seconds"] for r in parsed)
+    if extraction_seconds:
+        extracted_pages = sum(r["pages"] for r in parsed)
+        print(f"Extraction: {extracted_pages} pages in {extraction_seconds:.1f}s "
+              f"({extracted_pages / extraction_seconds:.1f} pages/sec)")
+    cached = sum(1 for r in success if r.get("extraction_cached"))
+    if cached:
+        print(f"Extraction cache hits: {cached} documents")
+    if bundle:
+        print(f"Bundle written: {args.export} ({bundle.chunk_count} chunks, {bundle.document_count} documents)")
+    else:
+        print(f"Metadata records written: {metadata_writer.written} ({metadata_writer.request_charge:,.1f} RU)")
+        if metadata_writer.failed:
+            print(f"Metadata records failed: {len(metadata_writer.failed)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Search load test for the Hearings AI API.
+
+Replays a realistic query mix (hybrid, keyword and vector searches, searches
+filtered by party or regulatory citation) as the demo roles in
+auth.DEMO_USERS, and reports throughput and p50/p95/p99 latency per scenario.
+
+By default the API runs in-process on a local uvicorn server backed by the
+local service stand-ins, seeded from test-data/documents; --url targets a
+running deployment instead.
+
+Closed loop (N clients issuing back-to-back requests):
+    python load-test-search.py --concurrency 8 --duration 30
+
+Open loop (fixed arrival rate, so queueing in the sync search path shows up
+as latency instead of as a lower request rate):
+    python load-test-search.py --rate 50 --duration 30 --latency-ms 20
+
+In open-loop mode latency is measured from each request's scheduled start,
+so time spent waiting behind slow requests is counted.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+
+ROOT = Path(__file__).parent.parent
+SAMPLE_METADATA = ROOT / "test-data" / "metadata" / "sample-proceedings.json"
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+# Keys of src.auth.DEMO_USERS, sent as X-Demo-Role
+DEMO_ROLES = ["Hearing_Panel", "Staff", "Intervener", "Public"]
+
+# Fallback keyword queries for corpora without regulatory references in the sample metadata
+KEYWORD_QUERIES = ["REDA s. 34", "Directive 056", "EPEA", "Water Act", "noise", "reclamation", "groundwater"]
+
+
+@dataclass
+class Scenario:
+    """One kind of request in the mix."""
+
+    name: str
+    weight: float
+    build: Callable[[random.Random], dict]  # Returns the /api/search request body
+
+
+@dataclass
+class Sample:
+    scenario: str
+    role: str
+    status: int
+    latency: float
+    started: float
+
+
+def build_scenarios(sample: dict) -> list[Scenario]:
+    """Query mix drawn from the sample proceedings metadata."""
+    questions = [q["query"] for q in sample.get("test_queries", [])] or ["groundwater contamination risk"]
+    parties = sorted({
+        party["name"]
+        for doc in sample.get("sample_documents", [])
+        for party in doc.get("parties", [])
+    }) or ["Crowsnest Pass Residents Association"]
+    citations = sorted({
+        citation["reference"]
+        for doc in sample.get("sample_documents", [])
+        for citation in doc.get("regulatory_citations", [])
+    }) or KEYWORD_QUERIES[:4]
+
+    return [
+        Scenario("search:hybrid", 40, lambda rng: {"query": rng.choice(questions), "search_mode": "hybrid"}),
+        Scenario("search:keyword", 20, lambda rng: {
+            "query": rng.choice(citations + KEYWORD_QUERIES), "search_mode": "keyword"
+        }),
+        Scenario("search:vector", 10, lambda rng: {"query": rng.choice(questions), "search_mode": "vector"}),
+        Scenario("search:party-filter", 15, lambda rng: {
+            "query": rng.choice(questions), "filters": {"parties": [rng.choice(parties)]}
+        }),
+        Scenario("search:citation-filter", 15, lambda rng: {
+            "query": rng.choice(questions), "filters": {"regulatory_citations": [rng.choice(citations)]}
+        }),
+    ]
+
+
+def parse_mix(spec: Optional[str], scenarios: list[Scenario]) -> list[Scenario]:
+    """Apply --mix weights like "hybrid=50,keyword=50" (unlisted scenarios get weight 0)."""
+    if not spec:
+        return scenarios
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        weights[f"search:{name.strip()}"] = float(weight)
+    unknown = set(weights) - {s.name for s in scenarios}
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+    return [Scenario(s.name, weights.get(s.name, 0.0), s.build) for s in scenarios if weights.get(s.name)]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    by_scenario = defaultdict(list)
+    for sample in samples:
+        by_scenario[sample.scenario].append(sample)
+    by_scenario["all"] = samples
+
+    summary = {}
+    for name, group in sorted(by_scenario.items()):
+        latencies = sorted(s.latency * 1000 for s in group if s.status == 200)
+        summary[name] = {
+            "requests": len(group),
+            "errors": sum(1 for s in group if s.status != 200),
+            "throughput": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+        }
+    return summary
+
+
+async def send(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    rng: random.Random,
+    scheduled: float,
+) -> Sample:
+    role = rng.choice(DEMO_ROLES)
+    body = scenario.build(rng)
+    try:
+        response = await client.post("/api/search", json=body, headers={"X-Demo-Role": role})
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0
+    return Sample(scenario.name, role, status, time.perf_counter() - scheduled, scheduled)
+
+
+async def closed_loop(client: httpx.AsyncClient, scenarios: list[Scenario], args: argparse.Namespace) -> list[Sample]:
+    """N clients each sending their next request as soon as the previous one returns."""
+    samples = []
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(args.seed + worker_id)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(scenarios, weights=[s.weight for s in scenarios])[0]
+            samples.append(await send(client, scenario, rng, time.perf_counter()))
+
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return samples
+
+
+async def open_loop(client: httpx.AsyncClient, scenarios: list[Scenario], args: argparse.Namespace) -> list[Sample]:
+    """Requests started on a fixed (or Poisson) schedule regardless of how fast earlier ones finish."""
+    rng = random.Random(args.seed)
+    tasks = []
+    dropped = 0
+    start = time.perf_counter()
+    scheduled = start
+
+    while scheduled < start + args.duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        in_flight = sum(1 for t in tasks if not t.done())
+        if in_flight >= args.max_in_flight:
+            dropped += 1
+        else:
+            scenario = rng.choices(scenarios, weights=[s.weight for s in scenarios])[0]
+            tasks.append(asyncio.create_task(send(client, scenario, random.Random(rng.random()), scheduled)))
+        interval = rng.expovariate(args.rate) if args.poisson else 1 / args.rate
+        scheduled += interval
+
+    samples = list(await asyncio.gather(*tasks))
+    args.dropped = dropped
+    return samples
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_api(args: argparse.Namespace) -> str:
+    """Seed the local stand-ins and serve the API on a background uvicorn server."""
+    os.environ["USE_LOCAL_SERVICES"] = "true"
+    os.environ["LOCAL_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LOCAL_LATENCY_JITTER_MS"] = str(args.latency_ms / 4)
+    for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_SEARCH_ENDPOINT", "COSMOS_ENDPOINT"):
+        os.environ.setdefault(name, "https://local.invalid")
+
+    import uvicorn
+
+    from src.local.seed import seed_from_bundle, seed_from_documents
+
+    if args.bundle:
+        indexed = asyncio.run(seed_from_bundle(args.bundle))
+    else:
+        pdf_files = sorted((ROOT / "test-data" / "documents").glob("*.pdf"))[:args.documents]
+        print(f"Seeding local index from {len(pdf_files)} PDFs...", file=sys.stderr)
+        indexed = asyncio.run(seed_from_documents(pdf_files))
+    print(f"Local index holds {indexed} chunks", file=sys.stderr)
+
+    from src.main import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run(base_url: str, scenarios: list[Scenario], args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup:
+            warmup = argparse.Namespace(**{**vars(args), "duration": args.warmup, "concurrency": 1})
+            await closed_loop(client, scenarios, warmup)
+
+        started = time.perf_counter()
+        if args.rate:
+            samples = await open_loop(client, scenarios, args)
+        else:
+            samples = await closed_loop(client, scenarios, args)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "target": base_url if args.url else "local",
+        "mode": "open" if args.rate else "closed",
+        "rate": args.rate,
+        "poisson": args.poisson,
+        "concurrency": None if args.rate else args.concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "dropped": getattr(args, "dropped", 0),
+        "roles": {role: sum(1 for s in samples if s.role == role) for role in DEMO_ROLES},
+        "scenarios": summarize(samples, elapsed),
+    }
+
+
+def print_report(report: dict) -> None:
+    mode = f"open loop at {report['rate']}/s" if report["mode"] == "open" else \
+        f"closed loop with {report['concurrency']} clients"
+    print(f"\nSearch load test ({mode}, {report['duration_seconds']}s against {report['target']})")
+    if report["dropped"]:
+        print(f"Dropped {report['dropped']} requests at the in-flight limit")
+    print(f"\n{'scenario':<24} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}")
+    for name, s in report["scenarios"].items():
+        print(f"{name:<24} {s['requests']:>8} {s['errors']:>7} {s['throughput']:>8.1f} {s['p50_ms']:>8.1f} "
+              f"{s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target a running API instead of a local in-process one")
+    parser.add_argument("--rate", type=float, help="Open loop: requests per second")
+    parser.add_argument("--poisson", action="store_true", help="Open loop: Poisson rather than evenly spaced arrivals")
+    parser.add_argument("--concurrency", type=int, default=4, help="Closed loop: concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured warm-up traffic")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Open loop: cap on outstanding requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--mix", help='Scenario weights, e.g. "hybrid=50,keyword=30,party-filter=20"')
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the query mix")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Local: injected latency per backend call")
+    parser.add_argument("--documents", type=int, default=10, help="Local: PDFs from test-data/documents to index")
+    parser.add_argument("--bundle", type=Path, help="Local: seed the index from a bundle instead of PDFs")
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    scenarios = parse_mix(args.mix, build_scenarios(json.loads(SAMPLE_METADATA.read_text())))
+    base_url = args.url or start_local_api(args)
+
+    report = asyncio.run(run(base_url, scenarios, args))
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Blue/green search index versioning for Hearings AI.
+
+The API queries the index alias AZURE_SEARCH_INDEX (hearings-index), which
+points at a versioned index (hearings-index-v1, -v2, ...). A schema change
+or full reload builds the next version beside the live one, checks it
+against the retrieval eval set, then repoints the alias in one call:
+
+    # All steps: create the next version from a bundle, load, validate, swap
+    python reindex.py build --bundle ../bundles/corpus --rate 200
+
+    # Or step by step
+    python create-search-index.py --new-version
+    python reindex.py load --index hearings-index-v3 --bundle ../bundles/corpus --rate 200
+    python reindex.py validate --index hearings-index-v3
+    python reindex.py swap --index hearings-index-v3
+
+    python reindex.py status
+    python reindex.py rollback          # alias back to the previous version
+    python reindex.py prune --keep 2    # delete all but the newest two versions
+
+Loading is throttled (--rate search documents per second) so the build does
+not starve live queries of search units. Validation requires every bundle
+chunk to be indexed and document-level recall@5 and MRR to be no more than
+--tolerance below the live version for each search mode (or, with no live
+version yet, recall@10 of at least --min-recall).
+
+Moving from a plain hearings-index to an alias is a one-time step: the
+index has to be deleted before an alias can take its name, so swap needs
+--replace-legacy-index and search is unavailable for the seconds between.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).parent.parent
+HNSW_PARAMETERS_FILE = ROOT / "infra" / "search-hnsw.json"
+DEFAULT_EVAL_SET = ROOT / "test-data" / "eval" / "retrieval-v1.json"
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+from dotenv import load_dotenv
+
+# Load environment before src.config reads it
+load_dotenv(ROOT / "api" / ".env")
+
+VALIDATED_METRICS = ("recall@5", "mrr")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--local", action="store_true", help="Rehearse against the local stand-ins")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("status", help="Show the alias and its versions")
+
+    build = commands.add_parser("build", help="Create, load, validate and swap in the next version")
+    build.add_argument("--bundle", type=Path, required=True, help="Export bundle to load")
+    build.add_argument("--no-swap", action="store_true", help="Stop after validation")
+
+    load = commands.add_parser("load", help="Load a bundle into a version")
+    load.add_argument("--index", required=True, help="Versioned index to load")
+    load.add_argument("--bundle", type=Path, required=True, help="Export bundle to load")
+
+    validate = commands.add_parser("validate", help="Check a version against the eval set")
+    validate.add_argument("--index", required=True, help="Versioned index to validate")
+    validate.add_argument("--bundle", type=Path, help="Also require every chunk of this bundle to be indexed")
+
+    swap = commands.add_parser("swap", help="Point the alias at a version")
+    swap.add_argument("--index", required=True, help="Versioned index to make live")
+    swap.add_argument("--skip-validation", action="store_true", help="Swap without validating first")
+    swap.add_argument("--replace-legacy-index", action="store_true", help="Delete a plain index named like the alias")
+
+    commands.add_parser("rollback", help="Point the alias back at the previous version")
+
+    prune = commands.add_parser("prune", help="Delete old versions")
+    prune.add_argument("--keep", type=int, default=2, help="Newest versions to keep (the live one is always kept)")
+
+    for command in (build, load):
+        command.add_argument("--rate", type=float, default=200.0, help="Search documents per second (0: unlimited)")
+        command.add_argument("--batch-size", type=int, default=500, help="Search documents per upload")
+    for command in (build, validate, swap):
+        command.add_argument("--eval-set", type=Path, default=DEFAULT_EVAL_SET, help="Query set JSON")
+        command.add_argument("--tolerance", type=float, default=0.02, help="Allowed drop vs. the live version")
+        command.add_argument("--min-recall", type=float, default=0.5, help="Recall@10 floor with no live version")
+    build.add_argument("--skip-validation", action="store_true", help="Swap without validating first")
+    build.add_argument("--replace-legacy-index", action="store_true", help="Delete a plain index named like the alias")
+    return parser.parse_args()
+
+
+def document_count(index_name: str) -> int:
+    from src.clients import create_search_client
+
+    client = create_search_client(index_name)
+    try:
+        return client.get_document_count()
+    finally:
+        client.close()
+
+
+def create_version(index_client, alias: str, dimensions: int) -> str:
+    from src.config import settings
+    from src.search.indexes import build_index_schema, load_hnsw_parameters, next_index_name
+
+    name = next_index_name(index_client, alias)
+    index_client.create_index(build_index_schema(
+        name,
+        load_hnsw_parameters(HNSW_PARAMETERS_FILE),
+        settings.azure_openai_endpoint,
+        settings.azure_openai_deployment_embedding,
+        dimensions=dimensions,
+    ))
+    print(f"✓ Created {name} ({dimensions} dimensions)")
+    return name
+
+
+async def load_bundle(index_name: str, bundle_path: Path, rate: float, batch_size: int) -> int:
+    """Upload a bundle's search documents, at most rate documents per second."""
+    from src.documents.bundle import BundleReader
+    from src.documents.pipeline import EMBEDDING_DEPLOYMENT, pipeline_clients, upload_documents
+
+    bundle = BundleReader(bundle_path)
+    total = bundle.manifest["chunks"]
+    if bundle.manifest["embedding_model"] != EMBEDDING_DEPLOYMENT:
+        print(f"⚠ Bundle was embedded with {bundle.manifest['embedding_model']}, "
+              f"but this environment queries with {EMBEDDING_DEPLOYMENT}")
+
+    loaded = 0
+    started = time.perf_counter()
+    async with pipeline_clients(index_name) as (_, search_client, _):
+        for batch in bundle.iter_index_documents(batch_size):
+            if rate:
+                # Hold the average at rate: wait until the documents already sent are due
+                delay = loaded / rate - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            loaded += await upload_documents(search_client, batch)
+            print(f"  Loaded {loaded}/{total} search documents", end="\r")
+    elapsed = time.perf_counter() - started
+    print(f"  Loaded {loaded}/{total} search documents in {elapsed:.1f}s ({loaded / elapsed:.0f}/s)")
+    return loaded
+
+
+def evaluate_index(index_name: str, eval_set: dict) -> dict:
+    from src.clients import create_search_client
+    from src.search.evaluation import SEARCH_MODES, evaluate_mode, index_search
+
+    client = create_search_client(index_name)
+    try:
+        search = index_search(client)
+        return {mode: evaluate_mode(search, mode, eval_set["queries"], top=10)["metrics"] for mode in SEARCH_MODES}
+    finally:
+        client.close()
+
+
+def validate(index_client, alias: str, index_name: str, args: argparse.Namespace, expected: Optional[int]) -> bool:
+    """Check document count and eval set quality of a version before it goes live."""
+    from src.search.evaluation import load_eval_set
+    from src.search.indexes import alias_target
+
+    ok = True
+    count = document_count(index_name)
+    if expected is not None and count != expected:
+        print(f"✗ {index_name} holds {count} search documents, expected {expected}")
+        ok = False
+    elif not count:
+        print(f"✗ {index_name} is empty")
+        return False
+    else:
+        print(f"✓ {index_name} holds {count} search documents")
+
+    eval_set = load_eval_set(args.eval_set)
+    live = alias_target(index_client, alias)
+    print(f"Evaluating {index_name} against eval set v{eval_set['version']}...")
+    candidate = evaluate_index(index_name, eval_set)
+    baseline = evaluate_index(live, eval_set) if live and live != index_name else None
+
+    for mode, metrics in candidate.items():
+        document = metrics["document"]
+        if baseline:
+            live_document = baseline[mode]["document"]
+            for metric in VALIDATED_METRICS:
+                passed = document[metric] >= live_document[metric] - args.tolerance
+                ok = ok and passed
+                print(f"  {'✓' if passed else '✗'} {mode:<8} {metric:<9} {document[metric]:.3f} "
+                      f"(live {live}: {live_document[metric]:.3f})")
+        else:
+            passed = document["recall@10"] >= args.min_recall
+            ok = ok and passed
+            print(f"  {'✓' if passed else '✗'} {mode:<8} recall@10 {document['recall@10']:.3f} "
+                  f"(minimum {args.min_recall:.3f}, no live version to compare with)")
+    return ok
+
+
+def swap(index_client, alias: str, index_name: str, replace_legacy_index: bool) -> None:
+    from src.search.indexes import alias_target, point_alias
+
+    live = alias_target(index_client, alias)
+    if live is None and alias in index_client.list_index_names():
+        if not replace_legacy_index:
+            raise SystemExit(
+                f"{alias} is an index, not an alias. Rerun with --replace-legacy-index to delete it and create "
+                f"the alias (search is unavailable until the alias exists, a few seconds)."
+            )
+        index_client.delete_index(alias)
+        print(f"✓ Deleted legacy index {alias}")
+
+    point_alias(index_client, alias, index_name)
+    print(f"✓ {alias} -> {index_name}" + (f" (was {live})" if live else ""))
+
+
+def status(index_client, alias: str) -> None:
+    from src.search.indexes import alias_target, list_versions
+
+    live = alias_target(index_client, alias)
+    if live is None and alias in index_client.list_index_names():
+        print(f"{alias} is a plain index (not yet versioned)")
+    else:
+        print(f"{alias} -> {live or '(no alias)'}")
+    for version, name in list_versions(index_client, alias):
+        marker = "  (live)" if name == live else ""
+        print(f"  v{version}: {name}, {document_count(name)} search documents{marker}")
+
+
+def rollback(index_client, alias: str) -> None:
+    from src.search.indexes import alias_target, list_versions, point_alias
+
+    live = alias_target(index_client, alias)
+    names = [name for _, name in list_versions(index_client, alias)]
+    if live not in names or names.index(live) == 0:
+        raise SystemExit(f"No version older than {live} to roll back to")
+    previous = names[names.index(live) - 1]
+    point_alias(index_client, alias, previous)
+    print(f"✓ {alias} -> {previous} (was {live})")
+
+
+def prune(index_client, alias: str, keep: int) -> None:
+    from src.search.indexes import alias_target, list_versions
+
+    live = alias_target(index_client, alias)
+    names = [name for _, name in list_versions(index_client, alias)]
+    keep_names = set(names[-keep:]) | {live}
+    for name in names:
+        if name not in keep_names:
+            index_client.delete_index(name)
+            print(f"✓ Deleted {name}")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.local:
+        # Local stand-ins keep state per process, so only build rehearses the full flow
+        os.environ["USE_LOCAL_SERVICES"] = "true"
+        for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_SEARCH_ENDPOINT", "COSMOS_ENDPOINT"):
+            os.environ.setdefault(name, "https://local.invalid")
+
+    from src.clients import get_search_index_client
+    from src.config import settings
+    from src.documents.bundle import BundleReader
+
+    alias = settings.azure_search_index
+    index_client = get_search_index_client()
+    if not hasattr(index_client, "create_or_update_alias"):
+        raise SystemExit("Index aliases need an azure-search-documents release with alias operations")
+
+    if args.command == "status":
+        status(index_client, alias)
+    elif args.command == "build":
+        bundle = BundleReader(args.bundle)
+        name = create_version(index_client, alias, bundle.manifest["dimensions"])
+        asyncio.run(load_bundle(name, args.bundle, args.rate, args.batch_size))
+        if not args.skip_validation and not validate(index_client, alias, name, args, bundle.manifest["chunks"]):
+            raise SystemExit(f"Validation failed; {name} was left in place for inspection and is not live")
+        if not args.no_swap:
+            swap(index_client, alias, name, args.replace_legacy_index)
+    elif args.command == "load":
+        asyncio.run(load_bundle(args.index, args.bundle, args.rate, args.batch_size))
+    elif args.command == "validate":
+        expected = BundleReader(args.bundle).manifest["chunks"] if args.bundle else None
+        if not validate(index_client, alias, args.index, args, expected):
+            raise SystemExit(1)
+    elif args.command == "swap":
+        if not args.skip_validation and not validate(index_client, alias, args.index, args, None):
+            raise SystemExit(f"Validation failed; {alias} still points at its current index")
+        swap(index_client, alias, args.index, args.replace_legacy_index)
+    elif args.command == "rollback":
+        rollback(index_client, alias)
+    elif args.command == "prune":
+        prune(index_client, alias, args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""HNSW parameter tuning for the Hearings AI search index.
+
+Sweeps the vector index's HNSW parameters (m, efConstruction, efSearch) over
+the chunk vectors of an export bundle and measures, for each combination,
+recall@k against exact nearest neighbours (NumPy brute force), query
+latency and index size:
+
+    # Local HNSW (hnswlib) over a bundle from ingest-documents.py --export
+    python tune-hnsw.py --bundle ../bundles/corpus --chart ../benchmarks/hnsw.png
+
+    # The search service itself: builds temporary indexes, one per (m, efConstruction)
+    python tune-hnsw.py --bundle ../bundles/corpus --backend service --m 4,8 --ef-construction 200,400
+
+    # Write the recommended parameters into the index schema (infra/search-hnsw.json)
+    python tune-hnsw.py --bundle ../bundles/corpus --target-recall 0.98 --write-schema
+
+Queries are chunk vectors held out of the index, so every query has exact
+neighbours among the remaining chunks. The recommendation is the
+lowest-latency combination reaching --target-recall (smaller index breaks
+ties); create-search-index.py reads the schema file. Requires numpy and
+hnswlib, and matplotlib for --chart (pip install "hearings-ai-api[tuning]").
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).parent.parent
+SCHEMA_FILE = ROOT / "infra" / "search-hnsw.json"
+
+# Add parent to path for imports
+sys.path.insert(0, str(ROOT / "api"))
+
+# Parameter ranges Azure AI Search accepts
+SERVICE_LIMITS = {"m": (4, 10), "efConstruction": (100, 1000), "efSearch": (100, 1000)}
+INSTALL_HINT = 'pip install "hearings-ai-api[tuning]"'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", type=Path, required=True, help="Export bundle with the chunk vectors")
+    parser.add_argument("--backend", choices=["local", "service"], default="local", help="HNSW implementation")
+    parser.add_argument("--m", default="4,6,8,10", help="Comma-separated m values")
+    parser.add_argument("--ef-construction", default="100,200,400", help="Comma-separated efConstruction values")
+    parser.add_argument("--ef-search", default="100,200,500", help="Comma-separated efSearch values")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query (recall@k)")
+    parser.add_argument("--queries", type=int, default=200, help="Chunk vectors held out as queries")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="Recall@k the recommendation must reach")
+    parser.add_argument("--seed", type=int, default=0, help="Query sampling and graph construction seed")
+    parser.add_argument("--index-prefix", default="hnsw-tune", help="Service: name prefix for temporary indexes")
+    parser.add_argument("--keep-indexes", action="store_true", help="Service: keep the temporary indexes")
+    parser.add_argument("--output", type=Path, help="Write the sweep results as JSON")
+    parser.add_argument("--chart", type=Path, help="Plot recall against latency and index size (PNG)")
+    parser.add_argument("--write-schema", action="store_true", help=f"Write the recommendation to {SCHEMA_FILE.name}")
+    return parser.parse_args()
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def require(module: str) -> Any:
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise SystemExit(f"{module} is required: {INSTALL_HINT}") from e
+
+
+def load_vectors(bundle_path: Path, queries: int, seed: int) -> tuple[Any, Any, dict]:
+    """Normalized base vectors, held-out query vectors and the bundle manifest."""
+    np = require("numpy")
+    from src.documents.bundle import BundleReader
+
+    bundle = BundleReader(bundle_path)
+    vectors = np.asarray(bundle.vectors(), dtype=np.float32)
+    if len(vectors) <= queries:
+        raise SystemExit(f"Bundle has {len(vectors)} chunks; need more than --queries {queries}")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1, norms)
+
+    rng = np.random.default_rng(seed)
+    held_out = np.zeros(len(vectors), dtype=bool)
+    held_out[rng.choice(len(vectors), size=queries, replace=False)] = True
+    return vectors[~held_out], vectors[held_out], bundle.manifest
+
+
+def exact_neighbours(base: Any, queries: Any, k: int, batch_size: int = 256) -> Any:
+    """Exact top-k cosine neighbours (row positions in base) by brute force."""
+    np = require("numpy")
+    results = []
+    for start in range(0, len(queries), batch_size):
+        scores = queries[start:start + batch_size] @ base.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        results.append(np.take_along_axis(top, order, axis=1))
+    return np.vstack(results)
+
+
+def recall_at_k(found: list[list[int]], exact: Any) -> float:
+    k = exact.shape[1]
+    return statistics.fmean(len(set(row[:k]) & set(truth.tolist())) / k for row, truth in zip(found, exact))
+
+
+def statistic(stats: Any, name: str) -> int:
+    """Read a get_index_statistics value; the result is a dict or a model depending on SDK version."""
+    value = getattr(stats, name, None)
+    if value is None and hasattr(stats, "get"):
+        value = stats.get(name)
+    return value or 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class LocalHnsw:
+    """hnswlib graphs; efSearch is a query-time setting, so each graph serves every efSearch value."""
+
+    def __init__(self, base: Any, seed: int) -> None:
+        self.hnswlib = require("hnswlib")
+        self.base = base
+        self.seed = seed
+
+    def build(self, m: int, ef_construction: int) -> tuple[Any, float, int]:
+        index = self.hnswlib.Index(space="cosine", dim=self.base.shape[1])
+        started = time.perf_counter()
+        index.init_index(max_elements=len(self.base), M=m, ef_construction=ef_construction, random_seed=self.seed)
+        index.add_items(self.base, num_threads=1)
+        build_seconds = time.perf_counter() - started
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.bin")
+            index.save_index(path)
+            size = os.path.getsize(path)
+        return index, build_seconds, size
+
+    def query(self, index: Any, ef_search: int, queries: Any, k: int) -> tuple[list[list[int]], list[float]]:
+        index.set_ef(max(ef_search, k))
+        found, latencies = [], []
+        for vector in queries:
+            started = time.perf_counter()
+            labels, _ = index.knn_query(vector, k=k, num_threads=1)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found.append(labels[0].tolist())
+        return found, latencies
+
+    def drop(self, index: Any) -> None:
+        pass
+
+
+class ServiceHnsw:
+    """Temporary Azure AI Search indexes holding only the vectors."""
+
+    def __init__(self, base: Any, args: argparse.Namespace) -> None:
+        from azure.identity import DefaultAzureCredential
+        from azure.search.documents.indexes import SearchIndexClient
+        from dotenv import load_dotenv
+
+        load_dotenv(ROOT / "api" / ".env")
+        self.endpoint = os.environ["AZURE_SEARCH_ENDPOINT"]
+        self.credential = DefaultAzureCredential()
+        self.index_client = SearchIndexClient(endpoint=self.endpoint, credential=self.credential)
+        self.base = base
+        self.prefix = args.index_prefix
+        self.keep = args.keep_indexes
+
+    def schema(self, name: str, m: int, ef_construction: int, ef_search: int) -> Any:
+        from azure.search.documents.indexes.models import (
+            HnswAlgorithmConfiguration,
+            SearchField,
+            SearchFieldDataType,
+            SearchIndex,
+            VectorSearch,
+            VectorSearchProfile,
+        )
+
+        return SearchIndex(
+            name=name,
+            fields=[
+                SearchField(name="id", type=SearchFieldDataType.String, key=True),
+                SearchField(
+                    name="contentVector",
+                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                    searchable=True,
+                    vector_search_dimensions=self.base.shape[1],
+                    vector_search_profile_name="hnsw-profile",
+                ),
+            ],
+            vector_search=VectorSearch(
+                algorithms=[HnswAlgorithmConfiguration(name="hnsw", parameters={
+                    "m": m, "efConstruction": ef_construction, "efSearch": ef_search, "metric": "cosine",
+                })],
+                profiles=[VectorSearchProfile(name="hnsw-profile", algorithm_configuration_name="hnsw")],
+            ),
+        )
+
+    def build(self, m: int, ef_construction: int) -> tuple[dict, float, int]:
+        from azure.search.documents import SearchClient
+
+        name = f"{self.prefix}-m{m}-efc{ef_construction}"
+        started = time.perf_counter()
+        self.index_client.create_or_update_index(self.schema(name, m, ef_construction, SERVICE_LIMITS["efSearch"][0]))
+        client = SearchClient(endpoint=self.endpoint, index_name=name, credential=self.credential)
+        for start in range(0, len(self.base), 500):
+            client.upload_documents([
+                {"id": str(i), "contentVector": self.base[i].tolist()}
+                for i in range(start, min(start + 500, len(self.base)))
+            ])
+        while client.get_document_count() < len(self.base):
+            time.sleep(2)
+        build_seconds = time.perf_counter() - started
+
+        # Statistics lag indexing by a few seconds
+        time.sleep(5)
+        stats = self.index_client.get_index_statistics(name)
+        size = statistic(stats, "vector_index_size") or statistic(stats, "storage_size")
+        return {"name": name, "client": client, "m": m, "efConstruction": ef_construction}, build_seconds, size
+
+    def query(self, index: dict, ef_search: int, queries: Any, k: int) -> tuple[list[list[int]], list[float]]:
+        from azure.search.documents.models import VectorizedQuery
+
+        self.index_client.create_or_update_index(
+            self.schema(index["name"], index["m"], index["efConstruction"], ef_search)
+        )
+        found, latencies = [], []
+        for vector in queries:
+            started = time.perf_counter()
+            results = index["client"].search(
+                search_text=None,
+                vector_queries=[VectorizedQuery(vector=vector.tolist(), k_nearest_neighbors=k, fields="contentVector")],
+                select=["id"],
+                top=k,
+            )
+            ids = [int(result["id"]) for result in results]
+            latencies.append((time.perf_counter() - started) * 1000)
+            found.append(ids)
+        return found, latencies
+
+    def drop(self, index: dict) -> None:
+        index["client"].close()
+        if not self.keep:
+            self.index_client.delete_index(index["name"])
+
+
+def sweep(backend: Any, queries: Any, exact: Any, args: argparse.Namespace) -> list[dict]:
+    results = []
+    for m, ef_construction in product(int_list(args.m), int_list(args.ef_construction)):
+        print(f"Building m={m} efConstruction={ef_construction}...", file=sys.stderr)
+        index, build_seconds, size = backend.build(m, ef_construction)
+        try:
+            for ef_search in int_list(args.ef_search):
+                found, latencies = backend.query(index, ef_search, queries, args.k)
+                result = {
+                    "m": m,
+                    "efConstruction": ef_construction,
+                    "efSearch": ef_search,
+                    "recall": round(recall_at_k(found, exact), 4),
+                    "p50_ms": round(percentile(latencies, 50), 3),
+                    "p95_ms": round(percentile(latencies, 95), 3),
+                    "build_seconds": round(build_seconds, 2),
+                    "index_bytes": size,
+                }
+                results.append(result)
+                print(f"  efSearch={ef_search}: recall@{args.k} {result['recall']:.3f}, "
+                      f"p50 {result['p50_ms']:.2f} ms", file=sys.stderr)
+        finally:
+            backend.drop(index)
+    return results
+
+
+def recommend(results: list[dict], target_recall: float) -> tuple[dict, bool]:
+    """Fastest combination meeting the target recall (smaller index on ties); else the most accurate."""
+    valid = [
+        r for r in results
+        if all(low <= r[key] <= high for key, (low, high) in SERVICE_LIMITS.items())
+    ] or results
+    meeting = [r for r in valid if r["recall"] >= target_recall]
+    if meeting:
+        return min(meeting, key=lambda r: (r["p95_ms"], r["index_bytes"], r["efConstruction"])), True
+    return max(valid, key=lambda r: (r["recall"], -r["p95_ms"])), False
+
+
+def print_table(results: list[dict], k: int, current: Optional[dict]) -> None:
+    print(f"\n{'m':>3} {'efC':>5} {'efS':>5} {'recall@' + str(k):>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'build s':>8} {'index MB':>9}")
+    for r in results:
+        marker = ""
+        if current and all(r[key] == current.get(key) for key in ("m", "efConstruction", "efSearch")):
+            marker = "  (current)"
+        print(f"{r['m']:>3} {r['efConstruction']:>5} {r['efSearch']:>5} {r['recall']:>10.4f} {r['p50_ms']:>8.3f} "
+              f"{r['p95_ms']:>8.3f} {r['build_seconds']:>8.2f} {r['index_bytes'] / 1e6:>9.2f}{marker}")
+
+
+def plot(results: list[dict], k: int, path: Path) -> None:
+    try:
+        import matplotlib
+    except ImportError as e:
+        raise SystemExit(f"--chart requires matplotlib: {INSTALL_HINT}") from e
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (latency_ax, size_ax) = plt.subplots(1, 2, figsize=(13, 5))
+    for m, ef_construction in dict.fromkeys((r["m"], r["efConstruction"]) for r in results):
+        series = [r for r in results if r["m"] == m and r["efConstruction"] == ef_construction]
+        label = f"m={m}, efC={ef_construction}"
+        latency_ax.plot([r["p50_ms"] for r in series], [r["recall"] for r in series], marker="o", label=label)
+        size_ax.scatter([series[0]["index_bytes"] / 1e6], [max(r["recall"] for r in series)], label=label)
+    latency_ax.set_xlabel("p50 query latency (ms)")
+    latency_ax.set_ylabel(f"recall@{k}")
+    latency_ax.set_title("Recall vs latency (points: efSearch)")
+    size_ax.set_xlabel("index size (MB)")
+    size_ax.set_ylabel(f"best recall@{k}")
+    size_ax.set_title("Recall vs index size")
+    latency_ax.legend(fontsize="small")
+    fig.tight_layout()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, dpi=120)
+
+
+def write_schema(best: dict, report: dict) -> None:
+    current = json.loads(SCHEMA_FILE.read_text())
+    updated = {
+        "m": best["m"],
+        "efConstruction": best["efConstruction"],
+        "efSearch": best["efSearch"],
+        "metric": current.get("metric", "cosine"),
+        "tuning": {
+            "tuned_at": report["created_at"],
+            "backend": report["config"]["backend"],
+            "bundle": report["config"]["bundle"],
+            "chunks": report["config"]["chunks"],
+            "dimensions": report["config"]["dimensions"],
+            f"recall@{report['config']['k']}": best["recall"],
+            "p95_ms": best["p95_ms"],
+        },
+    }
+    SCHEMA_FILE.write_text(json.dumps(updated, indent=2) + "\n")
+
+
+def main() -> None:
+    args = parse_args()
+    base, queries, manifest = load_vectors(args.bundle, args.queries, args.seed)
+    print(f"{len(base)} vectors ({manifest['dimensions']} dimensions), {len(queries)} held-out queries",
+          file=sys.stderr)
+
+    started = time.perf_counter()
+    exact = exact_neighbours(base, queries, args.k)
+    print(f"Exact neighbours computed in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+    backend = LocalHnsw(base, args.seed) if args.backend == "local" else ServiceHnsw(base, args)
+    results = sweep(backend, queries, exact, args)
+
+    current = json.loads(SCHEMA_FILE.read_text()) if SCHEMA_FILE.exists() else None
+    best, met = recommend(results, args.target_recall)
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {
+            "backend": args.backend,
+            "bundle": str(args.bundle),
+            "embedding_model": manifest.get("embedding_model"),
+            "chunks": len(base),
+            "dimensions": manifest["dimensions"],
+            "queries": len(queries),
+            "k": args.k,
+            "target_recall": args.target_recall,
+        },
+        "current": {key: current.get(key) for key in ("m", "efConstruction", "efSearch")} if current else None,
+        "results": results,
+        "recommended": best,
+    }
+
+    print_table(results, args.k, report["current"])
+    print(f"\nRecommended: m={best['m']} efConstruction={best['efConstruction']} efSearch={best['efSearch']} "
+          f"(recall@{args.k} {best['recall']:.4f}, p95 {best['p95_ms']:.3f} ms)")
+    if not met:
+        print(f"Warning: no combination reached recall@{args.k} {args.target_recall}; recommending the most accurate")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.chart:
+        plot(results, args.k, args.chart)
+        print(f"Chart written to {args.chart}")
+    if args.write_schema:
+        write_schema(best, report)
+        print(f"Updated {SCHEMA_FILE.relative_to(ROOT)}; run create-search-index.py to apply")
+
+
+if __name__ == "__main__":
+    main()